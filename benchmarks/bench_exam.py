@@ -0,0 +1,41 @@
+"""Benchmark: writing and loading exam packs in each format.
+
+    python benchmarks/bench_exam.py [questions]
+
+Times generating a pack as .npz, as JSONL without subnet tables and as
+JSONL with them (a tenth of the questions, the files get large), then
+loading each one back into a question bank for the quiz.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from subnet_exam import load_exam_pack, write_pack  # noqa: E402
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def main(count=1000000):
+    cases = (
+        ("npz", "pack.npz", count, True),
+        ("jsonl", "pack.jsonl", count, False),
+        ("jsonl + tables", "tables.jsonl", count // 10, True),
+    )
+    print(f"{'format':16} {'questions':>10} {'write s':>8} {'MB':>8} {'load s':>7} {'us/question':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, filename, questions, tables in cases:
+            path = os.path.join(directory, filename)
+            write_seconds, _ = timed(lambda: write_pack(path, questions, seed=1, tables=tables))
+            load_seconds, _ = timed(lambda: load_exam_pack(path).question_bank())
+            print(
+                f"{name:16} {questions:10,} {write_seconds:8.2f} {os.path.getsize(path) / 1e6:8.1f} "
+                f"{load_seconds:7.2f} {write_seconds / max(questions, 1) * 1e6:12.2f}"
+            )
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,64 @@
+"""Import-time guard: the math modules must import quickly, without Rich, NumPy or file I/O.
+
+Each module is imported in a fresh interpreter (best of several runs) from a
+different working directory, so a stray cwd-relative open() fails loudly.
+Exits with status 1 if a module is over its budget or pulls in a heavy module.
+
+    python benchmarks/bench_import_time.py [runs]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module: budget in milliseconds (on top of the bare interpreter start-up)
+BUDGETS = {
+    "subnet_core": 15,
+    "subnet_vector": 20,
+    "subnet_lookup": 20,
+    "subnet_ranges": 20,
+    "subnet_vlsm": 20,
+    "subnet_pager": 20,
+    "subnet_prefixdb": 20,
+    "subnet_exam": 20,
+    "subnetting_calc": 30,
+    "main": 30,
+}
+
+# None of these may be imported as a side effect of importing the modules above
+HEAVY_MODULES = ("rich", "numpy")
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed * 1000, ','.join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+def measure(module, cwd):
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+    elapsed, _, loaded = result.stdout.strip().partition(" ")
+    return float(elapsed), [name for name in loaded.split(",") if name]
+
+def main(runs=5):
+    failures = 0
+    print(f"{'module':18} {'import (ms)':>12} {'budget':>8}  heavy modules")
+    with tempfile.TemporaryDirectory() as cwd:
+        for module, budget in BUDGETS.items():
+            samples = [measure(module, cwd) for _ in range(runs)]
+            best = min(elapsed for elapsed, _ in samples)
+            loaded = samples[0][1]
+            ok = best <= budget and not loaded
+            failures += not ok
+            print(f"{module:18} {best:12.2f} {budget:8}  {', '.join(loaded) or '-'}{'' if ok else '  FAIL'}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
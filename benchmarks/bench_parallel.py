@@ -0,0 +1,79 @@
+"""Benchmark: batch subnet math in one process vs a pool of worker processes.
+
+    python benchmarks/bench_parallel.py [lines]
+
+Measures `subnet_batch.py info` style text processing (CIDR lines in, CSV
+out) and the packed uint32 path of subnet_parallel.subnet_columns(), with
+1, 2, 4, ... workers up to the number of cores.
+"""
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from subnet_batch import _info_chunk, iter_rows, write_rows  # noqa: E402
+from subnet_core import load_numpy  # noqa: E402
+from subnet_parallel import imap_ordered, iter_text_chunks, subnet_columns  # noqa: E402
+from subnet_vector import ipv4_subnets  # noqa: E402
+
+def make_lines(count, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        value = rng.getrandbits(32)
+        lines.append(f"{value >> 24}.{value >> 16 & 255}.{value >> 8 & 255}.{value & 255}/{rng.randint(8, 30)}\n")
+    return lines
+
+def job_counts():
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def text_serial(lines):
+    out = io.StringIO()
+    write_rows(iter_rows(lines), out, "csv", header=False)
+    return out.getvalue()
+
+def text_parallel(lines, jobs):
+    chunks = ((first_line, text, "csv", False) for first_line, text in iter_text_chunks(lines))
+    return "".join(text for text, _ in imap_ordered(_info_chunk, chunks, jobs))
+
+def report(name, count, baseline, seconds):
+    print(f"{name:28} {seconds:8.3f} {count / seconds:12,.0f} {baseline / seconds:7.2f}x")
+
+def main(count=500000):
+    print(f"{count:,} lines, {os.cpu_count() or 1} core(s)")
+    print(f"{'run':28} {'seconds':>8} {'lines/s':>12} {'speedup':>8}")
+    lines = make_lines(count)
+    baseline, expected = timed(lambda: text_serial(lines))
+    report("info text, in-process", count, baseline, baseline)
+    for jobs in job_counts():
+        seconds, output = timed(lambda: text_parallel(lines, jobs))
+        assert output == expected, "parallel output differs from serial output"
+        report(f"info text, {jobs} worker(s)", count, baseline, seconds)
+
+    addresses = [int.from_bytes(bytes(int(part) for part in line.split('/')[0].split('.')), 'big') for line in lines]
+    prefixlens = [int(line.split('/')[1]) for line in lines]
+    np = load_numpy()
+    if np is not None:
+        addresses, prefixlens = np.array(addresses, dtype=np.uint32), np.array(prefixlens, dtype=np.uint8)
+    baseline, _ = timed(lambda: ipv4_subnets(addresses, prefixlens))
+    report("packed columns, in-process", count, baseline, baseline)
+    for jobs in job_counts():
+        seconds, _ = timed(lambda: subnet_columns(addresses, prefixlens, jobs))
+        report(f"packed columns, {jobs} worker(s)", count, baseline, seconds)
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
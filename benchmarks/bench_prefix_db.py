@@ -0,0 +1,65 @@
+"""Benchmark: text prefix table vs memory-mapped prefix database.
+
+    python benchmarks/bench_prefix_db.py [prefixes]
+
+Times the cold start (load and index a text table vs open the database and
+answer the first query) and single and batched lookups on both.
+"""
+import ipaddress
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from subnet_core import load_numpy  # noqa: E402
+from subnet_lookup import PrefixTable  # noqa: E402
+from subnet_prefixdb import PrefixDB, build_prefix_db  # noqa: E402
+
+def write_table(path, count, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for n in range(count):
+            prefixlen = rng.randint(12, 30)
+            start = rng.getrandbits(32) >> (32 - prefixlen) << (32 - prefixlen)
+            f.write(f"{ipaddress.IPv4Address(start)}/{prefixlen} site{n % 1000}\n")
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def first_lookup(table, address):
+    table.lookup_index(address)
+    return table
+
+def main(count=1000000):
+    rng = random.Random(1)
+    addresses = [rng.getrandbits(32) for _ in range(100000)]
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, "prefixes.txt")
+        db_path = os.path.join(directory, "prefixes.spdb")
+        write_table(text_path, count)
+        table = PrefixTable.from_file(text_path)
+        build_seconds, size = timed(lambda: build_prefix_db(table, db_path))
+        del table
+        print(f"{count:,} IPv4 prefixes, database {size / 1e6:.1f} MB built in {build_seconds:.2f} s")
+
+        text_seconds, table = timed(lambda: first_lookup(PrefixTable.from_file(text_path), addresses[0]))
+        db_seconds, db = timed(lambda: first_lookup(PrefixDB(db_path), addresses[0]))
+        print(f"{'':28} {'text table':>12} {'database':>12}")
+        print(f"{'cold start + 1st lookup (ms)':28} {text_seconds * 1e3:12.1f} {db_seconds * 1e3:12.3f}")
+
+        text_seconds, _ = timed(lambda: [table.lookup_index(a) for a in addresses])
+        db_seconds, _ = timed(lambda: [db.lookup_index(a) for a in addresses])
+        print(f"{'lookup_index (us each)':28} {text_seconds * 1e1:12.3f} {db_seconds * 1e1:12.3f}")
+        if load_numpy() is not None:
+            text_seconds, _ = timed(lambda: table.lookup_many(addresses))
+            db_seconds, _ = timed(lambda: db.lookup_many(addresses))
+            print(f"{'lookup_many (us each)':28} {text_seconds * 1e1:12.3f} {db_seconds * 1e1:12.3f}")
+        db.close()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,43 @@
+"""Micro-benchmark: per-call ipaddress/string formatting vs the precomputed prefix tables.
+
+    python benchmarks/bench_prefix_tables.py
+"""
+import ipaddress
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from subnet_core import IPV4_PREFIXES, mask_to_prefix  # noqa: E402
+
+def formatting_path(prefix):
+    # What the quiz and calculator used to do for every question / table
+    netmask = ipaddress.IPv4Network(f"0.0.0.0/{prefix}").netmask
+    bits = '.'.join(bin(int(x))[2:].zfill(8) for x in str(netmask).split('.'))
+    hosts = 2 ** (32 - prefix) - 2
+    return str(netmask), bits, hosts
+
+def table_path(prefix):
+    info = IPV4_PREFIXES[prefix]
+    return info.netmask_str, info.netmask_bits, info.total_addresses - 2
+
+def parse_mask_ipaddress(mask):
+    return ipaddress.IPv4Network(f"0.0.0.0/{mask}").prefixlen
+
+def main(number=20000):
+    prefixes = list(range(8, 31))
+    masks = [IPV4_PREFIXES[p].netmask_str for p in prefixes]
+    cases = [
+        ("mask/bits/hosts from prefix", lambda: [formatting_path(p) for p in prefixes], lambda: [table_path(p) for p in prefixes]),
+        ("dotted mask -> prefix", lambda: [parse_mask_ipaddress(m) for m in masks], lambda: [mask_to_prefix(m) for m in masks]),
+    ]
+    print(f"{'operation':32} {'ipaddress (us)':>15} {'tables (us)':>12} {'speedup':>8}")
+    for name, old, new in cases:
+        calls = number * len(prefixes)
+        old_us = timeit.timeit(old, number=number) / calls * 1e6
+        new_us = timeit.timeit(new, number=number) / calls * 1e6
+        print(f"{name:32} {old_us:15.3f} {new_us:12.3f} {old_us / new_us:7.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,72 @@
+"""Memory and time per subnet: ipaddress network objects vs the integer-backed Subnet value.
+
+    python benchmarks/bench_subnet_memory.py [subnets]
+
+Holds N /30 subnets of 10.0.0.0/8 (and N /64s of 2001:db8::/32) in a list
+both ways and measures the traced memory with tracemalloc. For ipaddress
+the derived fields a table row uses (broadcast address, hostmask, host
+range) are touched, as the table code did, because ipaddress caches them on
+the object. Then times formatting table rows (network, first host, last
+host, broadcast) both ways.
+"""
+import ipaddress
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from subnet_core import SubnetView, host_range  # noqa: E402
+
+def ipaddress_subnets(view):
+    subnets = list(view)
+    for subnet in subnets:
+        subnet.broadcast_address, subnet.hostmask
+    return subnets
+
+def value_subnets(view):
+    return [view.subnet(i) for i in range(view.size)]
+
+def traced(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+def ipaddress_row(subnet):
+    address_class = type(subnet.network_address)
+    first, last = (address_class(value) for value in host_range(subnet))
+    return str(subnet.network_address), str(first), str(last), str(subnet.broadcast_address)
+
+def value_row(subnet):
+    first, last = subnet.host_range()
+    return subnet.format(subnet.base), subnet.format(first), subnet.format(last), subnet.format(subnet.broadcast)
+
+def main(count=100000):
+    cases = (
+        ("IPv4 /30", SubnetView(ipaddress.ip_network("10.0.0.0/8"), 30)[:count]),
+        ("IPv6 /64", SubnetView(ipaddress.ip_network("2001:db8::/32"), 64)[:count]),
+    )
+    print(f"{count:,} subnets")
+    print(f"{'':10} {'ipaddress B':>12} {'Subnet B':>10} {'ratio':>6} {'ipaddress us':>13} {'Subnet us':>10} {'speedup':>8}")
+    for name, view in cases:
+        networks, network_bytes = traced(lambda: ipaddress_subnets(view))
+        values, value_bytes = traced(lambda: value_subnets(view))
+        start = time.perf_counter()
+        for subnet in networks:
+            ipaddress_row(subnet)
+        network_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for subnet in values:
+            value_row(subnet)
+        value_seconds = time.perf_counter() - start
+        print(
+            f"{name:10} {network_bytes / count:12.0f} {value_bytes / count:10.0f} {network_bytes / value_bytes:5.1f}x "
+            f"{network_seconds / count * 1e6:13.2f} {value_seconds / count * 1e6:10.2f} {network_seconds / value_seconds:7.1f}x"
+        )
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
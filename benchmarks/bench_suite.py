@@ -0,0 +1,193 @@
+"""Benchmark suite: every calculator operation and the quiz hot paths, /8 to /30 and IPv6.
+
+Each case is timed (best and median per call over several rounds) and its
+peak memory is measured with tracemalloc in a separate, untimed call.
+Console output goes to /dev/null and the render cache is cleared before
+every call, so the numbers are for the calculation and table building,
+not the terminal. Random choices are seeded, so two runs do the same work.
+
+    python benchmarks/bench_suite.py -o before.json
+    python benchmarks/bench_suite.py -o after.json --compare before.json
+    python benchmarks/bench_suite.py --only subnet_division --only identify_subnet --quick
+
+Results are JSON: run metadata plus one record per (operation, case).
+--compare prints the change against an earlier results file and exits
+with status 1 if any case got slower than --threshold.
+"""
+import argparse
+import ipaddress
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import subnet_console  # noqa: E402
+import subnetting_calc as calc  # noqa: E402
+from subnet_core import binary_representation, prefix_info  # noqa: E402
+from subnet_questions import build_question_bank, generate_network  # noqa: E402
+
+IPV4_PREFIXES = (8, 12, 16, 20, 24, 28, 30)
+IPV6_PREFIXES = (32, 48, 64, 96, 120)
+
+def networks():
+    """The networks every calculator operation is measured on."""
+    for prefixlen in IPV4_PREFIXES:
+        yield ipaddress.ip_network(f"10.0.0.0/{prefixlen}")
+    for prefixlen in IPV6_PREFIXES:
+        yield ipaddress.ip_network(f"2001:db8::/{prefixlen}")
+
+def _division_count(network):
+    # Up to 64 subnets, keeping at least two host bits in each
+    spare = network.max_prefixlen - network.prefixlen - 2
+    return max(1, min(64, 1 << max(spare, 0)))
+
+def calculator_cases(network):
+    """(operation, callable) pairs for one network."""
+    first = network.network_address + 1
+    last = network.broadcast_address - (1 if network.version == 4 else 0)
+    mask = str(network.prefixlen)
+    hosts = prefix_info(network.prefixlen, network.version).usable_hosts
+    count = _division_count(network)
+    return [
+        ("parse_input", lambda: calc.parse_input(f"{first}/{network.prefixlen}")),
+        ("display_subnet_info", lambda: calc.display_subnet_info(network)),
+        ("subnet_division", lambda: calc.subnet_division(network, count)),
+        ("reverse_subnet_calculation", lambda: calc.reverse_subnet_calculation(max(hosts, 1), str(first))),
+        ("generate_random_ips", lambda: calc.generate_random_ips(network, 10)),
+        ("subnet_comparison", lambda: calc.subnet_comparison(str(first), str(last), mask)),
+        ("identify_subnet", lambda: calc.identify_subnet(str(last), mask)),
+        ("binary_representation", lambda: binary_representation(last)),
+        ("generate_python_code", lambda: calc.generate_python_code(network)),
+    ]
+
+def quiz_cases():
+    """(operation, case, callable) for the quiz: generating questions and drawing them from a bank."""
+    rng = random.Random(0)
+    for difficulty in ("beginner", "advanced"):
+        bank = build_question_bank(difficulty, rng=random.Random(0))
+        yield "generate_network", difficulty, lambda d=difficulty: generate_network(d, rng)
+        yield "select_question", difficulty, lambda b=bank: b.draw(rng)
+        yield "build_question_bank", difficulty, lambda d=difficulty: build_question_bank(d, rng=rng)
+
+def measure(func, rounds, min_time):
+    """Return (calls per round, best and median seconds per call, peak traced bytes of one call)."""
+    def call():
+        subnet_console.render_cache.clear()
+        func()
+
+    call()  # warm up lazy imports and tables
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            call()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or calls >= 1 << 20:
+            break
+        calls *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    timings = [elapsed / calls]
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            call()
+        timings.append((time.perf_counter() - start) / calls)
+
+    random.seed(0)
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return calls, min(timings), statistics.median(timings), peak
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+def run(only=(), rounds=5, min_time=0.05):
+    from rich.console import Console
+    results = []
+    with open(os.devnull, 'w', encoding='utf-8') as sink:
+        subnet_console.console._console = Console(file=sink, width=120, emoji=False, force_terminal=False)
+        cases = [
+            (operation, str(network), network.version, network.prefixlen, func)
+            for network in networks() for operation, func in calculator_cases(network)
+        ]
+        cases += [(operation, case, 4, None, func) for operation, case, func in quiz_cases()]
+        for operation, case, version, prefixlen, func in cases:
+            if only and operation not in only:
+                continue
+            random.seed(0)
+            calls, best, median, peak = measure(func, rounds, min_time)
+            results.append({
+                "operation": operation, "case": case, "version": version, "prefixlen": prefixlen,
+                "calls": calls, "best_us": round(best * 1e6, 3), "median_us": round(median * 1e6, 3),
+                "peak_bytes": peak,
+            })
+            print(f"{operation:28} {case:22} {best * 1e6:12.1f} {peak / 1024:10.1f}", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(), "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "machine": platform.machine(), "cpus": os.cpu_count(),
+            "commit": git_commit(), "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "rounds": rounds, "min_time": min_time,
+        },
+        "results": results,
+    }
+
+def compare(results, baseline, threshold):
+    """Print the change per case against an earlier run; returns the number of regressions."""
+    before = {(r["operation"], r["case"]): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\n{'operation':28} {'case':22} {'before us':>10} {'after us':>10} {'change':>8} {'peak KiB':>17}", file=sys.stderr)
+    for result in results["results"]:
+        old = before.get((result["operation"], result["case"]))
+        if old is None:
+            continue
+        ratio = result["best_us"] / old["best_us"] if old["best_us"] else 1.0
+        slower = ratio > 1 + threshold
+        regressions += slower
+        peak = f"{old['peak_bytes'] / 1024:.1f} -> {result['peak_bytes'] / 1024:.1f}"
+        print(
+            f"{result['operation']:28} {result['case']:22} {old['best_us']:10.1f} {result['best_us']:10.1f} "
+            f"{(ratio - 1) * 100:+7.1f}% {peak:>17}{'  SLOWER' if slower else ''}",
+            file=sys.stderr
+        )
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every calculator operation and quiz hot path.")
+    parser.add_argument("-o", "--output", default="-", help="JSON results file (default: stdout)")
+    parser.add_argument("--only", action="append", default=[], metavar="OPERATION", help="Run only this operation (repeatable)")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per case")
+    parser.add_argument("--quick", action="store_true", help="Shorter rounds, for a smoke test")
+    parser.add_argument("--compare", metavar="BASELINE", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Slowdown that counts as a regression (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    print(f"{'operation':28} {'case':22} {'best us':>12} {'peak KiB':>10}", file=sys.stderr)
+    results = run(args.only, rounds=2 if args.quick else args.rounds, min_time=0.01 if args.quick else 0.05)
+    text = json.dumps(results, indent=2) + "\n"
+    if args.output == "-":
+        sys.stdout.write(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
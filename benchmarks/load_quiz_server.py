@@ -0,0 +1,121 @@
+"""Load generator for subnet_server.py: many concurrent quiz sessions, p50/p99 latency.
+
+Each simulated student opens one keep-alive connection, starts a session
+and answers every part of every question (a mix of right and wrong
+answers). Without --url a server is started in-process on a free port.
+
+    python benchmarks/load_quiz_server.py --sessions 2000 --questions 3
+    python benchmarks/load_quiz_server.py --url http://127.0.0.1:8080
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from subnet_server import start_server  # noqa: E402
+
+class Client:
+    """A keep-alive HTTP/1.1 connection that sends JSON requests and records their latency."""
+
+    def __init__(self, reader, writer, latencies):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        start = time.perf_counter()
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: quiz\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        length = 0
+        for line in head.decode("latin-1").split("\r\n"):
+            if line.lower().startswith("content-length:"):
+                length = int(line.split(":", 1)[1])
+        data = await self.reader.readexactly(length)
+        self.latencies.append(time.perf_counter() - start)
+        status = int(head.split(b" ", 2)[1])
+        return status, json.loads(data)
+
+def guess(part, question, rng):
+    # Roughly half of the answers are wrong so both grading paths are exercised
+    if part == "bonus":
+        return rng.randint(1, len(question["options"]))
+    if part == "netmask":
+        return rng.choice(["255.255.255.0", "/26", "255.255.255.192", "/24"])
+    return rng.randint(0, 8) if part == "bits" else rng.choice([62, 126, 254, 30])
+
+async def student(host, port, questions, difficulty, latencies, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    client = Client(reader, writer, latencies)
+    try:
+        status, created = await client.request("POST", "/sessions", {"difficulty": difficulty, "questions": questions})
+        if status != 201:
+            raise RuntimeError(f"could not create a session: {created}")
+        path = f"/sessions/{created['session']}"
+        while True:
+            _, question = await client.request("GET", f"{path}/question")
+            if question["done"]:
+                return question["score"]
+            await client.request("POST", f"{path}/answer", {"answer": guess(question["part"], question, rng)})
+    finally:
+        writer.close()
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+async def run(args):
+    listener = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        listener, _ = await start_server("127.0.0.1", 0)
+        host, port = listener.sockets[0].getsockname()[:2]
+
+    rng = random.Random(args.seed)
+    latencies = []
+    start = time.perf_counter()
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def limited():
+        async with limit:
+            return await student(host, port, args.questions, args.difficulty, latencies, rng)
+
+    results = await asyncio.gather(*(limited() for _ in range(args.sessions)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    if listener is not None:
+        listener.close()
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    latencies.sort()
+    print(f"sessions: {args.sessions} ({len(errors)} failed), concurrency: {args.concurrency}")
+    print(f"requests: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:,.0f} req/s)")
+    if latencies:
+        print(f"latency p50: {percentile(latencies, 0.50) * 1000:.2f} ms  "
+              f"p99: {percentile(latencies, 0.99) * 1000:.2f} ms  max: {latencies[-1] * 1000:.2f} ms")
+    if errors:
+        print(f"first error: {errors[0]!r}")
+    return 1 if errors else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive concurrent quiz sessions against subnet_server.py.")
+    parser.add_argument("--url", help="Server to test (default: start one in-process)")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=1000, help="Sessions running at the same time")
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--difficulty", choices=["beginner", "advanced"], default="beginner")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    return asyncio.run(run(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
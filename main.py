@@ -1,62 +1,12 @@
-from rich import print
-from rich.console import Console
-from rich.table import Table
-from rich.prompt import Prompt, IntPrompt, Confirm
-from rich.panel import Panel
-from rich.text import Text
-import ipaddress
-import random
-import json
-from collections import defaultdict
-
-console = Console()
-
-def decimal_to_binary_octet(decimal):
-    """Convert a decimal octet to binary."""
-    return format(decimal, '08b')
-
-def binary_converter(ip_address):
-    """Convert an IP address to binary representation."""
-    return '.'.join(decimal_to_binary_octet(int(octet)) for octet in ip_address.split('.'))
-
-def generate_network(difficulty='beginner'):
-    """Generate a random network based on difficulty level using realistic private IP ranges."""
-    if difficulty == 'beginner':
-        # Use common private IP ranges for beginners
-        network_choices = [
-            "192.168.0.0/24",    # Common home network
-            "192.168.1.0/24",    # Another common home network
-            "172.16.0.0/16",     # Small business network
-            "10.0.0.0/16"        # Larger business network, but still manageable for beginners
-        ]
-        network = random.choice(network_choices)
-    else:
-        # For advanced, use more varied private IP ranges
-        first_octet = random.choice([10, 172, 192])
-        if first_octet == 10:
-            second_octet = random.randint(0, 255)
-            third_octet = random.randint(0, 255)
-            cidr = random.randint(16, 24)
-        elif first_octet == 172:
-            second_octet = random.randint(16, 31)
-            third_octet = random.randint(0, 255)
-            cidr = random.randint(16, 24)
-        else:  # 192
-            second_octet = 168
-            third_octet = random.randint(0, 255)
-            cidr = random.randint(24, 28)
-        
-        network = f"{first_octet}.{second_octet}.{third_octet}.0/{cidr}"
-    
-    if difficulty == 'beginner':
-        required_subnets = random.choice([2, 4, 8])
-    else:
-        required_subnets = random.randint(2, 32)
-
-    return {
-        "network": ipaddress.IPv4Network(network, strict=False),
-        "required_subnets": required_subnets
-    }
+from subnet_console import console, load_data, rich_print as print
+from subnet_core import IPV4_PREFIXES
+from subnet_grading import (
+    FORGOT_RESERVED, ORIGINAL_MASK, TOO_FEW_BITS, TOO_MANY_BITS, WILDCARD_MASK, AnswerKey, grade_bonus
+)
+from subnet_pager import SubnetPager
+from subnet_profile import setup as setup_profiling, step
+from subnet_progress import ProgressStore
+from subnet_questions import bonus_question_bank, build_question_bank
 
 def display_introduction():
     """Display an introduction to subnetting concepts with real-life examples."""
@@ -98,6 +48,7 @@ def display_introduction():
 
 def explain_network(network):
     """Explain the given network in user-friendly terms with a real-life analogy."""
+    from rich.panel import Panel
     network_size = "small" if network.prefixlen >= 24 else "medium" if network.prefixlen >= 16 else "large"
     
     console.print(Panel.fit(
@@ -108,7 +59,7 @@ def explain_network(network):
         f"2. The subnet mask {network.netmask} is like the building's floor plan.\n"
         f"3. The '/' notation ({network.prefixlen}) tells us how many bits are used for the network part.\n\n"
         f"In binary, the subnet mask {network.netmask} looks like this:\n"
-        f"[bold green]{'.'.join(bin(int(x))[2:].zfill(8) for x in str(network.netmask).split('.'))}[/bold green]\n"
+        f"[bold green]{IPV4_PREFIXES[network.prefixlen].netmask_bits}[/bold green]\n"
         f"The number of consecutive 1's from the left is {network.prefixlen}, hence the /{network.prefixlen} notation.\n\n"
         f"This means:\n"
         f"- The first {network.prefixlen} bits identify the network (building)\n"
@@ -120,6 +71,7 @@ def explain_network(network):
 
 def display_difficulty_explanation():
     """Explain the difficulty levels to the user."""
+    from rich.panel import Panel
     console.print(Panel.fit(
         "Beginner Mode: Focuses on common private network ranges with simple subnet masks.\n"
         "You'll work with easy-to-understand network sizes and straightforward subnetting tasks.\n\n"
@@ -129,22 +81,34 @@ def display_difficulty_explanation():
         border_style="bold green"
     ))
 
-def load_progress():
-    try:
-        with open('progress.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {"questions": defaultdict(int), "bonus_questions": defaultdict(int)}
-
-def save_progress(progress):
-    with open('progress.json', 'w') as f:
-        json.dump(progress, f)
-
-def select_question(questions, progress):
-    weights = [1 + progress[str(i)] for i in range(len(questions))]
-    return random.choices(questions, weights=weights, k=1)[0]
-
-def subnetting_quiz():
+# Subnets shown in the Step 4 table; the rest can be paged through
+SUBNET_ROWS = 4
+
+MISTAKE_HINTS = {
+    TOO_FEW_BITS: "That many bits does not give enough subnets.",
+    TOO_MANY_BITS: "That gives enough subnets, but borrows more bits than needed.",
+    ORIGINAL_MASK: "That is the original mask; borrowing bits makes the mask longer.",
+    WILDCARD_MASK: "That is the wildcard mask, the inverse of the subnet mask.",
+    FORGOT_RESERVED: "Remember to subtract the network and broadcast addresses.",
+}
+
+def show_hint(grade):
+    """Explain a recognised mistake, if there is a hint for it."""
+    hint = MISTAKE_HINTS.get(grade.diagnostic)
+    if hint:
+        print(f"[italic]Hint: {hint}[/italic]")
+
+def record_answer(store, section, bank, qid, correct):
+    """Save one answer and make a missed question more likely to be drawn again."""
+    store.record(section, qid, correct)
+    if not correct:
+        bank.record_miss(qid)
+
+def subnetting_quiz(pack=None):
+    """Run the quiz; with `pack`, the questions are drawn from that exam pack (see subnet_exam)."""
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich.prompt import IntPrompt, Prompt
     console.clear()
     display_introduction()
     
@@ -160,20 +124,29 @@ def subnetting_quiz():
     score = 0
     max_score = total_questions * 4  # Update max score calculation (3 parts + 1 bonus per question)
 
-    # Load questions from JSON file
-    with open('qanda.json', 'r') as f:
-        json_questions = json.load(f)
-
-    progress = load_progress()
-
-    questions = [generate_network(difficulty) for _ in range(10)]  # Generate 10 different network configurations
+    step("setup")
+    if pack:
+        from subnet_exam import load_exam_pack
+        try:
+            exam_pack = load_exam_pack(pack)
+        except (OSError, ValueError) as e:
+            print(f"[bold red]Error:[/bold red] {str(e)}")
+            return
+        print(f"Drawing questions from [bold]{pack}[/bold] ({len(exam_pack):,} questions).")
+    progress = ProgressStore()
+
+    # Question pools with precomputed answers; missed questions come back more often
+    questions = exam_pack.question_bank() if pack else build_question_bank(difficulty)
+    questions.load_misses(progress.misses('questions'))
+    bonus_questions = bonus_question_bank(load_data('qanda.json'))
+    bonus_questions.load_misses(progress.misses('bonus_questions'))
 
     for question_num in range(1, total_questions + 1):
-        # Select question based on progress
-        question = select_question(questions, progress['questions'])
-        question_index = questions.index(question)
-        network = question['network']
-        required_subnets = question['required_subnets']
+        step("question")
+        question_id, question = questions.draw()
+        network = question.network
+        required_subnets = question.required_subnets
+        answer_key = AnswerKey(question)
 
         console.rule(f"[bold green]Question {question_num}[/bold green]")
         print(f"You have the network: [bold yellow]{network.with_prefixlen}[/bold yellow]")
@@ -189,7 +162,8 @@ def subnetting_quiz():
             print(f"Your task is to create at least {required_subnets} subnets to accommodate this expansion.")
 
         # Step 1: Calculate Bits to Borrow
-        correct_bits = (required_subnets - 1).bit_length()
+        step("step 1: bits to borrow")
+        correct_bits = question.bits
 
         if show_explanations == "yes":
             print("\n[bold underline]Step 1: Calculate the Number of Bits to Borrow[/bold underline]")
@@ -211,12 +185,15 @@ def subnetting_quiz():
             print(f"This is the first row where the 'Enough?' column says 'Yes'.")
 
         user_bits = IntPrompt.ask("\n1️⃣  How many bits will you borrow from the host portion?")
-        if user_bits == correct_bits:
+        grade = answer_key.grade("bits", user_bits)
+        if grade.correct:
             print("[bold green]✅ Correct![/bold green]")
             score += 1
+            record_answer(progress, 'questions', questions, question_id, True)
         else:
             print(f"[bold red]❌ Incorrect.[/bold red] The correct number of bits is [bold yellow]{correct_bits}[/bold yellow].")
-            progress['questions'][str(question_index)] += 1
+            show_hint(grade)
+            record_answer(progress, 'questions', questions, question_id, False)
             if show_explanations == "no":
                 show_explanation = Prompt.ask("Would you like to see the explanation?", choices=["yes", "no"], default="yes")
                 if show_explanation == "yes":
@@ -237,20 +214,23 @@ def subnetting_quiz():
                     print(f"\nSo, with {correct_bits} bits, we can create {2 ** correct_bits} subnets, which is enough.")
 
         # Step 2: Calculate New Subnet Mask
-        new_prefix = network.prefixlen + correct_bits
-        new_netmask = ipaddress.IPv4Network(f"0.0.0.0/{new_prefix}").netmask
+        step("step 2: subnet mask")
+        new_prefix = question.new_prefix
+        original_mask = IPV4_PREFIXES[network.prefixlen]
+        new_mask = IPV4_PREFIXES[new_prefix]
+        new_netmask = question.netmask
         
         if show_explanations == "yes":
             print("\n[bold underline]Step 2: Determine the New Subnet Mask[/bold underline]")
             print("When we borrow bits, we're making the network part bigger and the host part smaller.")
             print("This changes our subnet mask. Let's see how:")
             
-            print(f"\nOriginal subnet mask: {network.netmask}")
+            print(f"\nOriginal subnet mask: {original_mask.netmask_str}")
             print(f"New subnet mask:      {new_netmask}")
             
             print("\nHere's how it looks in binary:")
-            original_netmask_binary = binary_converter(str(network.netmask))
-            new_netmask_binary = binary_converter(str(new_netmask))
+            original_netmask_binary = original_mask.netmask_bits
+            new_netmask_binary = new_mask.netmask_bits
             print(f"Original: {original_netmask_binary}")
             print(f"New:      {new_netmask_binary}")
             print("Notice how the 1s (network part) have expanded to the right.")
@@ -263,12 +243,15 @@ def subnetting_quiz():
             print("By changing the subnet mask, we're essentially adding more walls to create smaller rooms (subnets).")
 
         user_netmask = Prompt.ask("\n2️⃣  What is the new subnet mask?")
-        if user_netmask.strip() == str(new_netmask):
+        grade = answer_key.grade("netmask", user_netmask)
+        if grade.correct:
             print("[bold green]✅ Correct![/bold green]")
             score += 1
+            record_answer(progress, 'questions', questions, question_id, True)
         else:
             print(f"[bold red]❌ Incorrect.[/bold red] The correct subnet mask is [bold yellow]{new_netmask}[/bold yellow].")
-            progress['questions'][str(question_index)] += 1
+            show_hint(grade)
+            record_answer(progress, 'questions', questions, question_id, False)
             if show_explanations == "no":
                 show_explanation = Prompt.ask("Would you like to see the explanation?", choices=["yes", "no"], default="yes")
                 if show_explanation == "yes":
@@ -276,19 +259,21 @@ def subnetting_quiz():
                     print("When we borrow bits, we're making the network part bigger and the host part smaller.")
                     print("This changes our subnet mask. Let's see how:")
                     
-                    print(f"\nOriginal subnet mask: {network.netmask}")
+                    print(f"\nOriginal subnet mask: {original_mask.netmask_str}")
                     print(f"New subnet mask:      {new_netmask}")
                     
                     print("\nHere's how it looks in binary:")
-                    original_netmask_binary = binary_converter(str(network.netmask))
-                    new_netmask_binary = binary_converter(str(new_netmask))
+                    original_netmask_binary = original_mask.netmask_bits
+                    new_netmask_binary = new_mask.netmask_bits
                     print(f"Original: {original_netmask_binary}")
                     print(f"New:      {new_netmask_binary}")
                     print("Notice how the 1s (network part) have expanded to the right.")
 
         # Step 3: Calculate Number of Hosts per Subnet
+        step("step 3: usable hosts")
         host_bits = 32 - new_prefix
-        num_hosts = (2 ** host_bits) - 2
+        total_addresses = new_mask.total_addresses
+        num_hosts = question.hosts
         
         if show_explanations == "yes":
             print("\n[bold underline]Step 3: Calculate Number of Usable Hosts per Subnet[/bold underline]")
@@ -309,8 +294,8 @@ def subnetting_quiz():
             table.add_column("Calculation", style="magenta")
             table.add_column("Result", style="green")
 
-            table.add_row("1. Calculate 2^host_bits", f"2^{host_bits}", str(2**host_bits))
-            table.add_row("2. Subtract 2", f"{2**host_bits} - 2", str(num_hosts))
+            table.add_row("1. Calculate 2^host_bits", f"2^{host_bits}", str(total_addresses))
+            table.add_row("2. Subtract 2", f"{total_addresses} - 2", str(num_hosts))
 
             console.print(table)
             print(f"\nSo, we can have [bold yellow]{num_hosts}[/bold yellow] usable hosts in each subnet.")
@@ -330,12 +315,15 @@ def subnetting_quiz():
             print(f"- A section of the building with {num_hosts} IP cameras or IoT devices")
 
         user_hosts = IntPrompt.ask("\n3️⃣  How many usable hosts per subnet are available?")
-        if user_hosts == num_hosts:
+        grade = answer_key.grade("hosts", user_hosts)
+        if grade.correct:
             print("[bold green]✅ Correct![/bold green]")
             score += 1
+            record_answer(progress, 'questions', questions, question_id, True)
         else:
             print(f"[bold red]❌ Incorrect.[/bold red] The correct number of hosts is [bold yellow]{num_hosts}[/bold yellow].")
-            progress['questions'][str(question_index)] += 1
+            show_hint(grade)
+            record_answer(progress, 'questions', questions, question_id, False)
             if show_explanations == "no":
                 show_explanation = Prompt.ask("Would you like to see the explanation?", choices=["yes", "no"], default="yes")
                 if show_explanation == "yes":
@@ -349,8 +337,8 @@ def subnetting_quiz():
                     table.add_column("Calculation", style="magenta")
                     table.add_column("Result", style="green")
 
-                    table.add_row("1. Calculate 2^host_bits", f"2^{host_bits}", str(2**host_bits))
-                    table.add_row("2. Subtract 2", f"{2**host_bits} - 2", str(num_hosts))
+                    table.add_row("1. Calculate 2^host_bits", f"2^{host_bits}", str(total_addresses))
+                    table.add_row("2. Subtract 2", f"{total_addresses} - 2", str(num_hosts))
 
                     console.print(table)
                     print(f"\nSo, we can have [bold yellow]{num_hosts}[/bold yellow] usable hosts in each subnet.")
@@ -362,42 +350,30 @@ def subnetting_quiz():
                     print("These two addresses can't be assigned to hosts, hence we subtract them.")
 
         # Step 4: Display Subnet Details
+        step("step 4: subnet details")
+        subnets = SubnetPager(question.network, question.new_prefix, page_rows=SUBNET_ROWS)
         if show_explanations == "yes":
             list_subnets = Prompt.ask("\n4️⃣  Would you like to see the subnet details? (yes/no)", choices=["yes", "no"], default="yes")
             if list_subnets.lower() == "yes":
-                subnets = list(network.subnets(prefixlen_diff=correct_bits))
                 print("\n[bold underline]Understanding Subnet Details[/bold underline]")
                 print("Each subnet has four important addresses:")
                 print("1. Network Address: The 'name' of the subnet")
                 print("2. First Host: The first usable address for a device")
                 print("3. Last Host: The last usable address for a device")
                 print("4. Broadcast Address: Used to send messages to all devices in the subnet")
-                
-                table = Table(title=f"Subnet Details (showing first {min(4, len(subnets))} subnets)", show_header=True, header_style="bold blue")
-                table.add_column("Subnet", style="dim")
-                table.add_column("Network Address", style="bold cyan")
-                table.add_column("First Host", style="green")
-                table.add_column("Last Host", style="green")
-                table.add_column("Broadcast Address", style="bold magenta")
-
-                for idx, subnet in enumerate(subnets[:4]):  # Limit to first 4 subnets for simplicity
-                    hosts = list(subnet.hosts())
-                    first_host = str(hosts[0]) if hosts else "N/A"
-                    last_host = str(hosts[-1]) if hosts else "N/A"
-                    table.add_row(
-                        f"{idx + 1}",
-                        str(subnet.network_address),
-                        first_host,
-                        last_host,
-                        str(subnet.broadcast_address)
-                    )
-                console.print(table)
+
+                subnets.show(title="Subnet Details")
+                if subnets.pages > 1:
+                    browse = Prompt.ask(f"Browse all {subnets.total} subnets? (yes/no)", choices=["yes", "no"], default="no")
+                    if browse == "yes":
+                        subnets.browse(title="Subnet Details")
 
         # Real-life application of subnets
         if show_explanations == "yes":
             print("\n[bold cyan]Real-Life Application:[/bold cyan]")
-            print(f"In our office building scenario, these {min(4, len(subnets))} subnets could represent:")
-            for idx, subnet in enumerate(subnets[:4]):
+            shown = min(SUBNET_ROWS, subnets.total)
+            print(f"In our office building scenario, these {shown} subnets could represent:")
+            for idx in range(shown):
                 if idx == 0:
                     print(f"Subnet 1: Marketing Department ({num_hosts} available devices)")
                 elif idx == 1:
@@ -421,8 +397,8 @@ def subnetting_quiz():
         print("\n")
 
         # JSON question
-        bonus_question = select_question(json_questions, progress['bonus_questions'])
-        bonus_question_index = json_questions.index(bonus_question)
+        step("bonus question")
+        bonus_question_id, bonus_question = bonus_questions.draw()
         
         console.rule(f"[bold green]Bonus Question {question_num}[/bold green]")
         
@@ -438,24 +414,23 @@ def subnetting_quiz():
         
         # Get user answer
         user_answer = IntPrompt.ask("Enter your answer (1-4)", choices=[str(i) for i in range(1, 5)])
-        user_answer_text = bonus_question['options'][user_answer - 1]['text']
         
-        is_correct = user_answer_text == bonus_question['correct_answer']
-        if is_correct:
+        if grade_bonus(bonus_question, user_answer).correct:
             console.print("[bold green]✅ Correct![/bold green]")
             score += 1
+            record_answer(progress, 'bonus_questions', bonus_questions, bonus_question_id, True)
             explanation_border_style = "green"
         else:
             console.print(f"[bold red]❌ Incorrect.[/bold red] The correct answer is: [bold yellow]{bonus_question['correct_answer']}[/bold yellow]")
             explanation_border_style = "red"
-            progress['bonus_questions'][str(bonus_question_index)] += 1
+            record_answer(progress, 'bonus_questions', bonus_questions, bonus_question_id, False)
         
         # Display explanation
         console.print(Panel(bonus_question['post_explanation'], title="Explanation", border_style=explanation_border_style))
         print("\n")
 
-        # Save progress after each question
-        save_progress(progress)
+    step(None)
+    progress.close()
 
     console.rule("[bold magenta]Quiz Complete![/bold magenta]")
     print(f"Your total score is: [bold green]{score}[/bold green] out of [bold yellow]{max_score}[/bold yellow]\n")
@@ -469,5 +444,16 @@ def subnetting_quiz():
     print("2. Professor Messer's Network+ Course: https://www.professormesser.com/network-plus/n10-008/n10-008-training-course/")
     print("3. Practical Networking: https://www.practicalnetworking.net/")
 
+def parse_arguments(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Interactive subnetting practice quiz.")
+    parser.add_argument("--pack", help="Exam pack written by subnet_exam.py to draw the questions from")
+    # Read by subnet_profile.setup(); listed here for --help
+    parser.add_argument("--profile", action="store_true", help="Time every quiz step and print a table on exit")
+    parser.add_argument("--profile-out", metavar="PATH", help="Also write cProfile stats to PATH")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    subnetting_quiz()
+    args = parse_arguments()
+    setup_profiling()
+    subnetting_quiz(args.pack)
@@ -0,0 +1,477 @@
+"""Non-interactive batch mode for the subnetting calculator.
+
+Reads one CIDR (10.0.0.0/8) or IP/mask pair (10.1.2.3 255.255.255.0,
+10.1.2.3/255.255.255.0) per line from a file or stdin and streams the
+Subnet Information fields out as CSV, JSON Lines or TSV. Input is
+processed line by line, so memory stays flat whatever the input size.
+
+    python subnet_batch.py info cidrs.txt --format csv > out.csv
+    python subnet_batch.py info huge.txt --jobs 0 > out.csv     # one worker per core
+    cat cidrs.txt | python subnet_batch.py info --format jsonl
+    python subnet_batch.py lookup --table prefixes.txt addresses.txt
+    python subnet_batch.py vlsm --parent 10.0.0.0/16 demands.txt
+    python subnet_batch.py summarize routes.txt
+    python subnet_batch.py overlaps --parent 10.0.0.0/8 allocations.txt
+    python subnet_batch.py grade answers.jsonl
+"""
+import argparse
+import io
+import ipaddress
+import json
+import sys
+from itertools import islice
+
+from subnet_core import (
+    IPV4_PREFIXES, Subnet, binary_representation, binary_representations, parse_ipv4, parse_network, prefix_info,
+    subnet_fields
+)
+from subnet_grading import CORRECT, PARTS as GRADE_PARTS, AnswerKey
+from subnet_parallel import default_jobs, imap_ordered, iter_text_chunks
+from subnet_prefixdb import open_prefix_table
+from subnet_questions import make_question
+from subnet_ranges import (
+    CONTAINS, DUPLICATE, collapse, iter_conflicts, iter_free_prefixes, prefix_range, read_inventory, read_prefixes,
+    smallest_supernet
+)
+from subnet_vlsm import parse_demands, plan_vlsm
+
+FIELDS = ("input", "network", "prefixlen", "broadcast", "netmask", "wildcard", "hosts", "first_host", "last_host")
+BINARY_FIELDS = FIELDS + ("network_bits", "netmask_bits")
+
+_OCTETS = [str(i) for i in range(256)]
+
+# Rows are written in chunks to keep the number of write() calls low.
+_CHUNK = 4096
+
+def _ipv4_str(value):
+    return f"{_OCTETS[value >> 24]}.{_OCTETS[(value >> 16) & 255]}.{_OCTETS[(value >> 8) & 255]}.{_OCTETS[value & 255]}"
+
+def parse_line(line):
+    """Parse one input line into (address, prefixlen, version); raise ValueError if invalid."""
+    text = line.strip()
+    if ' ' in text or '\t' in text or ',' in text:
+        text = '/'.join(text.replace(',', ' ').split())
+    return parse_network(text)
+
+def compute_row(line):
+    """Return the output fields for one input line as a tuple of strings/ints."""
+    address, prefix, version = parse_line(line)
+    if version == 4:
+        info = IPV4_PREFIXES[prefix]
+        network = address & info.netmask
+        broadcast = network | info.wildcard
+        network_str = _ipv4_str(network)
+        broadcast_str = _ipv4_str(broadcast)
+        if prefix >= 31:
+            return (line.strip(), network_str, prefix, broadcast_str, info.netmask_str,
+                    info.wildcard_str, info.usable_hosts, network_str, broadcast_str)
+        # Below /31 the network's last octet is even and the broadcast's odd,
+        # so the first/last hosts only differ from them in the last octet.
+        first_str = network_str[:network_str.rfind('.') + 1] + _OCTETS[(network & 255) + 1]
+        last_str = broadcast_str[:broadcast_str.rfind('.') + 1] + _OCTETS[(broadcast & 255) - 1]
+        return (line.strip(), network_str, prefix, broadcast_str, info.netmask_str,
+                info.wildcard_str, info.usable_hosts, first_str, last_str)
+    to_str = lambda value: str(ipaddress.IPv6Address(value))
+    network, broadcast, netmask, wildcard, hosts, first, last = subnet_fields(address, prefix, 128)
+    return (
+        line.strip(), to_str(network), prefix, to_str(broadcast), to_str(netmask),
+        to_str(wildcard), hosts, to_str(first), to_str(last)
+    )
+
+def iter_rows(lines, errors=None, first_line=1):
+    """Yield result rows for every non-blank, non-comment line.
+
+    Invalid lines are reported to `errors` (a file, default stderr) with their
+    line number (counting from `first_line`) and skipped.
+    """
+    errors = errors or sys.stderr
+    for line_no, line in enumerate(lines, first_line):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        try:
+            yield compute_row(line)
+        except ValueError as e:
+            errors.write(f"line {line_no}: {e}\n")
+
+def _format_tsv(row):
+    return f"{row[0]}\t{row[1]}\t{row[2]}\t{row[3]}\t{row[4]}\t{row[5]}\t{row[6]}\t{row[7]}\t{row[8]}\n"
+
+def _format_jsonl(row):
+    return (f'{{"input": {json.dumps(row[0])}, "network": "{row[1]}", "prefixlen": {row[2]}, '
+            f'"broadcast": "{row[3]}", "netmask": "{row[4]}", "wildcard": "{row[5]}", "hosts": {row[6]}, '
+            f'"first_host": "{row[7]}", "last_host": "{row[8]}"}}\n')
+
+def _quote_csv(value):
+    if any(c in value for c in ',"\n\r'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+def _format_csv(row):
+    return f"{_quote_csv(row[0])},{row[1]},{row[2]},{row[3]},{row[4]},{row[5]},{row[6]},{row[7]},{row[8]}\n"
+
+FORMATTERS = {
+    "csv": _format_csv,
+    "tsv": _format_tsv,
+    "jsonl": _format_jsonl,
+}
+
+# Same layouts with the network_bits and netmask_bits columns appended
+BINARY_FORMATTERS = {
+    "csv": lambda row: f"{_format_csv(row)[:-1]},{row[9]},{row[10]}\n",
+    "tsv": lambda row: f"{_format_tsv(row)[:-1]}\t{row[9]}\t{row[10]}\n",
+    "jsonl": lambda row: f'{_format_jsonl(row)[:-2]}, "network_bits": "{row[9]}", "netmask_bits": "{row[10]}"}}\n',
+}
+
+def write_rows(rows, out, fmt="csv", header=True, binary=False):
+    """Stream rows to `out` in the requested format; returns the number of rows written.
+
+    With `binary` the rows carry the two extra columns added by with_binary().
+    """
+    format_row = (BINARY_FORMATTERS if binary else FORMATTERS)[fmt]
+    if header and fmt in ("csv", "tsv"):
+        out.write(("," if fmt == "csv" else "\t").join(BINARY_FIELDS if binary else FIELDS) + "\n")
+    count = 0
+    chunk = []
+    for row in rows:
+        chunk.append(format_row(row))
+        if len(chunk) >= _CHUNK:
+            out.write("".join(chunk))
+            count += len(chunk)
+            chunk.clear()
+    out.write("".join(chunk))
+    return count + len(chunk)
+
+def with_binary(rows):
+    """Append network and netmask bit strings to each row, converting IPv4 networks a chunk at a time."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, _CHUNK))
+        if not chunk:
+            return
+        bits = iter(binary_representations([parse_ipv4(row[1]) for row in chunk if ':' not in row[1]]))
+        for row in chunk:
+            if ':' in row[1]:
+                yield row + (binary_representation(row[1]), prefix_info(row[2], 6).netmask_bits)
+            else:
+                yield row + (next(bits), IPV4_PREFIXES[row[2]].netmask_bits)
+
+def _info_chunk(job):
+    # Runs in a worker process: one chunk of input text in, formatted rows and error messages out
+    first_line, text, fmt, binary = job
+    out, errors = io.StringIO(), io.StringIO()
+    rows = iter_rows(text.splitlines(), errors, first_line)
+    write_rows(with_binary(rows) if binary else rows, out, fmt, header=False, binary=binary)
+    return out.getvalue(), errors.getvalue()
+
+def _write_results(results, out):
+    for text, errors in results:
+        out.write(text)
+        if errors:
+            sys.stderr.write(errors)
+
+def cmd_info(args):
+    with _open_input(args.input) as lines, _open_output(args.output) as out:
+        if args.jobs != 1:
+            write_rows((), out, args.format, header=not args.no_header, binary=args.binary)
+            jobs = ((first_line, text, args.format, args.binary) for first_line, text in iter_text_chunks(lines))
+            _write_results(imap_ordered(_info_chunk, jobs, args.jobs or default_jobs()), out)
+            return 0
+        rows = with_binary(iter_rows(lines)) if args.binary else iter_rows(lines)
+        write_rows(rows, out, args.format, header=not args.no_header, binary=args.binary)
+    return 0
+
+LOOKUP_FIELDS = ("address", "prefix", "tag")
+
+def iter_lookup_rows(lines, table, errors=None, first_line=1):
+    """Yield (address, matched prefix, tag) for every address line; unmatched prefixes are empty."""
+    errors = errors or sys.stderr
+    for line_no, line in enumerate(lines, first_line):
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        try:
+            address, _, version = parse_network(text)
+        except ValueError as e:
+            errors.write(f"line {line_no}: {e}\n")
+            continue
+        i = table.lookup_index(address, version)
+        if i is None:
+            yield text, "", ""
+        else:
+            yield text, str(table.network(i)), table.tag(i) or ""
+
+def _row_formatter(fields, fmt):
+    """Formatter for simple string rows of the secondary commands (lookup, vlsm, ...)."""
+    if fmt == "jsonl":
+        return lambda row: json.dumps(dict(zip(fields, row))) + "\n"
+    separator = "," if fmt == "csv" else "\t"
+    quote = _quote_csv if fmt == "csv" else str
+    return lambda row: separator.join(quote(str(value)) for value in row) + "\n"
+
+def _write_table(rows, out, fields, fmt, header=True):
+    format_row = _row_formatter(fields, fmt)
+    if header and fmt != "jsonl":
+        out.write(format_row(fields))
+    chunk = []
+    for row in rows:
+        chunk.append(format_row(row))
+        if len(chunk) >= _CHUNK:
+            out.write("".join(chunk))
+            chunk.clear()
+    out.write("".join(chunk))
+
+# Prefix table of a lookup worker process, loaded once by _load_worker_table()
+_worker_table = None
+
+def _load_worker_table(path):
+    global _worker_table
+    _worker_table = open_prefix_table(path)
+
+def _lookup_chunk(job):
+    first_line, text, fmt = job
+    out, errors = io.StringIO(), io.StringIO()
+    _write_table(iter_lookup_rows(text.splitlines(), _worker_table, errors, first_line), out, LOOKUP_FIELDS, fmt, header=False)
+    return out.getvalue(), errors.getvalue()
+
+def cmd_lookup(args):
+    # Opened here even when workers do the lookups, so a bad table is reported once, before any work starts
+    try:
+        table = open_prefix_table(args.table)
+    except (OSError, ValueError) as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 2
+    with _open_input(args.input) as lines, _open_output(args.output) as out:
+        if args.jobs != 1:
+            _write_table((), out, LOOKUP_FIELDS, args.format, header=not args.no_header)
+            jobs = ((first_line, text, args.format) for first_line, text in iter_text_chunks(lines))
+            results = imap_ordered(
+                _lookup_chunk, jobs, args.jobs or default_jobs(), initializer=_load_worker_table, initargs=(args.table,)
+            )
+            _write_results(results, out)
+            return 0
+        _write_table(iter_lookup_rows(lines, table), out, LOOKUP_FIELDS, args.format, header=not args.no_header)
+    return 0
+
+VLSM_FIELDS = ("name", "hosts", "subnet", "netmask", "usable_hosts")
+
+def iter_vlsm_rows(plan):
+    """Yield one row per allocation, then one row with an empty subnet per demand that did not fit."""
+    for allocation in plan.allocations:
+        if plan.parent.version == 4:
+            info = IPV4_PREFIXES[allocation.prefixlen]
+            subnet_str = f"{_ipv4_str(allocation.start)}/{allocation.prefixlen}"
+            yield allocation.name, allocation.hosts, subnet_str, info.netmask_str, info.usable_hosts
+        else:
+            subnet = Subnet(allocation.start, allocation.prefixlen, 6)
+            yield allocation.name, allocation.hosts, str(subnet), subnet.format(subnet.netmask), subnet.usable_hosts
+    for name, hosts in plan.unallocated:
+        yield name, hosts, "", "", ""
+
+def cmd_vlsm(args):
+    try:
+        parent = ipaddress.ip_network(args.parent, strict=False)
+        with _open_input(args.input) as lines:
+            demands = parse_demands(lines)
+        plan = plan_vlsm(parent, demands)
+    except ValueError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 2
+    with _open_output(args.output) as out:
+        _write_table(iter_vlsm_rows(plan), out, VLSM_FIELDS, args.format, header=not args.no_header)
+    free = ", ".join(str(block) for block in plan.free_networks()) or "none"
+    sys.stderr.write(
+        f"{len(plan.allocations)} allocated, {len(plan.unallocated)} did not fit, "
+        f"utilization {plan.utilization:.1%}, free: {free}\n"
+    )
+    return 1 if plan.unallocated else 0
+
+def cmd_summarize(args):
+    try:
+        with _open_input(args.input) as lines:
+            ranges = read_prefixes(lines)
+    except ValueError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 2
+    rows = []
+    for version, max_prefixlen in ((4, 32), (6, 128)):
+        if not ranges[version]:
+            continue
+        if args.supernet:
+            blocks = [smallest_supernet(ranges[version], max_prefixlen)]
+        else:
+            blocks = collapse(ranges[version], max_prefixlen)
+        rows.extend((str(Subnet(base, prefixlen, version)),) for base, prefixlen in blocks)
+    with _open_output(args.output) as out:
+        _write_table(rows, out, ("prefix",), args.format, header=not args.no_header)
+    return 0
+
+OVERLAP_FIELDS = ("kind", "prefix", "other")
+
+FREE = "free"
+
+def iter_overlap_rows(entries, parents=(), counts=None):
+    """Yield (kind, prefix, other) rows: conflicts per IP version, then the free blocks of each parent.
+
+    Conflicts are DUPLICATE (prefix listed again as other) or CONTAINS
+    (prefix contains other); free rows are (FREE, free block, parent).
+    `counts`, if given, is a dict updated with the number of rows per kind.
+    """
+    counts = {} if counts is None else counts
+    for version in (4, 6):
+        for row in iter_conflicts(entries[version]):
+            counts[row[0]] = counts.get(row[0], 0) + 1
+            yield row
+    for parent in parents:
+        max_prefixlen = parent.max_prefixlen
+        start, end = prefix_range(int(parent.network_address), parent.prefixlen, max_prefixlen)
+        parent_str = str(parent)
+        for address, prefix in iter_free_prefixes(entries[parent.version], start, end, max_prefixlen):
+            counts[FREE] = counts.get(FREE, 0) + 1
+            address_str = _ipv4_str(address) if parent.version == 4 else str(ipaddress.IPv6Address(address))
+            yield FREE, f"{address_str}/{prefix}", parent_str
+
+def cmd_overlaps(args):
+    try:
+        parents = [ipaddress.ip_network(parent, strict=False) for parent in args.parent or ()]
+        with _open_input(args.input) as lines:
+            entries = read_inventory(lines)
+    except ValueError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 2
+    counts = {}
+    with _open_output(args.output) as out:
+        _write_table(iter_overlap_rows(entries, parents, counts), out, OVERLAP_FIELDS, args.format, header=not args.no_header)
+    sys.stderr.write(
+        f"{len(entries[4]) + len(entries[6])} prefixes: {counts.get(DUPLICATE, 0)} duplicate pairs, "
+        f"{counts.get(CONTAINS, 0)} nested pairs" + (f", {counts.get(FREE, 0)} free blocks\n" if parents else "\n")
+    )
+    return 1 if counts.get(DUPLICATE) or counts.get(CONTAINS) else 0
+
+GRADE_FIELDS = ("id", "network", "required_subnets", "score", "bits", "netmask", "hosts")
+
+def iter_grade_rows(lines, errors=None):
+    """Re-grade logged answers: one JSON object per line with network, required_subnets and the answers.
+
+    Missing answers count as wrong; each part's column holds the diagnostic
+    ('correct', 'wildcard_mask', ...). Answer keys are shared between lines
+    asking the same question.
+    """
+    errors = errors or sys.stderr
+    keys = {}
+    for line_no, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        try:
+            record = json.loads(text)
+            question_key = (record["network"], int(record["required_subnets"]))
+            cached = keys.get(question_key)
+            if cached is None:
+                key = AnswerKey(make_question(*question_key))
+                cached = keys[question_key] = (key, key.question.network.with_prefixlen)
+            key, network = cached
+            diagnostics = [key.diagnose(part, record[part]) if part in record else "missing" for part in GRADE_PARTS]
+        except (ValueError, KeyError, TypeError) as e:
+            errors.write(f"line {line_no}: {e}\n")
+            continue
+        yield (record.get("id", line_no), network, question_key[1],
+               diagnostics.count(CORRECT), *diagnostics)
+
+def cmd_grade(args):
+    with _open_input(args.input) as lines, _open_output(args.output) as out:
+        _write_table(iter_grade_rows(lines), out, GRADE_FIELDS, args.format, header=not args.no_header)
+    return 0
+
+def _open_input(path):
+    if path in (None, "-"):
+        return _NoClose(sys.stdin)
+    return open(path, "r", encoding="utf-8")
+
+def _open_output(path):
+    if path in (None, "-"):
+        return _NoClose(sys.stdout)
+    return open(path, "w", encoding="utf-8", newline="")
+
+class _NoClose:
+    """Context manager that hands back stdin/stdout without closing them."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __enter__(self):
+        return self.stream
+
+    def __exit__(self, *exc):
+        self.stream.flush()
+        return False
+
+def _jobs(text):
+    """argparse type for --jobs: a whole number of worker processes, 0 meaning one per core."""
+    try:
+        jobs = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got {text!r}") from None
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {jobs}")
+    return jobs
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Batch subnet calculations without the interactive menu.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    info = commands.add_parser("info", help="Subnet information for each CIDR or IP/mask line")
+    info.add_argument("input", nargs="?", help="Input file (default: stdin)")
+    info.add_argument("-o", "--output", help="Output file (default: stdout)")
+    info.add_argument("-f", "--format", choices=sorted(FORMATTERS), default="csv")
+    info.add_argument("--no-header", action="store_true", help="Omit the CSV/TSV header line")
+    info.add_argument("-b", "--binary", action="store_true", help="Add network and netmask columns in binary")
+    info.add_argument("-j", "--jobs", type=_jobs, default=1, help="Worker processes (0: one per core; default: 1, no workers)")
+    info.set_defaults(func=cmd_info)
+
+    lookup = commands.add_parser("lookup", help="Longest-prefix match of each address against a prefix table")
+    lookup.add_argument("input", nargs="?", help="File of addresses, one per line (default: stdin)")
+    lookup.add_argument("-t", "--table", required=True, help="Prefix table file ('prefix [tag]' per line) or prefix database")
+    lookup.add_argument("-o", "--output", help="Output file (default: stdout)")
+    lookup.add_argument("-f", "--format", choices=sorted(FORMATTERS), default="csv")
+    lookup.add_argument("--no-header", action="store_true", help="Omit the CSV/TSV header line")
+    lookup.add_argument("-j", "--jobs", type=_jobs, default=1, help="Worker processes (0: one per core; default: 1, no workers)")
+    lookup.set_defaults(func=cmd_lookup)
+
+    vlsm = commands.add_parser("vlsm", help="Pack 'name,hosts' demands into a parent network (VLSM)")
+    vlsm.add_argument("input", nargs="?", help="File of 'name,hosts' lines (default: stdin)")
+    vlsm.add_argument("-p", "--parent", required=True, help="Parent network to allocate from, e.g. 10.0.0.0/16")
+    vlsm.add_argument("-o", "--output", help="Output file (default: stdout)")
+    vlsm.add_argument("-f", "--format", choices=sorted(FORMATTERS), default="csv")
+    vlsm.add_argument("--no-header", action="store_true", help="Omit the CSV/TSV header line")
+    vlsm.set_defaults(func=cmd_vlsm)
+
+    summary = commands.add_parser("summarize", help="Collapse CIDRs into the fewest covering prefixes")
+    summary.add_argument("input", nargs="?", help="File of CIDRs, one per line (default: stdin)")
+    summary.add_argument("-s", "--supernet", action="store_true", help="Print only the smallest single supernet per IP version")
+    summary.add_argument("-o", "--output", help="Output file (default: stdout)")
+    summary.add_argument("-f", "--format", choices=sorted(FORMATTERS), default="csv")
+    summary.add_argument("--no-header", action="store_true", help="Omit the CSV/TSV header line")
+    summary.set_defaults(func=cmd_summarize)
+
+    overlaps = commands.add_parser("overlaps", help="Find duplicate and nested prefixes in an inventory, and free space")
+    overlaps.add_argument("input", nargs="?", help="File of CIDRs, one per line (default: stdin)")
+    overlaps.add_argument("-p", "--parent", action="append", help="Also list the free blocks inside this network (repeatable)")
+    overlaps.add_argument("-o", "--output", help="Output file (default: stdout)")
+    overlaps.add_argument("-f", "--format", choices=sorted(FORMATTERS), default="csv")
+    overlaps.add_argument("--no-header", action="store_true", help="Omit the CSV/TSV header line")
+    overlaps.set_defaults(func=cmd_overlaps)
+
+    grade = commands.add_parser("grade", help="Re-grade logged quiz answers (JSON Lines)")
+    grade.add_argument("input", nargs="?", help="JSONL file of {network, required_subnets, bits, netmask, hosts} (default: stdin)")
+    grade.add_argument("-o", "--output", help="Output file (default: stdout)")
+    grade.add_argument("-f", "--format", choices=sorted(FORMATTERS), default="csv")
+    grade.add_argument("--no-header", action="store_true", help="Omit the CSV/TSV header line")
+    grade.set_defaults(func=cmd_grade)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Shared Rich console, created on first use, and output helpers.
+
+Rich takes longer to import than the whole subnet math core, so modules that
+print through `console` only pay for it when something is actually printed.
+Static or repeated output (menu, help panels, results for the same input)
+is rendered once and replayed from a cache, optionally kept on disk
+between runs; long tables are printed in chunks as they are built.
+"""
+import atexit
+import json
+import os
+from collections import OrderedDict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class _LazyConsole:
+    """Stands in for rich.console.Console until the first attribute access."""
+
+    def __init__(self):
+        self._console = None
+
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+            # No :emoji: codes, or IPv6 text like 2001:db8:0:100:: would turn into 💯
+            self._console = Console(emoji=False)
+        return getattr(self._console, name)
+
+console = _LazyConsole()
+
+def rich_print(*objects, **kwargs):
+    """rich.print through the shared console."""
+    console.print(*objects, **kwargs)
+
+_data_files = {}
+
+def load_data(name):
+    """Load a JSON data file shipped next to the modules (help.json, qanda.json); cached after the first call."""
+    if name not in _data_files:
+        with open(os.path.join(BASE_DIR, name), 'r', encoding='utf-8') as f:
+            _data_files[name] = json.load(f)
+    return _data_files[name]
+
+# Rendered output kept by print_cached(), oldest dropped first; SUBNET_CACHE_SIZE overrides it
+RENDER_CACHE_SIZE = 64
+
+class RenderCache:
+    """Rendered output by key with least-recently-used eviction and hit/miss counts.
+
+    Only lookups made with count=True (the default) are counted, so the
+    figures can leave out static output such as the menu.
+
+    With a `path` (SUBNET_CACHE_FILE for the shared cache) the entries are
+    read from that JSON file on first use and written back at exit, so
+    repeated queries are answered without recomputing across runs too. The
+    file is ignored when the program's .py/.json files have changed since
+    it was written.
+    """
+
+    def __init__(self, size=RENDER_CACHE_SIZE, path=None):
+        self.size = max(size, 0)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._loaded = path is None
+
+    def get(self, key, count=True):
+        if not self._loaded:
+            self.load()
+        text = self._entries.get(key)
+        if text is not None:
+            self._entries.move_to_end(key)
+        if count:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+
+    def put(self, key, text):
+        if not self.size:
+            return
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries), "size": self.size, "evictions": self.evictions,
+        }
+
+    def load(self):
+        """Read the entries saved in `path`, if it exists and matches the current program files."""
+        self._loaded = True
+        if self.path is None or not self.size:
+            return
+        atexit.register(self.save)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(saved, dict) or saved.get("fingerprint") != _fingerprint(self.path):
+            return
+        for key, text in saved.get("entries", [])[-self.size:]:
+            self._entries.setdefault(key, text)
+
+    def save(self):
+        """Write the entries to `path`, replacing the file in one step."""
+        if self.path is None:
+            return
+        data = {"fingerprint": _fingerprint(self.path), "entries": list(self._entries.items())}
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass  # a cache that cannot be saved is only a slower next start
+
+def _fingerprint(cache_path=None):
+    # Saved output is only valid for the code and data files that rendered it. The cache file
+    # itself is left out: kept as a .json next to the modules, every save would invalidate it.
+    skip = os.path.abspath(cache_path) if cache_path else None
+    paths = sorted(os.path.join(BASE_DIR, name) for name in os.listdir(BASE_DIR) if name.endswith(('.py', '.json')))
+    return [[os.path.basename(path), os.stat(path).st_mtime_ns] for path in paths if path != skip]
+
+def _env_cache_size():
+    """SUBNET_CACHE_SIZE as a number of entries (0 turns the cache off); the default when unset or not a number."""
+    try:
+        return max(int(os.environ.get("SUBNET_CACHE_SIZE", RENDER_CACHE_SIZE)), 0)
+    except ValueError:
+        return RENDER_CACHE_SIZE
+
+# Shared by every print_cached() call
+render_cache = RenderCache(_env_cache_size(), os.environ.get("SUBNET_CACHE_FILE") or None)
+
+def print_cached(key, render, static=False):
+    """Print whatever render() prints, replaying the stored output on later calls with the same key.
+
+    `key` must identify the output completely (normalized inputs) and have
+    a stable repr(); the console width and colour support are added to it,
+    so a resized terminal re-renders. Static output (menu, help panels) is
+    cached too but left out of the hit/miss counts, which are about results.
+    """
+    cache_key = repr((key, console.width, console.color_system, console.is_terminal))
+    text = render_cache.get(cache_key, count=not static)
+    if text is None:
+        with console.capture() as capture:
+            render()
+        text = capture.get()
+        render_cache.put(cache_key, text)
+    console.file.write(text)
+    console.file.flush()
+
+# Rows per printed chunk of a streamed table
+PAGE_ROWS = 100
+
+def print_table_pages(make_table, rows, page_rows=PAGE_ROWS):
+    """Print a long table chunk by chunk as its rows are produced.
+
+    make_table(first) returns an empty Table: the first with title and
+    header, the rest without. Columns need fixed widths so chunks line up.
+    Returns the number of rows printed.
+    """
+    table = make_table(True)
+    count = 0
+    for row in rows:
+        table.add_row(*row)
+        count += 1
+        if count % page_rows == 0:
+            console.print(table)
+            table = make_table(False)
+    if table.row_count or not count:
+        console.print(table)
+    return count
@@ -0,0 +1,482 @@
+import ipaddress
+import random
+from collections import namedtuple
+from functools import lru_cache
+
+# Odd 64-bit constant used to mix the Feistel round function.
+_MIX = 0x9E3779B97F4A7C15
+
+_OCTET_VALUES = {str(i): i for i in range(256)}
+_OCTET_TEXT = tuple(str(i) for i in range(256))
+
+PrefixInfo = namedtuple(
+    "PrefixInfo",
+    "prefixlen netmask wildcard netmask_str wildcard_str netmask_bits wildcard_bits total_addresses usable_hosts"
+)
+
+def _build_prefix_table(version):
+    max_prefixlen = 32 if version == 4 else 128
+    address_class = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+    all_ones = (1 << max_prefixlen) - 1
+    table = []
+    for prefix in range(max_prefixlen + 1):
+        wildcard = all_ones >> prefix
+        netmask = all_ones ^ wildcard
+        if version == 4:
+            to_bits = lambda value: '.'.join(format((value >> shift) & 0xFF, '08b') for shift in (24, 16, 8, 0))
+        else:
+            to_bits = lambda value: ':'.join(format((value >> shift) & 0xFFFF, '016b') for shift in range(112, -1, -16))
+        total = 1 << (max_prefixlen - prefix)
+        # /31 and /127 point-to-point links and single-address prefixes use every address
+        reserved = 0 if prefix >= max_prefixlen - 1 else (2 if version == 4 else 1)
+        table.append(PrefixInfo(
+            prefix, netmask, wildcard, str(address_class(netmask)), str(address_class(wildcard)),
+            to_bits(netmask), to_bits(wildcard), total, total - reserved
+        ))
+    return tuple(table)
+
+def _build_mask_prefixes(table):
+    # Reverse map: '24' and '255.255.255.0' both map to 24
+    masks = {str(info.prefixlen): info.prefixlen for info in table}
+    masks.update((info.netmask_str, info.prefixlen) for info in table)
+    return masks
+
+# Everything derived from a prefix length, indexed by prefix length
+IPV4_PREFIXES = _build_prefix_table(4)
+IPV4_MASK_PREFIXES = _build_mask_prefixes(IPV4_PREFIXES)
+
+@lru_cache(maxsize=None)
+def _ipv6_tables():
+    # The IPv6 tables cost more to build than everything else at import, so wait until they are needed
+    table = _build_prefix_table(6)
+    return table, _build_mask_prefixes(table)
+
+def __getattr__(name):
+    # IPV6_PREFIXES and IPV6_MASK_PREFIXES are built on first access
+    if name == "IPV6_PREFIXES":
+        return _ipv6_tables()[0]
+    if name == "IPV6_MASK_PREFIXES":
+        return _ipv6_tables()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def prefix_info(prefixlen, version=4):
+    """Return the precomputed PrefixInfo for a prefix length."""
+    return (IPV4_PREFIXES if version == 4 else _ipv6_tables()[0])[prefixlen]
+
+_numpy = None
+
+def load_numpy():
+    """Import NumPy on first use; returns the module, or None when it is not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:  # NumPy is optional
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+# '00000000' ... '11111111' for every octet value
+_OCTET_BITS = tuple(format(i, '08b') for i in range(256))
+
+@lru_cache(maxsize=4096)
+def _ipv4_bits(value):
+    return f"{_OCTET_BITS[value >> 24]}.{_OCTET_BITS[(value >> 16) & 255]}.{_OCTET_BITS[(value >> 8) & 255]}.{_OCTET_BITS[value & 255]}"
+
+@lru_cache(maxsize=1024)
+def _ipv6_bits(value):
+    return ':'.join(
+        _OCTET_BITS[(value >> shift) & 255] + _OCTET_BITS[(value >> (shift - 8)) & 255]
+        for shift in range(120, 7, -16)
+    )
+
+def _value_and_version(address, version=None):
+    if isinstance(address, str):
+        value = parse_ipv4(address)
+        if value is None:
+            address = ipaddress.ip_address(address)
+            return int(address), address.version
+        return value, 4
+    if isinstance(address, int):
+        return address, version or (4 if address < 1 << 32 else 6)
+    return int(address), address.version
+
+def binary_representation(address, version=None):
+    """Binary text of an address: dotted 8-bit groups for IPv4, colon-separated 16-bit groups for IPv6.
+
+    Accepts an int, an address string or an IPv4Address/IPv6Address. Plain
+    ints are treated as IPv4 when they fit in 32 bits unless `version` says otherwise.
+    """
+    value, version = _value_and_version(address, version)
+    return _ipv4_bits(value) if version == 4 else _ipv6_bits(value)
+
+@lru_cache(maxsize=1024)
+def _ipv6_compact_bits(value):
+    groups = _ipv6_bits(value).split(':')
+    # Like '::' in IPv6 text, the longest run (at least two) of all-zero groups is left out
+    best_start, best_length, start = 0, 0, None
+    for i, group in enumerate(groups + ['1']):
+        if group == '0' * 16:
+            start = i if start is None else start
+        elif start is not None:
+            if i - start > best_length:
+                best_start, best_length = start, i - start
+            start = None
+    if best_length < 2:
+        return ':'.join(groups)
+    return ':'.join(groups[:best_start]) + '::' + ':'.join(groups[best_start + best_length:])
+
+def compact_binary(address, version=None):
+    """binary_representation() with IPv6 zero groups shortened the way '::' shortens IPv6 text.
+
+    IPv4 is returned unchanged; 2001:db8:: becomes two 16-bit groups followed by '::'.
+    """
+    value, version = _value_and_version(address, version)
+    return _ipv4_bits(value) if version == 4 else _ipv6_compact_bits(value)
+
+def binary_representations(values, version=4):
+    """Binary text for a whole sequence or array of integer addresses.
+
+    With NumPy the bits of every address are unpacked in one call and the
+    separators inserted with array slicing; otherwise the octet table is used.
+    IPv6 values are Python ints (they do not fit a NumPy integer type).
+    """
+    np = load_numpy()
+    if np is None or len(values) == 0:
+        if version == 4:
+            return [f"{_OCTET_BITS[v >> 24]}.{_OCTET_BITS[(v >> 16) & 255]}.{_OCTET_BITS[(v >> 8) & 255]}.{_OCTET_BITS[v & 255]}"
+                    for v in map(int, values)]
+        return [_ipv6_bits.__wrapped__(int(v)) for v in values]
+
+    if version == 4:
+        raw = np.asarray(values, dtype='>u4').view(np.uint8).reshape(-1, 4)
+        group_bits, groups = 8, 4
+    else:
+        high = np.array([int(v) >> 64 for v in values], dtype='>u8')
+        low = np.array([int(v) & 0xFFFFFFFFFFFFFFFF for v in values], dtype='>u8')
+        raw = np.concatenate([high.view(np.uint8).reshape(-1, 8), low.view(np.uint8).reshape(-1, 8)], axis=1)
+        group_bits, groups = 16, 8
+    bits = np.unpackbits(raw, axis=1).reshape(-1, groups, group_bits) + ord('0')
+    separator = ord('.') if version == 4 else ord(':')
+    text = np.full((bits.shape[0], groups, group_bits + 1), separator, dtype=np.uint8)
+    text[:, :, :group_bits] = bits
+    width = groups * (group_bits + 1) - 1
+    text = np.ascontiguousarray(text.reshape(-1, groups * (group_bits + 1))[:, :width])
+    return text.view(f'S{width}').ravel().astype(str).tolist()
+
+def parse_ipv4(text):
+    """Parse a plain dotted quad into an int, or return None so the caller can fall back to ipaddress."""
+    try:
+        a, b, c, d = text.split('.')
+        return (_OCTET_VALUES[a] << 24) | (_OCTET_VALUES[b] << 16) | (_OCTET_VALUES[c] << 8) | _OCTET_VALUES[d]
+    except (ValueError, KeyError):
+        return None
+
+def parse_network(text):
+    """Parse 'address', 'address/prefix' or 'address/netmask' into (address, prefixlen, version).
+
+    Plain IPv4 takes a table-driven fast path; everything else (IPv6,
+    hostmask notation) goes through ipaddress. Raises ValueError if invalid.
+    """
+    address_text, slash, mask_text = text.partition('/')
+    address = parse_ipv4(address_text)
+    if address is not None:
+        prefix = IPV4_MASK_PREFIXES.get(mask_text) if slash else 32
+        if prefix is not None:
+            return address, prefix, 4
+    interface = ipaddress.ip_interface(text)
+    return int(interface.ip), interface.network.prefixlen, interface.version
+
+def host_range(network):
+    """Return the first and last usable host of a network as integers (same rules as network.hosts())."""
+    first = int(network.network_address)
+    last = int(network.broadcast_address)
+    if network.num_addresses <= 2:
+        # /31, /32, /127 and /128: every address is usable
+        return first, last
+    if network.version == 4:
+        return first + 1, last - 1
+    # IPv6 has no broadcast, only the Subnet-Router anycast address is skipped
+    return first + 1, last
+
+def host_count(network):
+    """Return the number of usable hosts without enumerating them."""
+    first, last = host_range(network)
+    return last - first + 1
+
+def _address(network, value):
+    return type(network.network_address)(value)
+
+def sample_hosts(network, count, rng=None):
+    """Pick up to `count` unique random hosts using Floyd's algorithm, O(count) memory."""
+    rng = rng or random
+    first, last = host_range(network)
+    total = last - first + 1
+    count = max(0, min(count, total))
+
+    picked = set()
+    for upper in range(total - count, total):
+        offset = rng.randrange(upper + 1)
+        picked.add(upper if offset in picked else offset)
+
+    offsets = list(picked)
+    rng.shuffle(offsets)
+    return [_address(network, first + offset) for offset in offsets]
+
+def _feistel(value, keys, half, mask):
+    left, right = value >> half, value & mask
+    for key in keys:
+        left, right = right, left ^ ((((right ^ key) * _MIX) >> 7) & mask)
+    return (left << half) | right
+
+def iter_random_hosts(network, count=None, rng=None):
+    """Yield unique random hosts in constant memory.
+
+    Offsets are drawn from a keyed Feistel permutation over the smallest
+    even-width power of two covering the host range, so every host appears
+    at most once and nothing is remembered between yields. Values outside
+    the range are skipped (cycle-walking). With count=None the whole host
+    range is produced.
+    """
+    rng = rng or random
+    first, last = host_range(network)
+    total = last - first + 1
+    if count is None or count > total:
+        count = total
+
+    bits = max(2, (total - 1).bit_length())
+    bits += bits & 1
+    half = bits // 2
+    mask = (1 << half) - 1
+    keys = [rng.getrandbits(half) for _ in range(4)]
+
+    produced = 0
+    counter = 0
+    while produced < count:
+        offset = _feistel(counter, keys, half, mask)
+        counter += 1
+        if offset < total:
+            produced += 1
+            yield _address(network, first + offset)
+
+class SubnetView:
+    """Lazy, indexable sequence of the equal-size subnets of a network.
+
+    The Nth subnet is computed as base + N * increment, so splitting a /8
+    into /30s costs nothing until a row is actually asked for. Slicing and
+    reversing return new views over the same arithmetic.
+    """
+
+    def __init__(self, network, new_prefix, indices=None):
+        if not network.prefixlen <= new_prefix <= network.max_prefixlen:
+            raise ValueError(f"new prefix /{new_prefix} must be between /{network.prefixlen} and /{network.max_prefixlen}")
+        self.network = network
+        self.prefixlen = new_prefix
+        self.increment = 1 << (network.max_prefixlen - new_prefix)
+        self._base = int(network.network_address)
+        self._indices = indices if indices is not None else range(1 << (new_prefix - network.prefixlen))
+
+    @property
+    def size(self):
+        """Number of subnets in the view; unlike len() this also works beyond sys.maxsize (IPv6)."""
+        r = self._indices
+        if r.step > 0:
+            return max(0, (r.stop - r.start + r.step - 1) // r.step)
+        return max(0, (r.start - r.stop - r.step - 1) // -r.step)
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return self.size > 0
+
+    def _subnet(self, n):
+        return type(self.network)((self._base + n * self.increment, self.prefixlen))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SubnetView(self.network, self.prefixlen, self._indices[index])
+        return self._subnet(self._indices[index])
+
+    def __iter__(self):
+        for n in self._indices:
+            yield self._subnet(n)
+
+    def __reversed__(self):
+        return iter(self[::-1])
+
+    def __repr__(self):
+        return f"SubnetView({self.network}, /{self.prefixlen}, {self._indices})"
+
+    def subnet(self, index):
+        """Return the subnet at `index` as a Subnet value, without building ipaddress objects."""
+        return Subnet(self._base + self._indices[index] * self.increment, self.prefixlen, self.network.version)
+
+def subnet_fields(address, prefixlen, max_prefixlen=32):
+    """Return (network, broadcast, netmask, wildcard, hosts, first_host, last_host) as integers.
+
+    Pure integer math for an address/prefix pair; the host rules match host_range().
+    """
+    info = (IPV4_PREFIXES if max_prefixlen == 32 else _ipv6_tables()[0])[prefixlen]
+    network = address & info.netmask
+    broadcast = network | info.wildcard
+    if prefixlen >= max_prefixlen - 1:
+        first, last = network, broadcast
+    elif max_prefixlen == 32:
+        first, last = network + 1, broadcast - 1
+    else:
+        first, last = network + 1, broadcast
+    return network, broadcast, info.netmask, info.wildcard, info.usable_hosts, first, last
+
+def format_address(value, version=4):
+    """Format an integer address as text; IPv4 is done by table lookup, without ipaddress objects."""
+    if version == 4:
+        return f"{_OCTET_TEXT[value >> 24]}.{_OCTET_TEXT[(value >> 16) & 255]}.{_OCTET_TEXT[(value >> 8) & 255]}.{_OCTET_TEXT[value & 255]}"
+    return str(ipaddress.IPv6Address(value))
+
+class Subnet:
+    """A network held as plain integers: base address, prefix length and IP version.
+
+    Derived fields (broadcast, masks, host range) are computed with integer
+    math when asked for, and nothing is cached on the instance, so a Subnet
+    costs a small fixed amount of memory where an ipaddress network object
+    carries several address objects and a dict. Convert with from_network()
+    and to_network() at the edges.
+    """
+
+    __slots__ = ("base", "prefixlen", "version")
+
+    def __init__(self, base, prefixlen, version=4):
+        self.base = base
+        self.prefixlen = prefixlen
+        self.version = version
+
+    @classmethod
+    def from_network(cls, network):
+        return cls(int(network.network_address), network.prefixlen, network.version)
+
+    @classmethod
+    def from_address(cls, address, prefixlen, version=4):
+        """The subnet of a given prefix length containing the integer `address` (host bits are cleared)."""
+        return cls(address & prefix_info(prefixlen, version).netmask, prefixlen, version)
+
+    @classmethod
+    def parse(cls, text):
+        """Parse 'address/prefix' or 'address/netmask' like parse_network(), clearing host bits."""
+        address, prefixlen, version = parse_network(text)
+        return cls.from_address(address, prefixlen, version)
+
+    def to_network(self):
+        network_class = ipaddress.IPv4Network if self.version == 4 else ipaddress.IPv6Network
+        return network_class((self.base, self.prefixlen))
+
+    def address(self, value):
+        """Turn an integer address of this subnet's version into an ipaddress object."""
+        return (ipaddress.IPv4Address if self.version == 4 else ipaddress.IPv6Address)(value)
+
+    def format(self, value):
+        return format_address(value, self.version)
+
+    @property
+    def max_prefixlen(self):
+        return 32 if self.version == 4 else 128
+
+    @property
+    def info(self):
+        return prefix_info(self.prefixlen, self.version)
+
+    @property
+    def num_addresses(self):
+        return 1 << (self.max_prefixlen - self.prefixlen)
+
+    @property
+    def broadcast(self):
+        """The last address (the broadcast address for IPv4)."""
+        return self.base | self.info.wildcard
+
+    @property
+    def netmask(self):
+        return self.info.netmask
+
+    @property
+    def hostmask(self):
+        return self.info.wildcard
+
+    @property
+    def usable_hosts(self):
+        return self.info.usable_hosts
+
+    def host_range(self):
+        """(first, last) usable host as integers, by the rules of host_range()."""
+        last = self.base | self.info.wildcard
+        if self.prefixlen >= self.max_prefixlen - 1:
+            return self.base, last
+        return self.base + 1, (last - 1 if self.version == 4 else last)
+
+    def fields(self):
+        """(network, broadcast, netmask, wildcard, hosts, first_host, last_host) as from subnet_fields()."""
+        return subnet_fields(self.base, self.prefixlen, self.max_prefixlen)
+
+    def __contains__(self, address):
+        if not isinstance(address, int):
+            if address.version != self.version:
+                return False
+            address = int(address)
+        return address & self.info.netmask == self.base
+
+    def __eq__(self, other):
+        if not isinstance(other, Subnet):
+            return NotImplemented
+        return (self.base, self.prefixlen, self.version) == (other.base, other.prefixlen, other.version)
+
+    def __hash__(self):
+        return hash((self.base, self.prefixlen, self.version))
+
+    def __str__(self):
+        return f"{format_address(self.base, self.version)}/{self.prefixlen}"
+
+    def __repr__(self):
+        return f"Subnet('{self}')"
+
+def mask_to_prefix(mask, version=4):
+    """Turn a prefix ('24', '/24'), dotted netmask or wildcard mask into a prefix length.
+
+    Raises ValueError for anything that is not a contiguous mask.
+    """
+    max_prefixlen = 32 if version == 4 else 128
+    text = str(mask).strip().lstrip('/')
+    prefix = (IPV4_MASK_PREFIXES if version == 4 else _ipv6_tables()[1]).get(text)
+    if prefix is not None:
+        return prefix
+    if text.isdigit() and text.isascii():
+        raise ValueError(f"Invalid prefix length: /{text}")
+    try:
+        value = int(ipaddress.ip_address(text))
+    except ValueError:
+        raise ValueError(f"Invalid subnet mask: {mask}") from None
+    all_ones = (1 << max_prefixlen) - 1
+    for wildcard in (value ^ all_ones, value):
+        # A wildcard mask is a run of trailing 1s
+        if wildcard & (wildcard + 1) == 0:
+            return max_prefixlen - wildcard.bit_length()
+    raise ValueError(f"Invalid subnet mask: {mask}")
+
+def prefix_for_hosts(num_hosts, version=4):
+    """Return the longest prefix whose subnet has room for `num_hosts` usable hosts."""
+    max_prefixlen = 32 if version == 4 else 128
+    # IPv4 loses the network and broadcast addresses, IPv6 only the network address
+    reserved = 2 if version == 4 else 1
+    prefix = max_prefixlen - (max(num_hosts, 1) + reserved - 1).bit_length()
+    if prefix < 0:
+        raise ValueError(f"No IPv{version} subnet can hold {num_hosts} hosts")
+    return prefix
+
+def range_to_prefixes(start, end, max_prefixlen=32):
+    """Yield (address, prefixlen) for the fewest CIDR blocks exactly covering start..end."""
+    while start <= end:
+        # Largest block aligned at `start` that still fits before `end`
+        size = start & -start if start else 1 << max_prefixlen
+        while start + size - 1 > end:
+            size >>= 1
+        yield start, max_prefixlen + 1 - size.bit_length()
+        start += size
@@ -0,0 +1,278 @@
+"""Exam packs: large, seeded sets of subnetting questions with their answer keys.
+
+    python subnet_exam.py -n 100000 --seed 7 -o exam.jsonl
+    python subnet_exam.py -n 1000000 --difficulty beginner -o exam.npz
+
+Questions are drawn the way the quiz draws them (see
+subnet_questions.generate_network) and the answers are worked out for a
+whole chunk at a time: bits to borrow, new prefix and mask, usable hosts
+per subnet and the address increment between subnets. JSONL chunks are
+written as soon as they are generated, so memory use does not grow with the
+pack; a .npz pack is assembled in memory and saved at the end, at 32 bytes
+per question (32 MB for a million).
+
+A .jsonl pack starts with a header line (format, seed, difficulty, ...)
+followed by one question per line, with its subnet table only if --tables
+is given: the tables make the file about ten times larger and cost around a
+minute and 1.5 GB per million questions. A .npz pack stores every field as
+a NumPy column; its subnet tables follow from network + n * increment.
+
+With NumPy installed the same seed always gives the same pack, and a
+smaller pack is a prefix of a larger one with the same seed. Without NumPy
+the questions come from the random module instead: also reproducible, but
+a different pack for the same seed.
+
+python main.py --pack exam.jsonl practises on a pack instead of a freshly
+generated question pool.
+"""
+import ipaddress
+import json
+import random
+import sys
+import time
+from collections.abc import Sequence
+
+from subnet_core import format_address, load_numpy
+from subnet_questions import (
+    BEGINNER_NETWORKS, BEGINNER_SUBNETS, MAX_NEW_PREFIX, Question, QuestionBank, generate_network, make_question
+)
+
+FORMAT = "subnet-exam-pack"
+FORMAT_VERSION = 1
+
+# Questions generated per step; part of what a seed reproduces, so changing it changes the packs
+CHUNK_SIZE = 65536
+
+COLUMNS = ("network", "prefixlen", "required_subnets", "bits", "new_prefix", "netmask", "hosts", "increment")
+
+# Bits to borrow for 0..32 required subnets
+_BITS = tuple(max(n - 1, 0).bit_length() for n in range(33))
+
+def _numpy_chunk(np, rng, difficulty, size):
+    if difficulty == 'beginner':
+        beginner = [ipaddress.IPv4Network(n) for n in BEGINNER_NETWORKS]
+        choice = rng.integers(0, len(beginner), size)
+        network = np.array([int(n.network_address) for n in beginner], dtype=np.uint32)[choice]
+        prefixlen = np.array([n.prefixlen for n in beginner], dtype=np.uint32)[choice]
+        required = np.array(BEGINNER_SUBNETS, dtype=np.uint32)[rng.integers(0, len(BEGINNER_SUBNETS), size)]
+    else:
+        # 10.x.x.0/16-24, 172.16-31.x.0/16-24 or 192.168.x.0/24-28, as generate_network() picks them
+        kind = rng.integers(0, 3, size)
+        first = np.array([10, 172, 192], dtype=np.uint32)[kind]
+        second = np.where(kind == 0, rng.integers(0, 256, size), np.where(kind == 1, rng.integers(16, 32, size), 168))
+        third = rng.integers(0, 256, size)
+        prefixlen = np.where(kind == 2, rng.integers(24, 29, size), rng.integers(16, 25, size)).astype(np.uint32)
+        mask = (np.uint64(0xFFFFFFFF) << (np.uint64(32) - prefixlen.astype(np.uint64))).astype(np.uint32)
+        network = ((first << 24) | (second.astype(np.uint32) << 16) | (third.astype(np.uint32) << 8)) & mask
+        # Small networks cannot be split 32 ways, so cap the request at what fits
+        most = np.minimum(32, np.left_shift(1, MAX_NEW_PREFIX - prefixlen.astype(np.int64)))
+        required = rng.integers(2, most + 1).astype(np.uint32)
+    bits = np.array(_BITS, dtype=np.uint32)[required]
+    new_prefix = prefixlen + bits
+    increment = np.left_shift(np.uint32(1), np.uint32(32) - new_prefix)
+    return {
+        "network": network, "prefixlen": prefixlen, "required_subnets": required, "bits": bits,
+        "new_prefix": new_prefix, "netmask": ~(increment - np.uint32(1)), "hosts": increment - np.uint32(2),
+        "increment": increment,
+    }
+
+def _python_chunk(rng, difficulty, size):
+    columns = {name: [] for name in COLUMNS}
+    for _ in range(size):
+        spec = generate_network(difficulty, rng)
+        question = make_question(spec["network"], spec["required_subnets"])
+        increment = 1 << (32 - question.new_prefix)
+        values = (
+            int(question.network.network_address), question.network.prefixlen, question.required_subnets,
+            question.bits, question.new_prefix, 0xFFFFFFFF ^ (increment - 1), question.hosts, increment
+        )
+        for name, value in zip(COLUMNS, values):
+            columns[name].append(value)
+    return columns
+
+def generate_chunks(count, seed=0, difficulty='advanced', np=None):
+    """Yield the questions of a pack as dicts of columns (NumPy arrays, or lists without NumPy), CHUNK_SIZE at a time."""
+    np = np or load_numpy()
+    if np is None:
+        rng = random.Random(seed)
+    for number, start in enumerate(range(0, count, CHUNK_SIZE)):
+        size = min(CHUNK_SIZE, count - start)
+        if np is None:
+            yield _python_chunk(rng, difficulty, size)
+            continue
+        # Every chunk has its own stream and always draws a full chunk, so packs of any size agree on their prefix
+        chunk = _numpy_chunk(np, np.random.default_rng([seed, number]), difficulty, CHUNK_SIZE)
+        yield {name: column[:size] for name, column in chunk.items()}
+
+def _subnet_table(network, bits, increment):
+    rows = []
+    for base in range(network, network + (increment << bits), increment):
+        rows.append(
+            f'["{format_address(base)}", "{format_address(base + 1)}", '
+            f'"{format_address(base + increment - 2)}", "{format_address(base + increment - 1)}"]'
+        )
+    return ", ".join(rows)
+
+def _write_jsonl(f, chunks, tables):
+    netmasks = {}
+    count = 0
+    for chunk in chunks:
+        columns = [chunk[name].tolist() if hasattr(chunk[name], "tolist") else chunk[name] for name in COLUMNS]
+        lines = []
+        for network, prefixlen, required, bits, new_prefix, netmask, hosts, increment in zip(*columns):
+            if netmask not in netmasks:
+                netmasks[netmask] = format_address(netmask)
+            cidr = f"{format_address(network)}/{prefixlen}"
+            table = f', "subnets": [{_subnet_table(network, bits, increment)}]' if tables else ""
+            lines.append(
+                f'{{"id": "{cidr}:{required}", "network": "{cidr}", "required_subnets": {required}, '
+                f'"bits": {bits}, "new_prefix": {new_prefix}, "netmask": "{netmasks[netmask]}", '
+                f'"hosts": {hosts}, "increment": {increment}{table}}}\n'
+            )
+        f.write("".join(lines))
+        count += len(lines)
+    return count
+
+def write_pack(path, count, seed=0, difficulty='advanced', tables=False):
+    """Generate `count` questions and write them to `path` (.npz: columnar, otherwise JSONL); returns the count.
+
+    tables=True adds each question's subnet table to a JSONL pack.
+    """
+    if difficulty not in ('beginner', 'advanced'):
+        raise ValueError(f"unknown difficulty '{difficulty}'")
+    np = load_numpy()
+    meta = {
+        "format": FORMAT, "version": FORMAT_VERSION, "count": count, "seed": seed, "difficulty": difficulty,
+        "generator": "random" if np is None else "numpy", "chunk_size": CHUNK_SIZE,
+    }
+    chunks = generate_chunks(count, seed, difficulty, np)
+    if path.endswith('.npz'):
+        if np is None:
+            raise ValueError("columnar (.npz) packs need NumPy; write a .jsonl pack instead")
+        parts = {name: [] for name in COLUMNS}
+        for chunk in chunks:
+            for name in COLUMNS:
+                parts[name].append(chunk[name])
+        columns = {name: np.concatenate(parts[name]) if parts[name] else np.zeros(0, np.uint32) for name in COLUMNS}
+        with open(path, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(meta)), **columns)
+        return count
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(meta) + "\n")
+        return _write_jsonl(f, chunks, tables)
+
+class ExamPack(Sequence):
+    """The questions of a loaded pack, built as Question tuples from the stored answers when accessed."""
+
+    def __init__(self, meta, ids, networks, required, bits, new_prefix, netmasks, hosts):
+        self.meta = meta
+        self.ids = ids
+        self._columns = (networks, required, bits, new_prefix, netmasks, hosts)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        network, required, bits, new_prefix, netmask, hosts = (column[i] for column in self._columns)
+        return Question(self.ids[i], ipaddress.IPv4Network(network), required, bits, new_prefix, netmask, hosts)
+
+    def unique(self):
+        """This pack with every question ID kept once, at its first row."""
+        first = {}
+        for i, qid in enumerate(self.ids):
+            first.setdefault(qid, i)
+        if len(first) == len(self.ids):
+            return self
+        rows = list(first.values())
+        return ExamPack(self.meta, list(first), *([column[i] for i in rows] for column in self._columns))
+
+    def question_bank(self):
+        """A QuestionBank over the distinct questions, so that misses weigh on the one entry per ID."""
+        pack = self.unique()
+        return QuestionBank(pack, pack.ids)
+
+def _load_npz(path):
+    np = load_numpy()
+    if np is None:
+        raise ValueError("columnar (.npz) packs need NumPy")
+    import zipfile  # already loaded by NumPy; at module level it would slow down the quiz's import
+    try:
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            columns = {name: data[name].tolist() for name in COLUMNS}
+    except (ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+        # A zip file that is not a pack, or a truncated one
+        raise ValueError(f"{path} is not a valid exam pack: {e}") from None
+    if not isinstance(meta, dict) or meta.get("format") != FORMAT:
+        raise ValueError(f"{path} is not an exam pack")
+    networks = [f"{format_address(n)}/{p}" for n, p in zip(columns["network"], columns["prefixlen"])]
+    netmasks = {value: format_address(value) for value in set(columns["netmask"])}
+    return ExamPack(
+        meta, [f"{n}:{r}" for n, r in zip(networks, columns["required_subnets"])], networks,
+        columns["required_subnets"], columns["bits"], columns["new_prefix"],
+        [netmasks[value] for value in columns["netmask"]], columns["hosts"]
+    )
+
+def _load_jsonl(f):
+    columns = ([], [], [], [], [], [], [])
+    appenders = [column.append for column in columns]
+    fields = ("id", "network", "required_subnets", "bits", "new_prefix", "netmask", "hosts")
+    for line in f:
+        if line.strip():
+            # The quiz does not need the subnet table, which write_pack() puts last; skip parsing it
+            head, found, _ = line.partition(', "subnets": ')
+            try:
+                record = json.loads(head + "}") if found else json.loads(line)
+            except ValueError:
+                record = json.loads(line)
+            for append, field in zip(appenders, fields):
+                append(record[field])
+    return columns
+
+def load_exam_pack(path):
+    """Read a pack written by write_pack(); raises ValueError if `path` is not one."""
+    with open(path, 'rb') as f:
+        is_npz = f.read(2) == b"PK"
+    if is_npz:
+        pack = _load_npz(path)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                meta = json.loads(f.readline())
+                columns = _load_jsonl(f)
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{path} is not a valid exam pack: {e}") from None
+        if not isinstance(meta, dict) or meta.get("format") != FORMAT:
+            raise ValueError(f"{path} is not an exam pack")
+        pack = ExamPack(meta, *columns)
+    if pack.meta.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} has unsupported exam pack version {pack.meta.get('version')}")
+    if not len(pack):
+        raise ValueError(f"{path} holds no questions")
+    return pack
+
+def main(argv=None):
+    import argparse  # only the generator needs it; the quiz imports this module too
+    parser = argparse.ArgumentParser(description="Generate a seeded exam pack of subnetting questions with answer keys.")
+    parser.add_argument("-o", "--output", required=True, help="Pack file to write: .jsonl, or .npz for columnar")
+    parser.add_argument("-n", "--count", type=int, default=100000, help="Number of questions (default: 100000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--difficulty", choices=["beginner", "advanced"], default="advanced")
+    parser.add_argument(
+        "--tables", action="store_true",
+        help="Include each question's subnet table in a JSONL pack (about ten times larger: ~1.5 GB and a minute per million questions)"
+    )
+    args = parser.parse_args(argv)
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+    start = time.perf_counter()
+    try:
+        count = write_pack(args.output, args.count, args.seed, args.difficulty, tables=args.tables)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"Wrote {count:,} questions to {args.output} in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
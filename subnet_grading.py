@@ -0,0 +1,141 @@
+"""Headless grading of quiz answers.
+
+An AnswerKey holds the expected answers of one question and classifies a
+submitted answer as correct or as a specific mistake (wildcard given
+instead of the mask, forgot to subtract the network and broadcast
+addresses, ...). Every distinct raw answer is classified once and then
+remembered, so grading a large batch of answers to the same question is a
+dictionary lookup per answer.
+
+Subnet masks may be given as '/26', '26', '255.255.255.192' or hex
+('0xffffffc0', 'ffffffc0'); surrounding whitespace is ignored.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from subnet_core import IPV4_MASK_PREFIXES, IPV4_PREFIXES
+
+PARTS = ("bits", "netmask", "hosts")
+
+CORRECT = "correct"
+UNPARSEABLE = "unparseable"
+WRONG = "wrong"
+TOO_FEW_BITS = "too_few_bits"            # not enough subnets
+TOO_MANY_BITS = "too_many_bits"          # enough subnets, but more bits than needed
+ORIGINAL_MASK = "original_mask"          # the mask before borrowing
+WILDCARD_MASK = "wildcard_mask"          # the inverse (wildcard) of the right mask
+FORGOT_RESERVED = "forgot_reserved"      # total addresses, network and broadcast not subtracted
+WRONG_OPTION = "wrong_option"
+
+_WILDCARD_PREFIXES = {info.wildcard_str: info.prefixlen for info in IPV4_PREFIXES}
+
+@lru_cache(maxsize=65536)
+def parse_mask(text):
+    """Return the prefix length of an IPv4 mask in any accepted notation, or None if it is not a valid mask."""
+    text = str(text).strip()
+    prefix = IPV4_MASK_PREFIXES.get(text.lstrip('/'))
+    if prefix is not None:
+        return prefix
+    digits = text[2:] if text[:2].lower() == '0x' else text
+    if len(digits) == 8:
+        try:
+            value = int(digits, 16)
+        except ValueError:
+            return None
+        # A netmask is a run of ones followed by zeros
+        inverted = ~value & 0xFFFFFFFF
+        if inverted & (inverted + 1) == 0:
+            return 32 - inverted.bit_length()
+    return None
+
+def parse_count(value):
+    """Parse a whole number, allowing whitespace and thousands separators; None when it is not one."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    text = str(value).strip().replace(',', '').replace('_', '')
+    # isdigit() alone also accepts digits such as '²' that int() rejects
+    return int(text) if text.isascii() and text.isdigit() else None
+
+Grade = namedtuple("Grade", "part correct expected diagnostic")
+
+class AnswerKey:
+    """Expected answers for one Question (see subnet_questions) plus a memo of graded answers."""
+
+    def __init__(self, question):
+        self.question = question
+        self.expected = {"bits": question.bits, "netmask": question.netmask, "hosts": question.hosts}
+        self._memo = {part: {} for part in PARTS}
+
+    def diagnose(self, part, answer):
+        """Return CORRECT or the name of the mistake for one answer."""
+        memo = self._memo[part]
+        key = answer if type(answer) in (str, int) else str(answer)
+        diagnostic = memo.get(key)
+        if diagnostic is None:
+            diagnostic = memo[key] = getattr(self, f"_diagnose_{part}")(key)
+        return diagnostic
+
+    def grade(self, part, answer):
+        diagnostic = self.diagnose(part, answer)
+        return Grade(part, diagnostic == CORRECT, self.expected[part], diagnostic)
+
+    def diagnose_many(self, part, answers):
+        """Diagnose a batch of answers to one part; returns a list aligned with `answers`."""
+        memo = self._memo[part]
+        diagnose = getattr(self, f"_diagnose_{part}")
+        get = memo.get
+        result = []
+        append = result.append
+        for answer in answers:
+            # Exact types only: True == 1 and 2.0 == 2 would otherwise share memo entries
+            key = answer if type(answer) in (str, int) else str(answer)
+            diagnostic = get(key)
+            if diagnostic is None:
+                diagnostic = memo[key] = diagnose(key)
+            append(diagnostic)
+        return result
+
+    def score_many(self, part, answers):
+        """Return (number correct, diagnostics) for a batch of answers to one part."""
+        diagnostics = self.diagnose_many(part, answers)
+        return diagnostics.count(CORRECT), diagnostics
+
+    def _diagnose_bits(self, answer):
+        bits = parse_count(answer)
+        if bits is None:
+            return UNPARSEABLE
+        if bits == self.question.bits:
+            return CORRECT
+        return TOO_FEW_BITS if bits < self.question.bits else TOO_MANY_BITS
+
+    def _diagnose_netmask(self, answer):
+        prefix = parse_mask(answer)
+        if prefix == self.question.new_prefix:
+            return CORRECT
+        if prefix is None:
+            # Only the dotted form can be mistaken for a wildcard mask
+            if _WILDCARD_PREFIXES.get(str(answer).strip()) == self.question.new_prefix:
+                return WILDCARD_MASK
+            return UNPARSEABLE
+        return ORIGINAL_MASK if prefix == self.question.network.prefixlen else WRONG
+
+    def _diagnose_hosts(self, answer):
+        hosts = parse_count(answer)
+        if hosts is None:
+            return UNPARSEABLE
+        if hosts == self.question.hosts:
+            return CORRECT
+        return FORGOT_RESERVED if hosts == IPV4_PREFIXES[self.question.new_prefix].total_addresses else WRONG
+
+def grade_bonus(bonus, answer):
+    """Grade a multiple-choice answer (option number from 1, or the option text); returns a Grade."""
+    options = bonus["options"]
+    choice = parse_count(answer)
+    if choice is not None and 1 <= choice <= len(options):
+        text = options[choice - 1]["text"]
+    elif isinstance(answer, str) and any(answer.strip() == o["text"] for o in options):
+        text = answer.strip()
+    else:
+        return Grade("bonus", False, bonus["correct_answer"], UNPARSEABLE)
+    correct = text == bonus["correct_answer"]
+    return Grade("bonus", correct, bonus["correct_answer"], CORRECT if correct else WRONG_OPTION)
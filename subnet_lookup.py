@@ -0,0 +1,170 @@
+"""Longest-prefix-match lookups against a table of allocated subnets.
+
+The prefixes are flattened into a sorted list of disjoint address ranges,
+each owned by the most specific prefix covering it. A lookup is then a
+single binary search: O(log n) whatever the nesting depth, and with NumPy
+whole arrays of IPv4 addresses are resolved in one searchsorted call.
+
+Table files hold one prefix per line, optionally followed by a tag:
+
+    10.0.0.0/8        corp
+    10.20.0.0/16,     lab
+    192.168.1.0 255.255.255.0
+"""
+import bisect
+import ipaddress
+import re
+
+from subnet_core import load_numpy, parse_network
+
+class PrefixTable:
+    """A set of prefixes (with optional tags) answering longest-prefix-match queries."""
+
+    def __init__(self, entries=()):
+        self._starts = []
+        self._prefixlens = []
+        self._versions = []
+        self._tags = []
+        self._indexes = {}
+        self._arrays = {}
+        for network, tag in entries:
+            self.add(network, tag)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def add(self, network, tag=None):
+        """Add a prefix given as text ('10.0.0.0/8') or an ipaddress network object."""
+        if isinstance(network, str):
+            address, prefix, version = parse_network(network.strip())
+        else:
+            address, prefix, version = int(network.network_address), network.prefixlen, network.version
+        max_prefixlen = 32 if version == 4 else 128
+        self._starts.append(address & ~((1 << (max_prefixlen - prefix)) - 1))
+        self._prefixlens.append(prefix)
+        self._versions.append(version)
+        self._tags.append(tag)
+        self._indexes.clear()
+        self._arrays.clear()
+
+    @classmethod
+    def from_lines(cls, lines):
+        """Build a table from 'prefix [tag]' lines; blank lines and # comments are skipped."""
+        table = cls()
+        for line_no, line in enumerate(lines, 1):
+            text = line.strip()
+            if not text or text.startswith('#'):
+                continue
+            prefix_text, tag = _split_field(text)
+            # Allow 'address netmask [tag]' as well as 'cidr [tag]'
+            mask_text, rest = _split_field(tag)
+            if '/' not in prefix_text and _looks_like_mask(mask_text):
+                prefix_text, tag = f"{prefix_text}/{mask_text}", rest
+            try:
+                table.add(prefix_text, tag or None)
+            except ValueError as e:
+                raise ValueError(f"line {line_no}: {e}") from None
+        return table
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_lines(f)
+
+    def _index(self, version):
+        index = self._indexes.get(version)
+        if index is None:
+            index = self._indexes[version] = self._build(version)
+        return index
+
+    def _build(self, version):
+        max_prefixlen = 32 if version == 4 else 128
+        # Parents sort before their children: by start, then shortest prefix first
+        order = sorted(
+            (i for i, v in enumerate(self._versions) if v == version),
+            key=lambda i: (self._starts[i], self._prefixlens[i])
+        )
+        starts, owners = [], []
+
+        def mark(start, owner):
+            # A later mark at the same address wins; equal neighbours are merged
+            if starts and starts[-1] == start:
+                owners[-1] = owner
+                if len(owners) > 1 and owners[-2] == owner:
+                    starts.pop()
+                    owners.pop()
+            elif not owners or owners[-1] != owner:
+                starts.append(start)
+                owners.append(owner)
+
+        stack = []  # (end, owner) of the prefixes enclosing the current position
+        for i in order:
+            start = self._starts[i]
+            while stack and stack[-1][0] < start:
+                end, _ = stack.pop()
+                mark(end + 1, stack[-1][1] if stack else None)
+            mark(start, i)
+            stack.append((start + (1 << (max_prefixlen - self._prefixlens[i])) - 1, i))
+        while stack:
+            end, _ = stack.pop()
+            mark(end + 1, stack[-1][1] if stack else None)
+        return starts, owners
+
+    def lookup_index(self, value, version=4):
+        """Return the entry index of the longest prefix containing the integer address, or None."""
+        starts, owners = self._index(version)
+        position = bisect.bisect_right(starts, value) - 1
+        return owners[position] if position >= 0 else None
+
+    def lookup(self, address):
+        """Return (network, tag) for the longest prefix containing `address`, or None."""
+        address = ipaddress.ip_address(address)
+        i = self.lookup_index(int(address), address.version)
+        if i is None:
+            return None
+        return self.network(i), self._tags[i]
+
+    def lookup_many(self, values, version=4):
+        """Resolve many integer addresses at once; returns entry indexes (-1 when unmatched)."""
+        starts, owners = self._index(version)
+        np = load_numpy() if version == 4 else None
+        if np is not None:
+            arrays = self._arrays.get(version)
+            if arrays is None:
+                arrays = self._arrays[version] = (
+                    np.asarray(starts, dtype=np.int64),
+                    np.asarray([-1] + [-1 if o is None else o for o in owners], dtype=np.int64),
+                )
+            starts_array, owners_array = arrays
+            # owners_array is shifted by one so that "before the first range" maps to -1
+            return owners_array[np.searchsorted(starts_array, np.asarray(values, dtype=np.int64), side='right')]
+        result = []
+        for value in values:
+            position = bisect.bisect_right(starts, value) - 1
+            owner = owners[position] if position >= 0 else None
+            result.append(-1 if owner is None else owner)
+        return result
+
+    def network(self, i):
+        """Return the ipaddress network object for entry `i`."""
+        network_class = ipaddress.IPv4Network if self._versions[i] == 4 else ipaddress.IPv6Network
+        return network_class((self._starts[i], self._prefixlens[i]))
+
+    def tag(self, i):
+        return self._tags[i]
+
+    def prefix(self, i):
+        """Return (network address as int, prefix length, version) for entry `i`."""
+        return self._starts[i], self._prefixlens[i], self._versions[i]
+
+    def ranges(self, version=4):
+        """The lookup index: sorted starts of disjoint address ranges and the entry owning each (None for gaps)."""
+        return self._index(version)
+
+def _split_field(text):
+    """Split off the first comma or whitespace separated field."""
+    parts = re.split(r'[\s,]+', text, maxsplit=1)
+    return parts[0], (parts[1] if len(parts) > 1 else '')
+
+def _looks_like_mask(text):
+    return text.count('.') == 3 and text.replace('.', '').isdigit()
@@ -0,0 +1,154 @@
+"""Paged view over the subnets of a division.
+
+Only the rows of the page on screen are computed, straight from the subnet
+number (base + N * increment), so page 1 and page 1,000,000 of a /8 split
+into /30s cost the same. Jumping to a subnet number and finding the subnet
+that holds an address are arithmetic as well; nothing is ever enumerated.
+"""
+import ipaddress
+
+from subnet_console import console
+from subnet_core import SubnetView, compact_binary
+
+PAGE_ROWS = 20
+
+class SubnetPager:
+    """Pages over the first `count` subnets (all by default) of `network` split into /new_prefix."""
+
+    def __init__(self, network, new_prefix, count=None, page_rows=PAGE_ROWS):
+        view = SubnetView(network, new_prefix)
+        self.view = view if count is None else view[:count]
+        self.network = network
+        self.prefixlen = new_prefix
+        self.page_rows = page_rows
+        self.page = 0
+
+    @property
+    def total(self):
+        return self.view.size
+
+    @property
+    def pages(self):
+        return max(1, -(-self.total // self.page_rows))
+
+    def goto(self, page):
+        """Move to a page (0-based), clamped to the first and last page; returns the page."""
+        self.page = min(max(page, 0), self.pages - 1)
+        return self.page
+
+    def jump(self, number):
+        """Move to the page holding subnet `number` (1-based); returns its index."""
+        if not 1 <= number <= self.total:
+            raise ValueError(f"subnet number must be between 1 and {self.total}")
+        self.goto((number - 1) // self.page_rows)
+        return number - 1
+
+    def find(self, address):
+        """Return the index of the subnet holding `address`, or None if it is not in the view.
+
+        Raises ValueError if `address` is not an IP address.
+        """
+        ip = ipaddress.ip_address(address)
+        if ip.version != self.network.version or ip not in self.network:
+            return None
+        index = (int(ip) - int(self.network.network_address)) >> (self.network.max_prefixlen - self.prefixlen)
+        return index if index < self.total else None
+
+    def rows(self, start, stop):
+        """Yield (number, Subnet) for subnets start..stop-1."""
+        view = self.view
+        for index in range(start, min(stop, self.total)):
+            yield index + 1, view.subnet(index)
+
+    def window(self, page=None):
+        page = self.page if page is None else page
+        start = page * self.page_rows
+        return self.rows(start, start + self.page_rows)
+
+    def make_table(self, title=None, header=True, binary=False):
+        """An empty Table for rows of this view.
+
+        The default columns are the subnet addresses (IPv6 has no broadcast
+        address); binary=True shows the network address and its bits instead,
+        with fixed widths so tables printed one after another line up.
+        """
+        from rich.table import Table
+        table = Table(title=title, show_header=header, header_style="bold blue")
+        table.add_column("Subnet", style="dim", min_width=len(str(self.total)), no_wrap=True)
+        if binary and self.network.version == 4:
+            table.add_column("Network Address", style="bold cyan", width=15)
+            table.add_column("Binary", style="yellow", width=35)
+            return table
+        if binary:
+            table.add_column("Network Address", style="bold cyan", overflow="fold")
+            table.add_column("Binary", style="yellow", overflow="fold")
+            return table
+        overflow = "ellipsis" if self.network.version == 4 else "fold"
+        table.add_column("Network Address", style="bold cyan", overflow=overflow)
+        table.add_column("First Host", style="green", overflow=overflow)
+        table.add_column("Last Host", style="green", overflow=overflow)
+        if self.network.version == 4:
+            table.add_column("Broadcast Address", style="bold magenta")
+        return table
+
+    def cells(self, row, binary=False):
+        """Format a row from rows() as the cells of make_table(binary=binary)."""
+        number, subnet = row
+        if binary:
+            return [str(number), subnet.format(subnet.base), compact_binary(subnet.base, subnet.version)]
+        first, last = subnet.host_range()
+        cells = [str(number), subnet.format(subnet.base), subnet.format(first), subnet.format(last)]
+        if subnet.version == 4:
+            cells.append(subnet.format(subnet.broadcast))
+        return cells
+
+    def table(self, page=None, title=None, highlight=None, binary=False):
+        """Render one page; `highlight` is the index of a row to mark."""
+        page = self.page if page is None else page
+        first = page * self.page_rows + 1
+        last = min(first + self.page_rows - 1, self.total)
+        title = title or f"Subnets of {self.network} as /{self.prefixlen}"
+        table = self.make_table(f"{title} ({first}-{last} of {self.total}, page {page + 1} of {self.pages})", binary=binary)
+        for row in self.window(page):
+            table.add_row(*self.cells(row, binary), style="reverse" if row[0] - 1 == highlight else None)
+        return table
+
+    def show(self, page=None, title=None, highlight=None, binary=False):
+        console.print(self.table(page, title, highlight, binary))
+
+    def browse(self, title=None, binary=False):
+        """Interactive paging: next/previous/first/last page, #N to jump to a subnet, an address to find its subnet."""
+        from rich.prompt import Prompt
+        highlight = None
+        while True:
+            self.show(title=title, highlight=highlight, binary=binary)
+            highlight = None
+            command = Prompt.ask(
+                r"[bold yellow]\[n]ext \[p]revious \[f]irst \[l]ast, #N or an address to jump to its subnet, \[q]uit[/bold yellow]",
+                default="n" if self.page < self.pages - 1 else "q"
+            ).strip().lower()
+            if command in ("q", "quit", "b"):
+                return
+            if command in ("n", ""):
+                self.goto(self.page + 1)
+            elif command == "p":
+                self.goto(self.page - 1)
+            elif command == "f":
+                self.goto(0)
+            elif command == "l":
+                self.goto(self.pages - 1)
+            elif command.lstrip("#").isdigit() and command.lstrip("#").isascii():
+                try:
+                    highlight = self.jump(int(command.lstrip("#")))
+                except ValueError as e:
+                    console.print(f"[bold red]Error:[/bold red] {e}")
+            else:
+                try:
+                    index = self.find(command)
+                except ValueError:
+                    console.print(f"[bold red]Error:[/bold red] not a command, subnet number or IP address: {command}")
+                    continue
+                if index is None:
+                    console.print(f"[bold red]{command} is not in any of these subnets.[/bold red]")
+                else:
+                    highlight = self.jump(index + 1)
@@ -0,0 +1,102 @@
+"""Run large batch jobs on every core.
+
+Input is cut into chunks that are processed by a pool of worker processes
+and the results are yielded in input order, with only a few chunks in
+flight so memory stays flat on inputs of any length. Nothing heavier than
+a string or a bytes buffer crosses the process boundary: text jobs send a
+chunk of input lines as one string and get the formatted output back, and
+subnet_columns() sends IPv4 addresses as packed uint32 and prefix lengths
+as bytes and gets packed uint32 columns back. No ipaddress objects are
+ever pickled.
+"""
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from subnet_core import load_numpy
+from subnet_vector import ipv4_subnets
+
+# Lines or addresses per chunk; large enough that the per-chunk overhead is noise
+CHUNK_SIZE = 50000
+
+# Columns returned by subnet_columns(), all uint32
+PACKED_COLUMNS = ("network", "broadcast", "netmask", "first", "last")
+
+def default_jobs():
+    return os.cpu_count() or 1
+
+def imap_ordered(func, payloads, jobs=None, initializer=None, initargs=(), window=None):
+    """Yield func(payload) for each payload, in order, computed in `jobs` worker processes.
+
+    At most `window` payloads (default two per worker) are queued at a time.
+    `func` and `initializer` must be module-level functions so they can be
+    sent to the workers.
+    """
+    jobs = jobs or default_jobs()
+    window = window or 2 * jobs
+    with ProcessPoolExecutor(jobs, initializer=initializer, initargs=initargs) as pool:
+        pending = deque()
+        for payload in payloads:
+            pending.append(pool.submit(func, payload))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def iter_text_chunks(lines, size=CHUNK_SIZE):
+    """Group lines into (number of the first line, text) chunks; line numbers start at 1."""
+    lines = iter(lines)
+    first_line = 1
+    while True:
+        chunk = list(islice(lines, size))
+        if not chunk:
+            return
+        text = "".join(line if line.endswith("\n") else line + "\n" for line in chunk)
+        yield first_line, text
+        first_line += len(chunk)
+
+def _subnet_chunk(payload):
+    addresses, prefixlens = payload
+    np = load_numpy()
+    if np is not None:
+        columns = ipv4_subnets(np.frombuffer(addresses, dtype=np.uint32), np.frombuffer(prefixlens, dtype=np.uint8))
+        return tuple(np.ascontiguousarray(columns[name], dtype=np.uint32).tobytes() for name in PACKED_COLUMNS)
+    values = array('I')
+    values.frombytes(addresses)
+    columns = ipv4_subnets(values, list(prefixlens))
+    return tuple(array('I', columns[name]).tobytes() for name in PACKED_COLUMNS)
+
+def _pack(addresses, prefixlens, size):
+    np = load_numpy()
+    if np is not None:
+        addresses = np.ascontiguousarray(addresses, dtype=np.uint32)
+        prefixlens = np.ascontiguousarray(np.broadcast_to(np.asarray(prefixlens, dtype=np.uint8), addresses.shape))
+        for start in range(0, len(addresses), size):
+            yield addresses[start:start + size].tobytes(), prefixlens[start:start + size].tobytes()
+        return
+    if isinstance(prefixlens, int):
+        prefixlens = [prefixlens] * len(addresses)
+    for start in range(0, len(addresses), size):
+        yield array('I', addresses[start:start + size]).tobytes(), bytes(prefixlens[start:start + size])
+
+def subnet_columns(addresses, prefixlens, jobs=None, size=CHUNK_SIZE):
+    """Compute the PACKED_COLUMNS for many IPv4 addresses/prefix lengths in parallel.
+
+    Takes sequences or arrays of ints (`prefixlens` may be one int for all)
+    and returns {column: uint32 array} in input order: NumPy arrays when
+    NumPy is installed, array('I') otherwise.
+    """
+    np = load_numpy()
+    parts = {name: [] for name in PACKED_COLUMNS}
+    for result in imap_ordered(_subnet_chunk, _pack(addresses, prefixlens, size), jobs):
+        for name, data in zip(PACKED_COLUMNS, result):
+            parts[name].append(data)
+    if np is not None:
+        return {name: np.frombuffer(b"".join(chunks), dtype=np.uint32) for name, chunks in parts.items()}
+    columns = {}
+    for name, chunks in parts.items():
+        columns[name] = array('I')
+        columns[name].frombytes(b"".join(chunks))
+    return columns
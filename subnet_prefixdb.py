@@ -0,0 +1,325 @@
+"""Memory-mapped binary prefix database.
+
+A text prefix table (see subnet_lookup) is parsed and indexed again on
+every run, which dominates the run time for inventories of millions of
+prefixes. build_prefix_db() writes the parsed table and its lookup index
+to a compact binary file once. PrefixDB maps that file into memory and
+answers queries from the mapped pages directly. Opening a database reads
+only its header, nothing is parsed or copied, and a lookup touches only
+the pages its binary search visits.
+
+    python subnet_prefixdb.py prefixes.txt prefixes.spdb
+
+Any command that takes a prefix table file (the calculator's Identify
+Subnet option, `subnet_batch.py lookup --table`) accepts a database too.
+
+File layout, little-endian, every section aligned to 8 bytes:
+
+    header      magic b"SUBNETDB", format version, number of sections
+    directory   (name, offset, size) of every section
+    4STA 4END   IPv4 prefix first and last addresses (uint32), sorted by (start, prefix length)
+    4LEN        prefix lengths (uint8)
+    4TAG        tag numbers (uint32, 0xFFFFFFFF when untagged)
+    4PAR        record of the closest enclosing prefix (int32, -1 for none)
+    4RNG 4OWN   lookup index: first address of each disjoint address range
+                (uint32) and the record of the longest prefix covering it (int32, -1 for none)
+    6STA ...    the same seven sections for IPv6, addresses as 16-byte big-endian keys
+    TOFF TSTR   tags: offsets (uint32) into one UTF-8 string
+
+Records are numbered in sorted order, IPv4 first, then IPv6. Like the entry
+indexes of a PrefixTable, they work with lookup_index(), network() and tag().
+"""
+import bisect
+import ipaddress
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from subnet_core import load_numpy
+from subnet_lookup import PrefixTable
+
+MAGIC = b"SUBNETDB"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<4sQQ")
+_NO_TAG = 0xFFFFFFFF
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+def _uint32_bytes(values, typecode='I'):
+    data = array(typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+def _family_sections(table, version, tag_numbers):
+    """Build the seven sections of one address family from a PrefixTable."""
+    order = sorted(
+        (i for i in range(len(table)) if table.prefix(i)[2] == version),
+        key=lambda i: table.prefix(i)[:2]
+    )
+    max_prefixlen = 32 if version == 4 else 128
+    max_address = (1 << max_prefixlen) - 1
+    starts, ends, prefixlens, tags, parents = [], [], [], [], []
+    stack = []  # (end, record) of the prefixes enclosing the current one
+    for record, i in enumerate(order):
+        start, prefixlen, _ = table.prefix(i)
+        end = start + (1 << (max_prefixlen - prefixlen)) - 1
+        # CIDR blocks are either nested or disjoint, so the enclosing prefix is on top of the stack
+        while stack and stack[-1][0] < start:
+            stack.pop()
+        parents.append(stack[-1][1] if stack else -1)
+        stack.append((end, record))
+        starts.append(start)
+        ends.append(end)
+        prefixlens.append(prefixlen)
+        tag = table.tag(i)
+        tags.append(_NO_TAG if tag is None else tag_numbers.setdefault(tag, len(tag_numbers)))
+    position = {i: record for record, i in enumerate(order)}
+    range_starts, owners = table.ranges(version)
+    owners = [-1 if owner is None else position[owner] for owner in owners]
+    if range_starts and range_starts[-1] > max_address:
+        # The gap after a prefix ending at the top of the address space starts past it; nothing can be looked up there
+        range_starts, owners = range_starts[:-1], owners[:-1]
+    if version == 4:
+        keys = _uint32_bytes
+    else:
+        keys = lambda values: b"".join(value.to_bytes(16, 'big') for value in values)
+    prefix = str(version).encode()
+    return [
+        (prefix + b"STA", keys(starts)),
+        (prefix + b"END", keys(ends)),
+        (prefix + b"LEN", bytes(prefixlens)),
+        (prefix + b"TAG", _uint32_bytes(tags)),
+        (prefix + b"PAR", _uint32_bytes(parents, 'i')),
+        (prefix + b"RNG", keys(range_starts)),
+        (prefix + b"OWN", _uint32_bytes(owners, 'i')),
+    ]
+
+def build_prefix_db(table, path):
+    """Write a PrefixTable to `path` as a prefix database; returns the file size in bytes.
+
+    The file is written next to `path` and renamed into place, so readers
+    never see a half-written database.
+    """
+    tag_numbers = {}
+    sections = _family_sections(table, 4, tag_numbers) + _family_sections(table, 6, tag_numbers)
+    blobs = [tag.encode('utf-8') for tag in tag_numbers]
+    offsets = [0]
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    sections += [(b"TOFF", _uint32_bytes(offsets)), (b"TSTR", b"".join(blobs))]
+
+    offset = _align(_HEADER.size + _SECTION.size * len(sections))
+    directory = []
+    for name, data in sections:
+        directory.append(_SECTION.pack(name, offset, len(data)))
+        offset = _align(offset + len(data))
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections)))
+        f.write(b"".join(directory))
+        for (name, data), entry in zip(sections, directory):
+            f.seek(_SECTION.unpack(entry)[1])
+            f.write(data)
+        f.truncate(offset)
+    os.replace(temp_path, path)
+    return offset
+
+class _Keys:
+    """Read-only sequence of the 16-byte keys in one section, for bisect."""
+
+    def __init__(self, buffer, offset, size):
+        self._buffer = buffer
+        self._offset = offset
+        self._len = size // 16
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        start = self._offset + 16 * i
+        return self._buffer[start:start + 16]
+
+class PrefixDB:
+    """A prefix database file mapped into memory, with the query methods of PrefixTable."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"{path}: not a prefix database (empty file)") from None
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"{path}: not a prefix database")
+        magic, file_version, count = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a prefix database")
+        if file_version != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported prefix database version {file_version}")
+        self._sections = {}
+        for n in range(count):
+            name, offset, size = _SECTION.unpack_from(self._map, _HEADER.size + _SECTION.size * n)
+            if offset + size > len(self._map):
+                raise ValueError(f"{path}: truncated prefix database")
+            self._sections[name.decode('ascii')] = (offset, size)
+        self._views = []
+        self._columns = {}
+        self._counts = {4: self._sections["4LEN"][1], 6: self._sections["6LEN"][1]}
+        self.path = path
+
+    def _view(self, name, typecode='B'):
+        """Zero-copy view of a section (a copy on big-endian machines)."""
+        offset, size = self._sections[name]
+        view = memoryview(self._map)[offset:offset + size]
+        self._views.append(view)
+        if typecode == 'B':
+            return view
+        if sys.byteorder == 'big':
+            data = array(typecode)
+            data.frombytes(view)
+            data.byteswap()
+            return data
+        view = view.cast(typecode)
+        self._views.append(view)
+        return view
+
+    def _column(self, name, typecode='B'):
+        # Created on first use and kept, so opening a database stays constant-time
+        key = (name, typecode)
+        column = self._columns.get(key)
+        if column is None:
+            column = self._columns[key] = self._view(name, typecode)
+        return column
+
+    def _keys(self, version, name):
+        if version == 4:
+            return self._column(f"4{name}", 'I')
+        return _Keys(self._map, *self._sections[f"6{name}"])
+
+    def __len__(self):
+        return self._counts[4] + self._counts[6]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._columns.clear()
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._map.close()
+
+    def _record(self, i):
+        """Split a record number into (version, record number within the family)."""
+        if not 0 <= i < len(self):
+            raise IndexError("record number out of range")
+        return (4, i) if i < self._counts[4] else (6, i - self._counts[4])
+
+    def _base(self, version):
+        return 0 if version == 4 else self._counts[4]
+
+    def lookup_index(self, value, version=4):
+        """Return the record number of the longest prefix containing the integer address, or None."""
+        key = value if version == 4 else value.to_bytes(16, 'big')
+        position = bisect.bisect_right(self._keys(version, "RNG"), key) - 1
+        if position < 0:
+            return None
+        owner = self._column(f"{version}OWN", 'i')[position]
+        return None if owner < 0 else owner + self._base(version)
+
+    def lookup(self, address):
+        """Return (network, tag) for the longest prefix containing `address`, or None."""
+        address = ipaddress.ip_address(address)
+        i = self.lookup_index(int(address), address.version)
+        if i is None:
+            return None
+        return self.network(i), self.tag(i)
+
+    def containing(self, address):
+        """Return (network, tag) for every prefix containing `address`, most specific first."""
+        address = ipaddress.ip_address(address)
+        i = self.lookup_index(int(address), address.version)
+        matches = []
+        while i is not None:
+            matches.append((self.network(i), self.tag(i)))
+            version, record = self._record(i)
+            parent = self._column(f"{version}PAR", 'i')[record]
+            i = None if parent < 0 else parent + self._base(version)
+        return matches
+
+    def contains(self, address):
+        """True if any prefix in the database contains `address`."""
+        address = ipaddress.ip_address(address)
+        return self.lookup_index(int(address), address.version) is not None
+
+    def lookup_many(self, values, version=4):
+        """Resolve many integer addresses at once; returns record numbers (-1 when unmatched)."""
+        np = load_numpy() if version == 4 else None
+        if np is None:
+            result = []
+            for value in values:
+                i = self.lookup_index(value, version)
+                result.append(-1 if i is None else i)
+            return result
+        # Searched in place: NumPy arrays over the mapped pages, nothing is copied
+        offset, size = self._sections["4RNG"]
+        starts = np.frombuffer(self._map, dtype='<u4', count=size // 4, offset=offset)
+        offset, size = self._sections["4OWN"]
+        owners = np.frombuffer(self._map, dtype='<i4', count=size // 4, offset=offset)
+        positions = np.searchsorted(starts, np.asarray(values, dtype=np.uint32), side='right')
+        return np.where(positions > 0, owners[positions - 1], -1)
+
+    def prefix(self, i):
+        """Return (network address as int, prefix length, version) for record `i`."""
+        version, record = self._record(i)
+        start = self._keys(version, "STA")[record]
+        if version == 6:
+            start = int.from_bytes(start, 'big')
+        return start, self._column(f"{version}LEN")[record], version
+
+    def network(self, i):
+        """Return the ipaddress network object for record `i`."""
+        start, prefixlen, version = self.prefix(i)
+        network_class = ipaddress.IPv4Network if version == 4 else ipaddress.IPv6Network
+        return network_class((start, prefixlen))
+
+    def tag(self, i):
+        version, record = self._record(i)
+        number = self._column(f"{version}TAG", 'I')[record]
+        if number == _NO_TAG:
+            return None
+        offsets = self._column("TOFF", 'I')
+        offset = self._sections["TSTR"][0]
+        return self._map[offset + offsets[number]:offset + offsets[number + 1]].decode('utf-8')
+
+def open_prefix_table(path):
+    """Open a prefix database, or parse a text prefix table, depending on what `path` holds."""
+    with open(path, 'rb') as f:
+        is_db = f.read(len(MAGIC)) == MAGIC
+    return PrefixDB(path) if is_db else PrefixTable.from_file(path)
+
+def main(argv=None):
+    import argparse  # only the builder needs it; the calculator imports this module too
+    parser = argparse.ArgumentParser(description="Build a memory-mapped prefix database from a text prefix table.")
+    parser.add_argument("table", help="Text prefix table: one 'prefix [tag]' per line")
+    parser.add_argument("output", help="Database file to write")
+    args = parser.parse_args(argv)
+    try:
+        table = PrefixTable.from_file(args.table)
+        size = build_prefix_db(table, args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    print(f"Wrote {len(table)} prefixes ({size:,} bytes) to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Opt-in instrumentation for the calculator and the quiz.
+
+Turned on by the SUBNET_PROFILE environment variable or by the --profile
+flag of subnetting_calc.py and main.py:
+
+    SUBNET_PROFILE=1 python subnetting_calc.py
+    python main.py --profile --profile-out quiz.pstats
+
+Every calculator operation and every quiz step runs as a named phase.
+While profiling, ipaddress parsing, binary string formatting, Rich
+rendering and waiting for input are timed as phases nested inside them, so
+a slow operation can be pinned on one of those. On exit a table lists for
+each phase the number of calls, the wall time (total, and self time
+without nested phases), the net change in allocated memory blocks and, for
+operations and steps, the net change in objects tracked by the garbage
+collector. --profile-out PATH (or SUBNET_PROFILE_OUT) also runs cProfile
+and writes its stats to PATH for pstats or snakeviz.
+
+When profiling is off nothing is wrapped and step() returns at once, so
+the calculator and quiz run exactly as before.
+"""
+import atexit
+import functools
+import gc
+import os
+import sys
+import time
+
+ENV_VAR = "SUBNET_PROFILE"
+OUTPUT_ENV_VAR = "SUBNET_PROFILE_OUT"
+
+enabled = False
+
+# phase path ("identify_subnet > render") -> [calls, total seconds, self seconds, blocks, objects]
+_stats = {}
+# [path, seconds spent in nested phases] of the phases currently running
+_stack = []
+_step = None
+_profiler = None
+
+class _Phase:
+    """Times one run of a phase and adds it to the statistics of its path."""
+
+    __slots__ = ("name", "count_objects", "path", "start", "blocks", "objects")
+
+    def __init__(self, name, count_objects=False):
+        self.name = name
+        self.count_objects = count_objects
+
+    def __enter__(self):
+        self.path = f"{_stack[-1][0]} > {self.name}" if _stack else self.name
+        # Counting objects walks the whole heap, so the frequent inner phases skip it
+        self.objects = len(gc.get_objects()) if self.count_objects else None
+        _stack.append([self.path, 0.0])
+        self.blocks = sys.getallocatedblocks()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        blocks = sys.getallocatedblocks() - self.blocks
+        _, nested = _stack.pop()
+        if _stack:
+            _stack[-1][1] += elapsed
+        stats = _stats.setdefault(self.path, [0, 0.0, 0.0, 0, None])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] += elapsed - nested
+        stats[3] += blocks
+        if self.objects is not None:
+            stats[4] = (stats[4] or 0) + len(gc.get_objects()) - self.objects
+        return False
+
+def step(name):
+    """End the current step, if any, and start timing the next one; step(None) just ends it.
+
+    For long stretches of inline code such as the parts of a quiz question.
+    """
+    global _step
+    if not enabled:
+        return
+    if _step is not None:
+        _step.__exit__(None, None, None)
+        _step = None
+    if name is not None:
+        _step = _Phase(name, count_objects=True)
+        _step.__enter__()
+
+def _wrap(owner, attr, name, count_objects=False):
+    """Replace owner.attr (a module namespace dict, or a class) with a version timed as phase `name`."""
+    namespace = owner if isinstance(owner, dict) else vars(owner)
+    func = namespace.get(attr)
+    if func is None:
+        return
+    is_classmethod = isinstance(func, classmethod)
+    target = func.__func__ if is_classmethod else func
+    if getattr(target, "_profiled", False):
+        return
+
+    @functools.wraps(target)
+    def wrapper(*args, **kwargs):
+        with _Phase(name, count_objects):
+            return target(*args, **kwargs)
+
+    wrapper._profiled = True
+    value = classmethod(wrapper) if is_classmethod else wrapper
+    if isinstance(owner, dict):
+        owner[attr] = value
+    else:
+        setattr(owner, attr, value)
+
+def _install_hooks():
+    import ipaddress
+    from rich.console import Console
+    from rich.prompt import PromptBase
+    for attr in ("ip_address", "ip_network", "ip_interface"):
+        _wrap(ipaddress, attr, "ipaddress")
+    # The binary helpers are imported by name, so wrap them wherever they were imported
+    for module_name, module in list(sys.modules.items()):
+        if module is not None and (module_name.startswith("subnet") or module_name in ("main", "__main__")):
+            for attr in ("binary_representation", "binary_representations", "compact_binary"):
+                _wrap(vars(module), attr, "binary strings")
+    _wrap(Console, "print", "render")
+    _wrap(PromptBase, "ask", "input")
+
+def enable(namespace=None, operations=(), output=None):
+    """Start profiling: wrap `operations` (names of functions in the module namespace dict `namespace`) and the hooks.
+
+    With `output`, cProfile runs too and its stats are written there on exit.
+    """
+    global enabled, _profiler
+    if enabled:
+        return
+    enabled = True
+    for name in operations:
+        _wrap(namespace, name, name, count_objects=True)
+    _install_hooks()
+    if output:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    atexit.register(_finish, output)
+
+def setup(namespace=None, operations=(), argv=None):
+    """Enable profiling if SUBNET_PROFILE / SUBNET_PROFILE_OUT or --profile / --profile-out PATH in argv ask for it."""
+    argv = sys.argv[1:] if argv is None else argv
+    wanted = os.environ.get(ENV_VAR, "") not in ("", "0")
+    output = os.environ.get(OUTPUT_ENV_VAR) or None
+    for i, arg in enumerate(argv):
+        if arg == "--profile":
+            wanted = True
+        elif arg == "--profile-out" and i + 1 < len(argv):
+            output = argv[i + 1]
+        elif arg.startswith("--profile-out="):
+            output = arg.split("=", 1)[1]
+    if wanted or output:
+        enable(namespace, operations, output)
+
+def _finish(output):
+    step(None)
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(output)
+    report()
+    if output:
+        print(f"cProfile stats written to {output} (python -m pstats {output})", file=sys.stderr)
+
+def report(file=None):
+    """Print the phase statistics collected so far as a table (to stderr by default)."""
+    from rich.console import Console
+    from rich.table import Table
+    if not _stats:
+        return
+    table = Table(title="Profile", header_style="bold blue")
+    table.add_column("Phase", style="cyan", no_wrap=True)
+    for column in ("Calls", "Total ms", "Self ms", "Mean ms", "Blocks", "Objects"):
+        table.add_column(column, justify="right")
+    for path in sorted(_stats, key=lambda path: path.split(" > ")):
+        calls, total, own, blocks, objects = _stats[path]
+        depth = path.count(" > ")
+        table.add_row(
+            "  " * depth + path.rsplit(" > ", 1)[-1], str(calls), f"{total * 1e3:.2f}", f"{own * 1e3:.2f}",
+            f"{total / calls * 1e3:.3f}", f"{blocks:+d}", "" if objects is None else f"{objects:+d}"
+        )
+    console = Console(file=file or sys.stderr, emoji=False)
+    # Redirected output defaults to 80 columns, too narrow for nested phase names
+    console.width = max(console.width, 100)
+    console.print(table)
@@ -0,0 +1,106 @@
+"""Quiz progress kept in a SQLite database.
+
+One row per (user, section, question) holds the attempt and miss counts.
+Every answer is a single UPSERT that increments the counters inside
+SQLite, so a write costs the same however long the history is, and
+several quiz sessions can share one file without losing each other's
+updates. The database runs in WAL mode so readers never block the writer.
+
+The database lives next to the scripts, whatever the current directory,
+and the old progress.json (miss counts only) is imported from there the
+first time a new database is created.
+"""
+import getpass
+import json
+import os
+import sqlite3
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_PATH = os.path.join(BASE_DIR, "progress.db")
+LEGACY_PATH = os.path.join(BASE_DIR, "progress.json")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    user TEXT NOT NULL,
+    section TEXT NOT NULL,
+    question TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user, section, question)
+) WITHOUT ROWID
+"""
+
+_RECORD = """
+INSERT INTO progress (user, section, question, attempts, misses) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (user, section, question) DO UPDATE SET
+    attempts = attempts + excluded.attempts,
+    misses = misses + excluded.misses
+"""
+
+def default_user():
+    try:
+        return getpass.getuser()
+    except Exception:  # no login name available (e.g. some containers)
+        return "default"
+
+class ProgressStore:
+    """Per-user attempt and miss counts for quiz questions, keyed by section and question ID."""
+
+    def __init__(self, path=DEFAULT_PATH, user=None, legacy_path=LEGACY_PATH):
+        self.path = path
+        self.user = user or default_user()
+        is_new = path == ":memory:" or not os.path.exists(path)
+        # Concurrent writers wait for each other instead of failing straight away
+        self._db = sqlite3.connect(path, timeout=10, isolation_level=None)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        if is_new and legacy_path and os.path.exists(legacy_path):
+            self.import_json(legacy_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def record(self, section, question, correct, user=None):
+        """Count one answer to a question (a miss when not `correct`)."""
+        self._db.execute(_RECORD, (user or self.user, section, question, 1, 0 if correct else 1))
+
+    def misses(self, section, user=None):
+        """Return {question id: misses} for one user and section."""
+        rows = self._db.execute(
+            "SELECT question, misses FROM progress WHERE user = ? AND section = ? AND misses > 0",
+            (user or self.user, section)
+        )
+        return dict(rows)
+
+    def stats(self, section, user=None):
+        """Return {question id: (attempts, misses)} for one user and section."""
+        rows = self._db.execute(
+            "SELECT question, attempts, misses FROM progress WHERE user = ? AND section = ?",
+            (user or self.user, section)
+        )
+        return {question: (attempts, misses) for question, attempts, misses in rows}
+
+    def users(self):
+        return [user for user, in self._db.execute("SELECT DISTINCT user FROM progress ORDER BY user")]
+
+    def import_json(self, path, user=None):
+        """Merge the miss counts of an old progress.json ({section: {question: misses}}) into the store."""
+        with open(path, 'r', encoding='utf-8') as f:
+            legacy = json.load(f)
+        rows = [
+            (user or self.user, section, str(question), int(count), int(count))
+            for section, counts in legacy.items()
+            for question, count in counts.items()
+        ]
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.executemany(_RECORD, rows)
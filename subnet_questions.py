@@ -0,0 +1,196 @@
+"""Question bank for the subnetting quiz.
+
+Every question has a stable ID and its answers (bits to borrow, new mask,
+usable hosts) worked out once when the bank is built. Draws
+are weighted by how often a question was missed, using a Fenwick tree so
+that a draw and a weight update both cost O(log n) whatever the pool size.
+"""
+import copy
+import ipaddress
+import random
+from collections import namedtuple
+from collections.abc import Sequence
+from itertools import product
+
+from subnet_core import IPV4_PREFIXES
+
+class WeightedSampler:
+    """Draws indexes with probability proportional to their weight (a Fenwick / binary indexed tree)."""
+
+    def __init__(self, weights):
+        self._weights = list(weights)
+        n = len(self._weights)
+        tree = [0] * (n + 1)
+        for i, weight in enumerate(self._weights, 1):
+            tree[i] += weight
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._top = 1 << (n.bit_length() - 1) if n else 0
+
+    def __len__(self):
+        return len(self._weights)
+
+    @property
+    def total(self):
+        return self.prefix_sum(len(self._weights))
+
+    def weight(self, i):
+        return self._weights[i]
+
+    def prefix_sum(self, count):
+        """Sum of the first `count` weights."""
+        total = 0
+        while count:
+            total += self._tree[count]
+            count &= count - 1
+        return total
+
+    def add(self, i, delta):
+        """Add `delta` to the weight of index `i`."""
+        self._weights[i] += delta
+        i += 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def update(self, i, weight):
+        self.add(i, weight - self._weights[i])
+
+    def sample(self, rng=None):
+        """Return a random index; index i is drawn with probability weight(i) / total."""
+        rng = rng or random
+        total = self.total
+        if total <= 0:
+            raise ValueError("cannot sample when every weight is zero")
+        target = rng.randrange(total) if isinstance(total, int) else rng.random() * total
+        # Walk down the tree: find the last position whose prefix sum is <= target
+        position = 0
+        step = self._top
+        while step:
+            child = position + step
+            if child < len(self._tree) and self._tree[child] <= target:
+                position = child
+                target -= self._tree[child]
+            step >>= 1
+        return min(position, len(self._weights) - 1)
+
+class QuestionBank:
+    """Questions addressed by stable ID and drawn in proportion to 1 + times missed."""
+
+    def __init__(self, questions, ids=None):
+        # A sequence (such as a loaded exam pack) is used as is, so its questions can be built on demand
+        self.questions = questions if isinstance(questions, Sequence) else list(questions)
+        self.ids = list(ids) if ids is not None else [q.id for q in self.questions]
+        self._positions = {qid: i for i, qid in enumerate(self.ids)}
+        self._sampler = WeightedSampler([1] * len(self.questions))
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __contains__(self, qid):
+        return qid in self._positions
+
+    def get(self, qid):
+        return self.questions[self._positions[qid]]
+
+    def misses(self, qid):
+        return self._sampler.weight(self._positions[qid]) - 1
+
+    def fork(self):
+        """A bank over the same questions and IDs, with its own miss counts starting from zero."""
+        bank = copy.copy(self)
+        bank._sampler = WeightedSampler([1] * len(self.questions))
+        return bank
+
+    def draw(self, rng=None):
+        """Return (id, question), favouring questions that were missed before."""
+        i = self._sampler.sample(rng)
+        return self.ids[i], self.questions[i]
+
+    def record_miss(self, qid, count=1):
+        self._sampler.add(self._positions[qid], count)
+
+    def load_misses(self, counts):
+        """Set the miss counts from a {question id: misses} mapping; unknown IDs are ignored."""
+        for qid, count in counts.items():
+            i = self._positions.get(qid)
+            if i is not None:
+                self._sampler.update(i, 1 + count)
+
+Question = namedtuple("Question", "id network required_subnets bits new_prefix netmask hosts")
+
+def make_question(network, required_subnets):
+    """Build a Question with all of its answers precomputed."""
+    if not isinstance(network, ipaddress.IPv4Network):
+        network = ipaddress.IPv4Network(network, strict=False)
+    bits = (required_subnets - 1).bit_length()
+    new_prefix = network.prefixlen + bits
+    info = IPV4_PREFIXES[new_prefix]
+    return Question(
+        f"{network.with_prefixlen}:{required_subnets}", network, required_subnets, bits, new_prefix,
+        info.netmask_str, info.usable_hosts
+    )
+
+BEGINNER_NETWORKS = (
+    "192.168.0.0/24",    # Common home network
+    "192.168.1.0/24",    # Another common home network
+    "172.16.0.0/16",     # Small business network
+    "10.0.0.0/16",       # Larger business network, but still manageable for beginners
+)
+BEGINNER_SUBNETS = (2, 4, 8)
+
+# Keep at least two host bits (a /30) after borrowing
+MAX_NEW_PREFIX = 30
+
+def generate_network(difficulty='beginner', rng=None):
+    """Generate a random network based on difficulty level using realistic private IP ranges."""
+    rng = rng or random
+    if difficulty == 'beginner':
+        network = rng.choice(BEGINNER_NETWORKS)
+        required_subnets = rng.choice(BEGINNER_SUBNETS)
+    else:
+        # For advanced, use more varied private IP ranges
+        first_octet = rng.choice([10, 172, 192])
+        if first_octet == 10:
+            second_octet = rng.randint(0, 255)
+            third_octet = rng.randint(0, 255)
+            cidr = rng.randint(16, 24)
+        elif first_octet == 172:
+            second_octet = rng.randint(16, 31)
+            third_octet = rng.randint(0, 255)
+            cidr = rng.randint(16, 24)
+        else:  # 192
+            second_octet = 168
+            third_octet = rng.randint(0, 255)
+            cidr = rng.randint(24, 28)
+        network = f"{first_octet}.{second_octet}.{third_octet}.0/{cidr}"
+        # Small networks cannot be split 32 ways, so cap the request at what fits
+        required_subnets = rng.randint(2, min(32, 1 << (MAX_NEW_PREFIX - cidr)))
+
+    return {
+        "network": ipaddress.IPv4Network(network, strict=False),
+        "required_subnets": required_subnets
+    }
+
+# Default number of generated questions in an advanced pool
+POOL_SIZE = 1000
+
+def build_question_bank(difficulty='beginner', size=POOL_SIZE, rng=None):
+    """Build a QuestionBank; beginner pools hold every combination, advanced pools `size` random questions."""
+    if difficulty == 'beginner':
+        return QuestionBank(make_question(n, s) for n, s in product(BEGINNER_NETWORKS, BEGINNER_SUBNETS))
+    questions = {}
+    # Duplicates are dropped, so allow a few extra attempts before giving up on reaching `size`
+    for _ in range(size * 2):
+        if len(questions) >= size:
+            break
+        spec = generate_network(difficulty, rng)
+        question = make_question(spec["network"], spec["required_subnets"])
+        questions.setdefault(question.id, question)
+    return QuestionBank(questions.values())
+
+def bonus_question_bank(json_questions):
+    """QuestionBank over qanda.json entries; an entry's ID is its "id" field, or its position in the file."""
+    return QuestionBank(json_questions, [str(q.get("id", i)) for i, q in enumerate(json_questions)])
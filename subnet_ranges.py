@@ -0,0 +1,148 @@
+"""Set operations over large collections of CIDR prefixes.
+
+Prefixes are handled as integer (start, end) ranges: sorting them once and
+sweeping left to right answers questions such as "what is the smallest set
+of CIDRs covering all of these?", "which allocations collide?" or "what is
+still free in this block?" in O(n log n), without building ipaddress
+objects for every input. With NumPy the IPv4 merge is vectorized.
+"""
+import ipaddress
+
+from subnet_core import load_numpy, parse_network, range_to_prefixes
+
+def prefix_range(address, prefixlen, max_prefixlen=32):
+    """Return the (start, end) integer range of the prefix containing `address`."""
+    wildcard = (1 << (max_prefixlen - prefixlen)) - 1
+    start = address & ~wildcard
+    return start, start | wildcard
+
+def read_prefixes(lines):
+    """Parse CIDR lines into {version: [(start, end), ...]}; blank lines and # comments are skipped."""
+    ranges = {4: [], 6: []}
+    for line_no, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        try:
+            address, prefix, version = parse_network(text.split()[0])
+        except ValueError as e:
+            raise ValueError(f"line {line_no}: {e}") from None
+        ranges[version].append(prefix_range(address, prefix, 32 if version == 4 else 128))
+    return ranges
+
+def read_inventory(lines):
+    """Parse CIDR lines into {version: [(start, end, prefix as written), ...]}; anything after the prefix is ignored."""
+    entries = {4: [], 6: []}
+    for line_no, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        label = text.split()[0]
+        try:
+            address, prefix, version = parse_network(label)
+        except ValueError as e:
+            raise ValueError(f"line {line_no}: {e}") from None
+        entries[version].append(prefix_range(address, prefix, 32 if version == 4 else 128) + (label,))
+    return entries
+
+# Below this many ranges the plain Python sweep is faster than converting to arrays.
+NUMPY_MIN_RANGES = 1024
+
+def merge_ranges(ranges, max_prefixlen=32):
+    """Merge overlapping or adjacent (start, end) ranges; returns a sorted list of disjoint ranges."""
+    if max_prefixlen == 32 and len(ranges) >= NUMPY_MIN_RANGES:
+        np = load_numpy()
+        if np is not None:
+            return _merge_ranges_numpy(np, ranges)
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+def _merge_ranges_numpy(np, ranges):
+    pairs = np.array(ranges, dtype=np.int64)
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+    starts, ends = pairs[:, 0], pairs[:, 1]
+    # Running maximum of the ends: a new group starts where a range begins past everything before it
+    reach = np.maximum.accumulate(ends)
+    new_group = np.empty(len(starts), dtype=bool)
+    new_group[0] = True
+    new_group[1:] = starts[1:] > reach[:-1] + 1
+    group_starts = starts[new_group]
+    group_ends = reach[np.append(np.flatnonzero(new_group)[1:] - 1, len(starts) - 1)]
+    return list(zip(group_starts.tolist(), group_ends.tolist()))
+
+def collapse(ranges, max_prefixlen=32):
+    """Return the fewest (address, prefixlen) CIDRs covering exactly the union of the ranges."""
+    prefixes = []
+    for start, end in merge_ranges(ranges, max_prefixlen):
+        prefixes.extend(range_to_prefixes(start, end, max_prefixlen))
+    return prefixes
+
+DUPLICATE = "duplicate"
+CONTAINS = "contains"
+
+def iter_conflicts(entries):
+    """Yield (kind, outer, inner) for every duplicate or nested pair of (start, end, label) entries.
+
+    Two CIDR blocks are either disjoint or one contains the other, so every
+    overlap is a DUPLICATE (same block) or a CONTAINS. Entries are swept in
+    (start, larger first) order with a stack of the blocks still open:
+    everything on the stack contains the current block. The sort dominates,
+    O(n log n) plus one step per reported pair; labels are yielded as given.
+    """
+    stack = []
+    for entry in sorted(entries, key=lambda entry: (entry[0], -entry[1])):
+        start, end = entry[0], entry[1]
+        while stack and stack[-1][1] < start:
+            stack.pop()
+        for outer in stack:
+            yield (DUPLICATE if outer[0] == start and outer[1] == end else CONTAINS), outer[2], entry[2]
+        stack.append(entry)
+
+def iter_gaps(ranges, parent_start, parent_end, max_prefixlen=32):
+    """Yield the (start, end) ranges inside parent_start..parent_end that no range covers."""
+    inside = [(max(r[0], parent_start), min(r[1], parent_end)) for r in ranges if r[1] >= parent_start and r[0] <= parent_end]
+    cursor = parent_start
+    for start, end in merge_ranges(inside, max_prefixlen):
+        if start > cursor:
+            yield cursor, start - 1
+        cursor = end + 1
+    if cursor <= parent_end:
+        yield cursor, parent_end
+
+def iter_free_prefixes(ranges, parent_start, parent_end, max_prefixlen=32):
+    """Yield the free space inside a parent block as (address, prefixlen) CIDRs, lowest first."""
+    for start, end in iter_gaps(ranges, parent_start, parent_end, max_prefixlen):
+        yield from range_to_prefixes(start, end, max_prefixlen)
+
+def smallest_supernet(ranges, max_prefixlen=32):
+    """Return (address, prefixlen) of the single smallest CIDR containing every range, or None."""
+    if not ranges:
+        return None
+    low = min(start for start, _ in ranges)
+    high = max(end for _, end in ranges)
+    prefix = max_prefixlen - (low ^ high).bit_length()
+    return prefix_range(low, prefix, max_prefixlen)[0], prefix
+
+def summarize(networks):
+    """Collapse ipaddress networks or CIDR strings; returns (collapsed networks, supernets by version)."""
+    ranges = {4: [], 6: []}
+    for network in networks:
+        if isinstance(network, str):
+            address, prefix, version = parse_network(network.strip())
+        else:
+            address, prefix, version = int(network.network_address), network.prefixlen, network.version
+        ranges[version].append(prefix_range(address, prefix, 32 if version == 4 else 128))
+
+    collapsed, supernets = [], {}
+    for version, network_class, max_prefixlen in ((4, ipaddress.IPv4Network, 32), (6, ipaddress.IPv6Network, 128)):
+        if not ranges[version]:
+            continue
+        collapsed.extend(network_class(block) for block in collapse(ranges[version], max_prefixlen))
+        supernets[version] = network_class(smallest_supernet(ranges[version], max_prefixlen))
+    return collapsed, supernets
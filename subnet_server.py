@@ -0,0 +1,277 @@
+"""Multi-user quiz server: the subnetting quiz over a small local HTTP/JSON API.
+
+Runs on asyncio in a single process; every session lives in memory and
+answers are graded without any rendering, so one process keeps up with
+thousands of concurrent sessions. Connections are kept alive between
+requests.
+
+    python subnet_server.py --port 8080
+
+    POST /sessions                 {"difficulty": "beginner", "questions": 3}
+                                   -> {"session": id, "total_questions": 3, "max_score": 12}
+    GET  /sessions/<id>/question   -> the current part of the current question
+    POST /sessions/<id>/answer     {"answer": ...} -> {"correct": ..., "expected": ..., "score": ...}
+    GET  /sessions/<id>            -> score so far
+
+Each question has four parts, answered in order: bits to borrow, new
+subnet mask, usable hosts per subnet, and a multiple-choice bonus question
+from qanda.json (answer with the option number, 1-4).
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import time
+
+from subnet_console import load_data
+from subnet_grading import AnswerKey, grade_bonus
+from subnet_questions import bonus_question_bank, build_question_bank
+
+PARTS = ("bits", "netmask", "hosts", "bonus")
+
+PROMPTS = {
+    "bits": "How many bits will you borrow from the host portion?",
+    "netmask": "What is the new subnet mask?",
+    "hosts": "How many usable hosts per subnet are available?",
+}
+
+# Sessions idle for longer than this are dropped
+SESSION_TTL = 3600
+
+MAX_QUESTIONS = 100
+
+class Session:
+    """One quiz in progress: the drawn questions, the current part and the score."""
+
+    def __init__(self, difficulty, total_questions, questions, bonus_questions):
+        self.difficulty = difficulty
+        self.total_questions = total_questions
+        self.questions = questions
+        self.bonus_questions = bonus_questions
+        self.number = 0
+        self.part = 0
+        self.score = 0
+        self.last_seen = time.monotonic()
+        self._next_question()
+
+    @property
+    def done(self):
+        return self.number > self.total_questions
+
+    @property
+    def max_score(self):
+        return self.total_questions * len(PARTS)
+
+    def _next_question(self):
+        self.number += 1
+        self.part = 0
+        if not self.done:
+            self.question_id, self.question = self.questions.draw()
+            self.key = AnswerKey(self.question)
+            self.bonus_id, self.bonus = self.bonus_questions.draw()
+
+    def current(self):
+        """Describe the part waiting for an answer."""
+        if self.done:
+            return {"done": True, "score": self.score, "max_score": self.max_score}
+        question = self.question
+        payload = {
+            "done": False,
+            "number": self.number,
+            "part": PARTS[self.part],
+            "network": question.network.with_prefixlen,
+            "required_subnets": question.required_subnets,
+        }
+        if PARTS[self.part] == "bonus":
+            payload.update(
+                prompt=self.bonus["question"],
+                context=self.bonus["pre_explanation"],
+                options=[option["text"] for option in self.bonus["options"]],
+            )
+        else:
+            payload["prompt"] = PROMPTS[PARTS[self.part]]
+        return payload
+
+    def answer(self, value):
+        """Grade an answer to the current part and move on; returns the result payload."""
+        if self.done:
+            raise ValueError("the quiz is already complete")
+        part = PARTS[self.part]
+        result = (grade_bonus(self.bonus, value) if part == "bonus" else self.key.grade(part, value))._asdict()
+        if result["correct"]:
+            self.score += 1
+        elif part == "bonus":
+            self.bonus_questions.record_miss(self.bonus_id)
+        else:
+            self.questions.record_miss(self.question_id)
+        if part == "bonus":
+            result["explanation"] = self.bonus["post_explanation"]
+        self.part += 1
+        if self.part == len(PARTS):
+            self._next_question()
+        result.update(score=self.score, max_score=self.max_score, done=self.done)
+        return result
+
+class QuizServer:
+    """Session registry and request router.
+
+    Question pools are built once and shared, but every session draws from
+    its own fork of them, so one student's misses only bring questions back
+    for that student.
+    """
+
+    def __init__(self, pool_size=None):
+        self.sessions = {}
+        self._pool_size = pool_size
+        self._banks = {}
+        self._bonus = None
+
+    def _bank(self, difficulty):
+        bank = self._banks.get(difficulty)
+        if bank is None:
+            kwargs = {} if self._pool_size is None else {"size": self._pool_size}
+            bank = self._banks[difficulty] = build_question_bank(difficulty, **kwargs)
+        return bank
+
+    def create_session(self, difficulty="beginner", questions=3):
+        if difficulty not in ("beginner", "advanced"):
+            raise ValueError("difficulty must be 'beginner' or 'advanced'")
+        questions = int(questions)
+        if not 1 <= questions <= MAX_QUESTIONS:
+            raise ValueError(f"questions must be between 1 and {MAX_QUESTIONS}")
+        if self._bonus is None:
+            self._bonus = bonus_question_bank(load_data('qanda.json'))
+        session_id = secrets.token_hex(8)
+        self.sessions[session_id] = Session(difficulty, questions, self._bank(difficulty).fork(), self._bonus.fork())
+        return session_id
+
+    def expire(self, ttl=SESSION_TTL):
+        cutoff = time.monotonic() - ttl
+        for session_id in [sid for sid, s in self.sessions.items() if s.last_seen < cutoff]:
+            del self.sessions[session_id]
+
+    def handle(self, method, path, body):
+        """Route one request; returns (status, payload)."""
+        parts = [p for p in path.split('?', 1)[0].split('/') if p]
+        if parts == ["sessions"] and method == "POST":
+            options = _json_object(body)
+            session_id = self.create_session(options.get("difficulty", "beginner"), options.get("questions", 3))
+            session = self.sessions[session_id]
+            return 201, {"session": session_id, "total_questions": session.total_questions, "max_score": session.max_score}
+        if not parts or parts[0] != "sessions" or len(parts) not in (2, 3):
+            return 404, {"error": "not found"}
+        session = self.sessions.get(parts[1])
+        if session is None:
+            return 404, {"error": "unknown session"}
+        session.last_seen = time.monotonic()
+        action = parts[2] if len(parts) == 3 else None
+        if action is None and method == "GET":
+            return 200, {"score": session.score, "max_score": session.max_score, "done": session.done,
+                         "question": min(session.number, session.total_questions)}
+        if action == "question" and method == "GET":
+            return 200, session.current()
+        if action == "answer" and method == "POST":
+            payload = _json_object(body)
+            if "answer" not in payload:
+                return 400, {"error": "missing 'answer'"}
+            if session.done:
+                return 409, {"error": "the quiz is already complete"}
+            return 200, session.answer(payload["answer"])
+        return 405, {"error": "method not allowed"}
+
+def _json_object(body):
+    value = json.loads(body) if body else {}
+    if not isinstance(value, dict):
+        raise ValueError("expected a JSON object")
+    return value
+
+_REASONS = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    409: "Conflict", 413: "Payload Too Large",
+}
+
+MAX_BODY = 64 * 1024
+
+async def _serve_connection(server, reader, writer):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break  # closed mid-request, or a header block longer than the stream limit
+            lines = head.decode("latin-1").split("\r\n")
+            request = lines[0].split(" ")
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            content_length = headers.get("content-length", "0")
+            # str.isdigit() accepts non-ASCII digits such as '²' that int() rejects
+            if len(request) != 3 or not (content_length.isascii() and content_length.isdigit()):
+                break  # not HTTP we understand; just drop the connection
+            method, path, _ = request
+            length = int(content_length)
+            if length > MAX_BODY:
+                status, payload = 413, {"error": "request body too large"}
+                body = b""
+            else:
+                try:
+                    body = await reader.readexactly(length) if length else b""
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break  # the client closed before sending the whole body
+                try:
+                    status, payload = server.handle(method, path, body)
+                except (ValueError, TypeError) as e:
+                    # Bad JSON (json.JSONDecodeError is a ValueError) or bad option values
+                    status, payload = 400, {"error": str(e)}
+            data = json.dumps(payload).encode()
+            keep_alive = headers.get("connection", "").lower() != "close"
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                + data
+            )
+            await writer.drain()
+            if not keep_alive or length > MAX_BODY:
+                break
+    finally:
+        writer.close()
+
+async def _expire_sessions(server, interval=60):
+    while True:
+        await asyncio.sleep(interval)
+        server.expire()
+
+async def start_server(host="127.0.0.1", port=8080, quiz=None):
+    """Start serving in the running event loop; returns (asyncio server, QuizServer)."""
+    quiz = quiz or QuizServer()
+    listener = await asyncio.start_server(
+        lambda reader, writer: _serve_connection(quiz, reader, writer), host, port, backlog=4096
+    )
+    return listener, quiz
+
+async def serve(host, port):
+    listener, quiz = await start_server(host, port)
+    expiry = asyncio.ensure_future(_expire_sessions(quiz))
+    address = listener.sockets[0].getsockname()
+    print(f"Quiz server listening on http://{address[0]}:{address[1]}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        expiry.cancel()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the subnetting quiz over a local HTTP/JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Vectorized subnet math over whole arrays of addresses.
+
+IPv4 addresses are uint32 values, IPv6 addresses are split into a high and a
+low uint64 half. Every function returns a dict of columns (network,
+broadcast, netmask, wildcard, first, last, hosts), so millions of rows are
+computed in a handful of NumPy operations. Without NumPy the same functions
+fall back to plain Python lists.
+"""
+from importlib.util import find_spec
+
+from subnet_core import load_numpy, subnet_fields
+
+# NumPy itself is only imported once a large enough array is processed
+HAVE_NUMPY = find_spec("numpy") is not None
+
+COLUMNS = ("network", "broadcast", "netmask", "wildcard", "hosts", "first", "last")
+
+# Below this many rows the per-call NumPy overhead outweighs the gain.
+NUMPY_MIN_ROWS = 64
+
+_U64_MAX = (1 << 64) - 1
+
+def _numpy_for(values):
+    """Return NumPy if it should handle `values`, otherwise None."""
+    if not HAVE_NUMPY:
+        return None
+    if len(values) >= NUMPY_MIN_ROWS or type(values).__module__ == "numpy":
+        return load_numpy()
+    return None
+
+def _python_columns(addresses, prefixlens, max_prefixlen):
+    columns = {name: [] for name in COLUMNS}
+    appenders = [columns[name].append for name in COLUMNS]
+    for address, prefix in zip(addresses, prefixlens):
+        for append, value in zip(appenders, subnet_fields(int(address), int(prefix), max_prefixlen)):
+            append(value)
+    return columns
+
+def ipv4_subnets(addresses, prefixlens):
+    """Compute subnet columns for IPv4 addresses (ints or uint32) and prefix lengths.
+
+    `prefixlens` may be a single int applied to every row. Returns uint32
+    arrays (hosts as int64) when NumPy is used, lists of ints otherwise.
+    """
+    np = _numpy_for(addresses)
+    if np is None:
+        if isinstance(prefixlens, int):
+            prefixlens = [prefixlens] * len(addresses)
+        return _python_columns(addresses, prefixlens, 32)
+
+    address = np.asarray(addresses, dtype=np.uint32)
+    prefix = np.broadcast_to(np.asarray(prefixlens, dtype=np.uint64), address.shape)
+    # Shift in 64 bits so that a /0 (shift by 0) and /32 (shift by 32) are both defined
+    wildcard = (np.uint64(0xFFFFFFFF) >> prefix).astype(np.uint32)
+    netmask = ~wildcard
+    network = address & netmask
+    broadcast = network | wildcard
+    point_to_point = prefix >= 31
+    first = np.where(point_to_point, network, network + np.uint32(1))
+    last = np.where(point_to_point, broadcast, broadcast - np.uint32(1))
+    hosts = last.astype(np.int64) - first.astype(np.int64) + 1
+    return {
+        "network": network, "broadcast": broadcast, "netmask": netmask, "wildcard": wildcard,
+        "hosts": hosts, "first": first, "last": last,
+    }
+
+def split_ipv6(values):
+    """Split 128-bit integers into (high, low) uint64 halves."""
+    high = [value >> 64 for value in values]
+    low = [value & _U64_MAX for value in values]
+    np = load_numpy()
+    if np is not None:
+        return np.array(high, dtype=np.uint64), np.array(low, dtype=np.uint64)
+    return high, low
+
+def join_ipv6(high, low):
+    """Combine (high, low) halves back into a list of 128-bit integers."""
+    return [(int(h) << 64) | int(l) for h, l in zip(high, low)]
+
+def ipv6_subnets(high, low, prefixlens):
+    """Compute subnet columns for IPv6 addresses given as high/low uint64 halves.
+
+    Each address column is a (high, low) pair. Host counts can exceed 64
+    bits, so `hosts` holds Python ints (an object array under NumPy).
+    """
+    np = _numpy_for(high)
+    if np is None:
+        if isinstance(prefixlens, int):
+            prefixlens = [prefixlens] * len(high)
+        columns = _python_columns(join_ipv6(high, low), prefixlens, 128)
+        for name in COLUMNS:
+            if name != "hosts":
+                values = columns[name]
+                columns[name] = ([v >> 64 for v in values], [v & _U64_MAX for v in values])
+        return columns
+
+    high = np.asarray(high, dtype=np.uint64)
+    low = np.asarray(low, dtype=np.uint64)
+    prefix = np.broadcast_to(np.asarray(prefixlens, dtype=np.int64), high.shape)
+    ones = np.uint64(_U64_MAX)
+    zero = np.uint64(0)
+    # Shifting a uint64 by 64 is undefined, so clamp the shift and mask the result instead
+    high_shift = np.minimum(prefix, 63).astype(np.uint64)
+    low_shift = np.clip(prefix - 64, 0, 63).astype(np.uint64)
+    wildcard_high = np.where(prefix >= 64, zero, ones >> high_shift)
+    wildcard_low = np.where(prefix <= 64, ones, np.where(prefix >= 128, zero, ones >> low_shift))
+    netmask_high, netmask_low = ~wildcard_high, ~wildcard_low
+    network_high, network_low = high & netmask_high, low & netmask_low
+    broadcast_high, broadcast_low = network_high | wildcard_high, network_low | wildcard_low
+
+    # IPv6 skips only the Subnet-Router anycast (network) address; /127 and /128 use everything
+    step = (prefix < 127).astype(np.uint64)
+    first_low = network_low + step
+    first_high = network_high + ((first_low < network_low) & (step == 1)).astype(np.uint64)
+
+    host_bits = (128 - prefix).astype(object)
+    hosts = np.where(prefix >= 127, 2 ** host_bits, 2 ** host_bits - 1)
+    return {
+        "network": (network_high, network_low), "broadcast": (broadcast_high, broadcast_low),
+        "netmask": (netmask_high, netmask_low), "wildcard": (wildcard_high, wildcard_low),
+        "hosts": hosts, "first": (first_high, first_low), "last": (broadcast_high, broadcast_low),
+    }
+
+def subnet_row(address, prefixlen, version=4):
+    """Run the kernel for a single address and return a dict of plain ints."""
+    if version == 4:
+        columns = ipv4_subnets([address], [prefixlen])
+        return {name: int(columns[name][0]) for name in COLUMNS}
+    high, low = [address >> 64], [address & _U64_MAX]
+    columns = ipv6_subnets(high, low, [prefixlen])
+    row = {}
+    for name in COLUMNS:
+        value = columns[name]
+        row[name] = int(value[0]) if name == "hosts" else (int(value[0][0]) << 64) | int(value[1][0])
+    return row
@@ -0,0 +1,100 @@
+"""Variable Length Subnet Masking (VLSM) planner.
+
+Packs many (name, host count) demands into one parent block. Demands are
+sorted largest-first, so every block handed out is a power of two no larger
+than the one before it; allocating them back to back from the start of the
+parent keeps each block aligned on its own size, which is exactly what a
+buddy allocator would produce, in O(n log n) for the sort and O(n) after.
+Whatever is left at the end is reported as the fewest covering CIDR blocks.
+"""
+import ipaddress
+import re
+from collections import namedtuple
+
+from subnet_core import prefix_for_hosts, range_to_prefixes
+
+Allocation = namedtuple("Allocation", "name hosts start prefixlen")
+
+class VlsmPlan:
+    """Result of plan_vlsm(): allocations, demands that did not fit and the remaining free space."""
+
+    def __init__(self, parent, allocations, unallocated, free):
+        self.parent = parent
+        self.allocations = allocations
+        self.unallocated = unallocated
+        self.free = free
+
+    def network(self, allocation):
+        """Return the ipaddress network object for an allocation."""
+        network_class = ipaddress.IPv4Network if self.parent.version == 4 else ipaddress.IPv6Network
+        return network_class((allocation.start, allocation.prefixlen))
+
+    def free_networks(self):
+        network_class = ipaddress.IPv4Network if self.parent.version == 4 else ipaddress.IPv6Network
+        return [network_class(block) for block in self.free]
+
+    @property
+    def allocated_addresses(self):
+        max_prefixlen = self.parent.max_prefixlen
+        return sum(1 << (max_prefixlen - a.prefixlen) for a in self.allocations)
+
+    @property
+    def requested_hosts(self):
+        return sum(a.hosts for a in self.allocations)
+
+    @property
+    def utilization(self):
+        """Share of the parent block handed out to allocations (0.0 - 1.0)."""
+        return self.allocated_addresses / self.parent.num_addresses
+
+    @property
+    def efficiency(self):
+        """Share of the allocated addresses actually requested as hosts (0.0 - 1.0)."""
+        allocated = self.allocated_addresses
+        return self.requested_hosts / allocated if allocated else 0.0
+
+def plan_vlsm(parent, demands):
+    """Allocate aligned subnets inside `parent` for each (name, hosts) demand, largest first."""
+    version = parent.version
+    max_prefixlen = parent.max_prefixlen
+    start = int(parent.network_address)
+    end = int(parent.broadcast_address)
+
+    sized = []
+    for order, (name, hosts) in enumerate(demands):
+        hosts = int(hosts)
+        if hosts < 0:
+            raise ValueError(f"{name}: host count must not be negative")
+        sized.append((prefix_for_hosts(hosts, version), order, name, hosts))
+    # Shortest prefix (largest block) first; ties keep input order
+    sized.sort()
+
+    allocations = []
+    unallocated = []
+    cursor = start
+    for prefix, _, name, hosts in sized:
+        size = 1 << (max_prefixlen - prefix)
+        if prefix < parent.prefixlen or cursor + size - 1 > end:
+            unallocated.append((name, hosts))
+            continue
+        allocations.append(Allocation(name, hosts, cursor, prefix))
+        cursor += size
+
+    free = list(range_to_prefixes(cursor, end, max_prefixlen)) if cursor <= end else []
+    return VlsmPlan(parent, allocations, unallocated, free)
+
+_DEMAND = re.compile(r'^(?:(.*?)[\s,:]+)?(\d+)$')
+
+def parse_demands(lines):
+    """Read 'name,hosts', 'name:hosts' or 'name hosts' lines into a list of (name, hosts) tuples."""
+    demands = []
+    for line_no, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text or text.startswith('#'):
+            continue
+        match = _DEMAND.match(text)
+        if match is None:
+            raise ValueError(f"line {line_no}: expected 'name,hosts', got {text!r}")
+        name, hosts = match.groups()
+        demands.append((name or f"Subnet {len(demands) + 1}", int(hosts)))
+    return demands
@@ -1,19 +1,25 @@
 import ipaddress
-import random
-import json
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Prompt
-from rich.syntax import Syntax
-
-console = Console()
-
-# Load the help content
-with open('help.json', 'r') as f:
-    help_content = json.load(f)
+from itertools import islice
+from subnet_console import console, load_data, print_cached, print_table_pages, render_cache
+from subnet_core import (
+    SubnetView, binary_representation, compact_binary, host_count, host_range, mask_to_prefix, prefix_for_hosts,
+    prefix_info, sample_hosts
+)
+from subnet_pager import SubnetPager
+from subnet_profile import setup as setup_profiling
+from subnet_ranges import CONTAINS, DUPLICATE, iter_conflicts, iter_free_prefixes, read_inventory, summarize
+from subnet_vlsm import parse_demands, plan_vlsm
+from subnet_vector import subnet_row
+
+# Prefix table loaded from the Identify Subnet menu, if any
+prefix_table = None
 
 def display_help(operation):
+    print_cached(("help", operation), lambda: _render_help(operation), static=True)
+
+def _render_help(operation):
+    from rich.panel import Panel
+    help_content = load_data('help.json')
     if operation in help_content:
         help_info = help_content[operation]
         console.print(Panel(
@@ -30,38 +36,30 @@ def display_help(operation):
     else:
         console.print("[bold red]Help information not available for this operation.[/bold red]")
 
-def get_binary_representation(ip_address):
-    if isinstance(ip_address, str):
-        return '.'.join([bin(int(octet))[2:].zfill(8) for octet in ip_address.split('.')])
-    elif isinstance(ip_address, int):
-        return format(ip_address, '032b')
-    else:
-        return '.'.join([bin(int(octet))[2:].zfill(8) for octet in ip_address.packed])
-
 def display_binary_and_calculation(ip, mask, operation="AND"):
+    from rich.table import Table
     ip_obj = ipaddress.ip_address(ip)
     mask_obj = ipaddress.ip_address(mask)
-    result = ipaddress.ip_address(int(ip_obj) & int(mask_obj) if operation == "AND" else int(ip_obj) | int(mask_obj))
+    result = type(ip_obj)(int(ip_obj) & int(mask_obj) if operation == "AND" else int(ip_obj) | int(mask_obj))
 
     table = Table(title=f"Binary Representation and {operation} Operation")
     table.add_column("", style="cyan")
-    table.add_column("Dotted Decimal", style="green")
-    table.add_column("Binary", style="yellow")
+    table.add_column("Dotted Decimal" if ip_obj.version == 4 else "Address", style="green")
+    table.add_column("Binary", style="yellow", overflow="fold")
 
-    table.add_row("IP Address", str(ip_obj), get_binary_representation(ip_obj))
-    table.add_row("Subnet Mask", str(mask_obj), get_binary_representation(mask_obj))
-    table.add_row(f"{operation} Result", str(result), get_binary_representation(result))
+    table.add_row("IP Address", str(ip_obj), compact_binary(ip_obj))
+    table.add_row("Subnet Mask", str(mask_obj), compact_binary(mask_obj))
+    table.add_row(f"{operation} Result", str(result), compact_binary(result))
 
     console.print(table)
 
     console.print(f"\n[bold]Explanation:[/bold]")
     console.print(f"The {operation} operation is performed bit by bit:")
-    ip_bits = get_binary_representation(ip_obj).replace('.', '')
-    mask_bits = get_binary_representation(mask_obj).replace('.', '')
-    result_bits = get_binary_representation(result).replace('.', '')
-
-    for i in range(0, 32, 8):
-        console.print(f"{ip_bits[i:i+8]} {operation.lower()} {mask_bits[i:i+8]} = {result_bits[i:i+8]}")
+    # One line per octet (IPv4) or 16-bit group (IPv6)
+    separator = '.' if ip_obj.version == 4 else ':'
+    groups = zip(*(binary_representation(value).split(separator) for value in (ip_obj, mask_obj, result)))
+    for ip_bits, mask_bits, result_bits in groups:
+        console.print(f"{ip_bits} {operation.lower()} {mask_bits} = {result_bits}")
 
 def parse_input(ip_input):
     try:
@@ -71,24 +69,30 @@ def parse_input(ip_input):
         return None
 
 def display_subnet_info(network):
+    print_cached(("info", network), lambda: _render_subnet_info(network))
+
+def _render_subnet_info(network):
+    from rich.table import Table
+    info = prefix_info(network.prefixlen, network.version)
     table = Table(title=f"Subnet Information for {network}")
     table.add_column("Property", style="cyan", no_wrap=True)
     table.add_column("Value", style="green")
-    table.add_column("Binary", style="yellow")
-
-    table.add_row("Network Address", str(network.network_address), get_binary_representation(network.network_address))
-    table.add_row("Broadcast Address", str(network.broadcast_address), get_binary_representation(network.broadcast_address))
-    table.add_row("Subnet Mask", str(network.netmask), get_binary_representation(network.netmask))
-    table.add_row("Wildcard Mask", str(network.hostmask), get_binary_representation(network.hostmask))
-    table.add_row("Number of Hosts", str(network.num_addresses - 2), "")
-    table.add_row("First Usable Host", str(network.network_address + 1), get_binary_representation(network.network_address + 1))
-    table.add_row("Last Usable Host", str(network.broadcast_address - 1), get_binary_representation(network.broadcast_address - 1))
-    table.add_row("IP Range", f"{network.network_address + 1} - {network.broadcast_address - 1}", "")
+    table.add_column("Binary", style="yellow", overflow="fold")
+
+    # IPv6 has no broadcast address; the last address of the subnet is a usable host
+    first, last = (type(network.network_address)(value) for value in host_range(network))
+    last_label = "Broadcast Address" if network.version == 4 else "Last Address"
+    table.add_row("Network Address", str(network.network_address), compact_binary(network.network_address))
+    table.add_row(last_label, str(network.broadcast_address), compact_binary(network.broadcast_address))
+    table.add_row("Subnet Mask", info.netmask_str, compact_binary(info.netmask, network.version))
+    table.add_row("Wildcard Mask", info.wildcard_str, compact_binary(info.wildcard, network.version))
+    table.add_row("Number of Hosts", str(info.usable_hosts), "")
+    table.add_row("First Usable Host", str(first), compact_binary(first))
+    table.add_row("Last Usable Host", str(last), compact_binary(last))
+    table.add_row("IP Range", f"{first} - {last}", "")
     table.add_row("CIDR Notation", f"/{network.prefixlen}", "")
     
-    # Calculate and add max possible subnets
-    max_subnets = 2 ** (32 - network.prefixlen)
-    table.add_row("Max Possible Subnets", str(max_subnets), "")
+    table.add_row("Max Possible Subnets", str(info.total_addresses), "")
 
     console.print(table)
     
@@ -96,87 +100,113 @@ def display_subnet_info(network):
 
 def subnet_division(network, num_subnets):
     try:
-        new_prefix = network.prefixlen + (32 - network.prefixlen).bit_length() - (num_subnets - 1).bit_length()
-        subnets = list(network.subnets(new_prefix=new_prefix))
+        if num_subnets < 1:
+            raise ValueError("the number of subnets must be at least 1")
+        # Borrow just enough bits to number num_subnets subnets
+        new_prefix = network.prefixlen + (num_subnets - 1).bit_length()
+        subnets = SubnetView(network, new_prefix)
         
-        table = Table(title=f"Subnet Division for {network}")
-        table.add_column("Subnet", style="cyan")
-        table.add_column("Network Address", style="green")
-        table.add_column("Binary", style="yellow")
-
-        for i, subnet in enumerate(subnets[:num_subnets], 1):
-            table.add_row(
-                f"Subnet {i}",
-                str(subnet.network_address),
-                get_binary_representation(subnet.network_address)
-            )
+        pager = SubnetPager(network, new_prefix, num_subnets)
+        title = f"Subnet Division for {network}"
+        if console.is_terminal and pager.pages > 1:
+            # Only the page on screen is computed, however many subnets there are
+            pager.browse(title, binary=True)
+        elif console.is_terminal:
+            pager.show(title=title, binary=True)
+        else:
+            def make_table(first):
+                table = pager.make_table(title if first else None, header=first, binary=True)
+                table.show_edge = False
+                return table
 
-        console.print(table)
+            rows = (pager.cells(row, binary=True) for row in pager.rows(0, pager.total))
+            print_table_pages(make_table, rows)
         console.print(f"\n[bold green]Total subnets created:[/bold green] {num_subnets}")
-        console.print(f"[bold green]New subnet mask:[/bold green] {subnets[0].netmask} (/{new_prefix})")
+        console.print(f"[bold green]New subnet mask:[/bold green] {prefix_info(new_prefix, network.version).netmask_str} (/{new_prefix})")
         
-        if len(subnets) > 1:
-            subnet_increment = int(subnets[1].network_address) - int(subnets[0].network_address)
+        if subnets.size > 1:
+            subnet_increment = subnets.increment
             console.print(f"[bold green]Subnet increment:[/bold green] {subnet_increment}")
-            console.print(f"[bold green]Subnet increment (binary):[/bold green] {get_binary_representation(subnet_increment)}")
+            console.print(f"[bold green]Subnet increment (binary):[/bold green] {compact_binary(subnet_increment, network.version)}")
         
         display_binary_and_calculation(subnets[0].network_address, subnets[0].netmask)
     except ValueError as e:
         console.print(f"[bold red]Error:[/bold red] {str(e)}")
 
 def reverse_subnet_calculation(num_hosts, ip_address):
-    prefix = 32 - (num_hosts + 2).bit_length()
-    network = ipaddress.ip_network(f"{ip_address}/{prefix}", strict=False)
+    try:
+        ip_obj = ipaddress.ip_address(ip_address)
+        prefix = prefix_for_hosts(num_hosts, ip_obj.version)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {str(e)}")
+        return
+    print_cached(("reverse", num_hosts, ip_obj), lambda: _render_reverse_calculation(num_hosts, ip_obj, prefix))
+
+def _render_reverse_calculation(num_hosts, ip_obj, prefix):
+    from rich.table import Table
+    info = prefix_info(prefix, ip_obj.version)
+    max_prefixlen = ip_obj.max_prefixlen
+    host_bits = max_prefixlen - prefix
+    network = ipaddress.ip_network((ip_obj, prefix), strict=False)
     
     table = Table(title=f"Reverse Subnet Calculation for {num_hosts} hosts")
     table.add_column("Property", style="cyan")
     table.add_column("Value", style="green")
-    table.add_column("Binary", style="yellow")
+    table.add_column("Binary", style="yellow", overflow="fold")
 
-    table.add_row("IP Address", str(ip_address), get_binary_representation(ip_address))
-    table.add_row("Network Address", str(network.network_address), get_binary_representation(network.network_address))
-    table.add_row("Broadcast Address", str(network.broadcast_address), get_binary_representation(network.broadcast_address))
-    table.add_row("Subnet mask", str(network.netmask), get_binary_representation(network.netmask))
+    table.add_row("IP Address", str(ip_obj), compact_binary(ip_obj))
+    table.add_row("Network Address", str(network.network_address), compact_binary(network.network_address))
+    table.add_row("Broadcast Address" if ip_obj.version == 4 else "Last Address", str(network.broadcast_address), compact_binary(network.broadcast_address))
+    table.add_row("Subnet mask", info.netmask_str, compact_binary(info.netmask, ip_obj.version))
     table.add_row("CIDR notation", f"/{prefix}", "")
-    table.add_row("Wildcard mask", str(network.hostmask), get_binary_representation(network.hostmask))
-    table.add_row("Actual max hosts", str(network.num_addresses - 2), "")
+    table.add_row("Wildcard mask", info.wildcard_str, compact_binary(info.wildcard, ip_obj.version))
+    table.add_row("Actual max hosts", str(info.usable_hosts), "")
 
     console.print(table)
     
-    display_binary_and_calculation(ip_address, network.netmask)
+    display_binary_and_calculation(ip_obj, info.netmask_str)
     
+    reserved = info.total_addresses - info.usable_hosts
     console.print("\n[bold]Calculation Explanation:[/bold]")
-    console.print(f"1. Number of required bits for hosts: {(num_hosts + 2).bit_length()}")
-    console.print(f"2. Subtract from 32 to get prefix: 32 - {(num_hosts + 2).bit_length()} = {prefix}")
-    console.print(f"3. This gives us the subnet mask: {network.netmask}")
+    console.print(f"1. Number of required bits for hosts: {host_bits} (2^{host_bits} - {reserved} = {info.usable_hosts} usable hosts)")
+    console.print(f"2. Subtract from {max_prefixlen} to get prefix: {max_prefixlen} - {host_bits} = {prefix}")
+    console.print(f"3. This gives us the subnet mask: {info.netmask_str}")
     console.print(f"4. The network address is calculated by ANDing the IP address with the subnet mask")
-    console.print(f"5. The broadcast address is the last address in the network range")
+    console.print(f"5. The {'broadcast' if ip_obj.version == 4 else 'last'} address is the last address in the network range")
 
 def generate_random_ips(network, count):
-    random_ips = random.sample(list(network.hosts()), min(count, network.num_addresses - 2))
+    from rich.table import Table
+    random_ips = sample_hosts(network, count)
     table = Table(title=f"Random IP Addresses from {network}")
     table.add_column("IP Address", style="cyan")
-    table.add_column("Binary Representation", style="yellow")
+    table.add_column("Binary Representation", style="yellow", overflow="fold")
     
     for ip in random_ips:
-        table.add_row(str(ip), get_binary_representation(ip))
+        table.add_row(str(ip), compact_binary(ip))
     
     console.print(table)
 
 def subnet_comparison(ip1, ip2, mask):
+    from rich.table import Table
     try:
-        network1 = ipaddress.ip_network(f"{ip1}/{mask}", strict=False)
-        network2 = ipaddress.ip_network(f"{ip2}/{mask}", strict=False)
+        ip1_obj = ipaddress.ip_address(ip1)
+        ip2_obj = ipaddress.ip_address(ip2)
+        if ip1_obj.version != ip2_obj.version:
+            raise ValueError("Both IP addresses must be the same IP version")
+        prefix = mask_to_prefix(mask, ip1_obj.version)
+        network_class = ipaddress.IPv4Network if ip1_obj.version == 4 else ipaddress.IPv6Network
+        network1 = network_class((subnet_row(int(ip1_obj), prefix, ip1_obj.version)["network"], prefix))
+        network2 = network_class((subnet_row(int(ip2_obj), prefix, ip2_obj.version)["network"], prefix))
         
         table = Table(title="Subnet Comparison")
         table.add_column("Property", style="cyan")
-        table.add_column("IP 1", style="green")
-        table.add_column("IP 2", style="yellow")
+        table.add_column("IP 1", style="green", overflow="fold")
+        table.add_column("IP 2", style="yellow", overflow="fold")
         
-        table.add_row("IP Address", f"{ip1}\n{get_binary_representation(ip1)}", f"{ip2}\n{get_binary_representation(ip2)}")
-        table.add_row("Subnet", f"{network1.network_address}\n{get_binary_representation(network1.network_address)}", f"{network2.network_address}\n{get_binary_representation(network2.network_address)}")
-        table.add_row("Broadcast", f"{network1.broadcast_address}\n{get_binary_representation(network1.broadcast_address)}", f"{network2.broadcast_address}\n{get_binary_representation(network2.broadcast_address)}")
-        table.add_row("Subnet Mask", f"{network1.netmask}\n{get_binary_representation(network1.netmask)}", f"{network2.netmask}\n{get_binary_representation(network2.netmask)}")
+        table.add_row("IP Address", f"{ip1_obj}\n{compact_binary(ip1_obj)}", f"{ip2_obj}\n{compact_binary(ip2_obj)}")
+        table.add_row("Subnet", f"{network1.network_address}\n{compact_binary(network1.network_address)}", f"{network2.network_address}\n{compact_binary(network2.network_address)}")
+        table.add_row("Broadcast" if ip1_obj.version == 4 else "Last Address", f"{network1.broadcast_address}\n{compact_binary(network1.broadcast_address)}", f"{network2.broadcast_address}\n{compact_binary(network2.broadcast_address)}")
+        table.add_row("Subnet Mask", f"{network1.netmask}\n{compact_binary(network1.netmask)}", f"{network2.netmask}\n{compact_binary(network2.netmask)}")
         
         console.print(table)
         
@@ -185,31 +215,52 @@ def subnet_comparison(ip1, ip2, mask):
         else:
             console.print("[bold red]The IP addresses are in different subnets.[/bold red]")
 
-        display_binary_and_calculation(ip1, mask)
+        display_binary_and_calculation(ip1_obj, network1.netmask)
     except ValueError as e:
         console.print(f"[bold red]Error:[/bold red] {str(e)}")
 
 def generate_python_code(network):
+    print_cached(("code", network), lambda: _render_python_code(network))
+
+def _render_python_code(network):
+    from rich.panel import Panel
+    from rich.syntax import Syntax
+    new_prefix = min(network.prefixlen + 2, network.max_prefixlen)
+    first = type(network.network_address)(host_range(network)[0])
+    if network.num_addresses <= 2:
+        first_code, last_code, reserved = "network.network_address", "network.broadcast_address", 0
+    elif network.version == 4:
+        first_code, last_code, reserved = "network.network_address + 1", "network.broadcast_address - 1", 2
+    else:
+        # IPv6 has no broadcast; only the Subnet-Router anycast (network) address is reserved
+        first_code, last_code, reserved = "network.network_address + 1", "network.broadcast_address", 1
+    last_name = "Broadcast Address" if network.version == 4 else "Last Address"
     code = f"""
 import ipaddress
 
 network = ipaddress.ip_network('{network}', strict=False)
 
 print(f"Network Address: {{network.network_address}}")
-print(f"Broadcast Address: {{network.broadcast_address}}")
+print(f"{last_name}: {{network.broadcast_address}}")
 print(f"Subnet Mask: {{network.netmask}}")
 print(f"CIDR Notation: /{{network.prefixlen}}")
-print(f"Number of Hosts: {{network.num_addresses - 2}}")
-print(f"IP Range: {{network.network_address + 1}} - {{network.broadcast_address - 1}}")
+print(f"Number of Hosts: {{network.num_addresses - {reserved}}}")
+print(f"IP Range: {{{first_code}}} - {{{last_code}}}")
 print(f"Wildcard Mask: {{network.hostmask}}")
 
-# Generate list of all usable IP addresses
-usable_ips = list(network.hosts())
-print(f"First usable IP: {{usable_ips[0]}}")
-print(f"Last usable IP: {{usable_ips[-1]}}")
+# First and last usable IPs, without listing every host
+print(f"First usable IP: {{{first_code}}}")
+print(f"Last usable IP: {{{last_code}}}")
+
+# Compute the Nth /{new_prefix} subnet arithmetically (base + N * increment)
+increment = 1 << (network.max_prefixlen - {new_prefix})
+def nth_subnet(n):
+    return type(network)((int(network.network_address) + n * increment, {new_prefix}))
+print(f"Number of /{new_prefix} subnets: {{2 ** ({new_prefix} - network.prefixlen)}}")
+print(f"Last /{new_prefix} subnet: {{nth_subnet(2 ** ({new_prefix} - network.prefixlen) - 1)}}")
 
 # Check if an IP is in this network
-test_ip = '{network.network_address + 1}'
+test_ip = '{first}'
 print(f"Is {{test_ip}} in the network? {{ipaddress.ip_address(test_ip) in network}}")
     """
     syntax = Syntax(code, "python", theme="monokai", line_numbers=True)
@@ -217,34 +268,190 @@ print(f"Is {{test_ip}} in the network? {{ipaddress.ip_address(test_ip) in networ
 
 def identify_subnet(ip_address, subnet_mask):
     try:
-        interface = ipaddress.ip_interface(f"{ip_address}/{subnet_mask}")
-        network = interface.network
-        
-        table = Table(title="Subnet Identification")
-        table.add_column("Property", style="cyan")
-        table.add_column("Value", style="green")
-        table.add_column("Binary", style="yellow")
+        ip_obj = ipaddress.ip_address(ip_address)
+        prefix = mask_to_prefix(subnet_mask, ip_obj.version)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {str(e)}")
+        return
+    print_cached(("identify", ip_obj, prefix), lambda: _render_identify_subnet(ip_obj, prefix))
+
+def _render_identify_subnet(ip_obj, prefix):
+    from rich.table import Table
+    fields = subnet_row(int(ip_obj), prefix, ip_obj.version)
+    address_class = type(ip_obj)
+    network_class = ipaddress.IPv4Network if ip_obj.version == 4 else ipaddress.IPv6Network
+    network = network_class((fields["network"], prefix))
+    netmask = address_class(fields["netmask"])
+    broadcast = address_class(fields["broadcast"])
+
+    table = Table(title="Subnet Identification")
+    table.add_column("Property", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_column("Binary", style="yellow", overflow="fold")
 
-        table.add_row("IP Address", str(ip_address), get_binary_representation(ip_address))
-        table.add_row("Subnet Mask", str(subnet_mask), get_binary_representation(subnet_mask))
-        table.add_row("Network Address", str(network.network_address), get_binary_representation(network.network_address))
-        table.add_row("Broadcast Address", str(network.broadcast_address), get_binary_representation(network.broadcast_address))
-        table.add_row("Subnet", str(network), "")
-        table.add_row("Total Hosts", str(network.num_addresses - 2), "")
+    table.add_row("IP Address", str(ip_obj), compact_binary(ip_obj))
+    table.add_row("Subnet Mask", str(netmask), compact_binary(netmask))
+    table.add_row("Network Address", str(network.network_address), compact_binary(network.network_address))
+    table.add_row("Broadcast Address" if ip_obj.version == 4 else "Last Address", str(broadcast), compact_binary(broadcast))
+    table.add_row("Subnet", str(network), "")
+    table.add_row("Total Hosts", str(fields["hosts"]), "")
 
-        console.print(table)
-        
-        display_binary_and_calculation(ip_address, subnet_mask)
-        
-        console.print("\n[bold]Calculation Explanation:[/bold]")
-        console.print("1. The network address is calculated by ANDing the IP address with the subnet mask.")
-        console.print("2. The broadcast address is calculated by ORing the network address with the wildcard mask.")
-        console.print(f"3. Wildcard mask: {network.hostmask} ({get_binary_representation(network.hostmask)})")
-        
+    console.print(table)
+
+    display_binary_and_calculation(ip_obj, netmask)
+
+    console.print("\n[bold]Calculation Explanation:[/bold]")
+    console.print("1. The network address is calculated by ANDing the IP address with the subnet mask.")
+    last_name = "broadcast" if ip_obj.version == 4 else "last"
+    console.print(f"2. The {last_name} address is calculated by ORing the network address with the wildcard mask.")
+    wildcard = address_class(fields["wildcard"])
+    console.print(f"3. Wildcard mask: {wildcard} ({compact_binary(wildcard)})")
+
+def load_prefix_table(path):
+    # Imported on first use: the table and database readers are not needed until a table is loaded
+    from subnet_prefixdb import open_prefix_table
+    try:
+        table = open_prefix_table(path)
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error:[/bold red] {str(e)}")
+        return None
+    console.print(f"[bold green]Loaded {len(table)} prefixes from {path}[/bold green]")
+    return table
+
+def identify_subnet_in_table(ip_address, table):
+    try:
+        match = table.lookup(ip_address)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {str(e)}")
+        return
+    if match is None:
+        console.print(f"[bold red]{ip_address} is not inside any prefix in the loaded table.[/bold red]")
+        return
+    network, tag = match
+    console.print(f"[bold green]Longest prefix match:[/bold green] {network}" + (f" ({tag})" if tag else ""))
+    identify_subnet(ip_address, network.prefixlen)
+
+# Rows shown in the VLSM table; the batch mode prints complete plans
+VLSM_DISPLAY_ROWS = 50
+
+def vlsm_planner(network, demands):
+    from rich.table import Table
+    try:
+        plan = plan_vlsm(network, demands)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {str(e)}")
+        return
+
+    table = Table(title=f"VLSM Plan for {network}")
+    table.add_column("Name", style="cyan")
+    table.add_column("Hosts Needed", style="magenta")
+    table.add_column("Subnet", style="green")
+    table.add_column("Usable Hosts", style="yellow")
+    table.add_column("Subnet Mask", style="green")
+
+    for allocation in plan.allocations[:VLSM_DISPLAY_ROWS]:
+        subnet = plan.network(allocation)
+        table.add_row(allocation.name, str(allocation.hosts), str(subnet), str(host_count(subnet)), str(subnet.netmask))
+
+    console.print(table)
+    if len(plan.allocations) > VLSM_DISPLAY_ROWS:
+        console.print(f"... {len(plan.allocations) - VLSM_DISPLAY_ROWS} more allocations (use subnet_batch.py vlsm for the full plan)")
+
+    console.print(f"\n[bold green]Utilization of {network}:[/bold green] {plan.utilization:.1%}")
+    console.print(f"[bold green]Requested hosts / allocated addresses:[/bold green] {plan.efficiency:.1%}")
+    if plan.unallocated:
+        names = ", ".join(f"{name} ({hosts})" for name, hosts in plan.unallocated[:10])
+        more = f" and {len(plan.unallocated) - 10} more" if len(plan.unallocated) > 10 else ""
+        console.print(f"[bold red]Did not fit:[/bold red] {names}{more}")
+    free = plan.free_networks()
+    if free:
+        console.print(f"[bold green]Free space:[/bold green] {', '.join(str(block) for block in free)}")
+    else:
+        console.print("[bold green]Free space:[/bold green] none")
+
+def read_demands(text):
+    # '@file' reads one demand per line, otherwise comma separated name:hosts pairs
+    if text.startswith('@'):
+        with open(text[1:], 'r', encoding='utf-8') as f:
+            return parse_demands(f)
+    return parse_demands(text.split(','))
+
+# Rows shown in the summarization table; the batch mode prints everything
+SUMMARY_DISPLAY_ROWS = 50
+
+def cidr_summarization(networks):
+    from rich.table import Table
+    try:
+        collapsed, supernets = summarize(networks)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {str(e)}")
+        return
+
+    table = Table(title=f"Summarized {len(networks)} networks into {len(collapsed)}")
+    table.add_column("Network", style="cyan")
+    table.add_column("Subnet Mask", style="green")
+    table.add_column("Addresses", style="yellow")
+
+    for network in collapsed[:SUMMARY_DISPLAY_ROWS]:
+        table.add_row(str(network), str(network.netmask), str(network.num_addresses))
+
+    console.print(table)
+    if len(collapsed) > SUMMARY_DISPLAY_ROWS:
+        console.print(f"... {len(collapsed) - SUMMARY_DISPLAY_ROWS} more (use subnet_batch.py summarize for the full list)")
+    for version, supernet in supernets.items():
+        console.print(f"[bold green]Smallest IPv{version} supernet covering everything:[/bold green] {supernet}")
+
+# Conflicts and free blocks shown by the overlap report; the batch mode prints everything
+OVERLAP_DISPLAY_ROWS = 50
+
+def overlap_report(networks, parent=None):
+    from rich.table import Table
+    try:
+        entries = read_inventory(networks)
     except ValueError as e:
         console.print(f"[bold red]Error:[/bold red] {str(e)}")
+        return
+
+    table = Table(title=f"Conflicts among {len(entries[4]) + len(entries[6])} networks")
+    table.add_column("Conflict", style="red")
+    table.add_column("Network", style="cyan")
+    table.add_column("Other", style="yellow")
+
+    counts = {DUPLICATE: 0, CONTAINS: 0}
+    for version in (4, 6):
+        for kind, outer, inner in iter_conflicts(entries[version]):
+            if counts[DUPLICATE] + counts[CONTAINS] < OVERLAP_DISPLAY_ROWS:
+                table.add_row("listed twice" if kind == DUPLICATE else "contains", outer, inner)
+            counts[kind] += 1
+
+    total = counts[DUPLICATE] + counts[CONTAINS]
+    if total:
+        console.print(table)
+        if total > OVERLAP_DISPLAY_ROWS:
+            console.print(f"... {total - OVERLAP_DISPLAY_ROWS} more (use subnet_batch.py overlaps for the full report)")
+    console.print(f"[bold green]Duplicates:[/bold green] {counts[DUPLICATE]}  [bold green]Nested:[/bold green] {counts[CONTAINS]}")
+
+    if parent is not None:
+        start, end = int(parent.network_address), int(parent.broadcast_address)
+        free = list(islice(iter_free_prefixes(entries[parent.version], start, end, parent.max_prefixlen), OVERLAP_DISPLAY_ROWS + 1))
+        network_class = type(parent)
+        blocks = ", ".join(str(network_class(block)) for block in free[:OVERLAP_DISPLAY_ROWS])
+        more = " ..." if len(free) > OVERLAP_DISPLAY_ROWS else ""
+        console.print(f"[bold green]Free space in {parent}:[/bold green] {blocks or 'none'}{more}")
+
+def read_networks(text):
+    # '@file' reads one CIDR per line, otherwise a comma separated list
+    if text.startswith('@'):
+        with open(text[1:], 'r', encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+    return [part.strip() for part in text.split(',') if part.strip()]
 
 def display_menu():
+    print_cached("menu", _render_menu, static=True)
+
+def _render_menu():
+    from rich.table import Table
+    from rich.panel import Panel
     menu_items = [
         ("1", "Subnet Information", "Detailed subnet breakdown"),
         ("2", "Subnet Division", "Divide network into subnets"),
@@ -253,6 +460,9 @@ def display_menu():
         ("5", "Subnet Comparison", "Compare two IP addresses"),
         ("6", "Generate Python Code", "Network operations code"),
         ("7", "Identify Subnet", "Find subnet for a given IP"),
+        ("8", "VLSM Planner", "Fit host requirements into a network"),
+        ("9", "CIDR Summarization", "Merge networks into fewest CIDRs"),
+        ("10", "Overlap Detection", "Find conflicting networks and free space"),
         ("q", "Quit", "Exit program")
     ]
 
@@ -267,7 +477,7 @@ def display_menu():
     panel = Panel(
         table,
         title="Advanced Subnetting Calculator",
-        subtitle="Enter your choice [1-7 or q]:",
+        subtitle="Enter your choice [1-10 or q]:",
         expand=False,
         border_style="blue"
     )
@@ -275,10 +485,13 @@ def display_menu():
     console.print(panel)
     
 def main():
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    global prefix_table
     while True:
         console.clear()
         display_menu()
-        choice = Prompt.ask("Enter your choice", choices=["1", "2", "3", "4", "5", "6", "7", "q"], default="1")
+        choice = Prompt.ask("Enter your choice", choices=["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "q"], default="1")
 
         if choice == 'q':
             break
@@ -367,20 +580,99 @@ def main():
 
         elif choice == '7':
             while True:
-                ip_input = Prompt.ask("[bold yellow]Enter the IP address (or 'h' for help, 'b' to go back)[/bold yellow]", default="192.168.236.52")
+                ip_input = Prompt.ask("[bold yellow]Enter the IP address (or 'h' for help, 't' to load a prefix table, 'b' to go back)[/bold yellow]", default="192.168.236.52")
                 if ip_input.lower() == 'h':
                     display_help("identify_subnet")
+                elif ip_input.lower() == 't':
+                    path = Prompt.ask("[bold yellow]Enter the prefix table file ('prefix [tag]' per line) or prefix database[/bold yellow]")
+                    prefix_table = load_prefix_table(path) or prefix_table
                 elif ip_input.lower() == 'b':
                     break
                 else:
-                    mask_input = Prompt.ask("[bold yellow]Enter the subnet mask[/bold yellow]", default="255.255.255.128")
-                    identify_subnet(ip_input, mask_input)
+                    if prefix_table is not None:
+                        mask_input = Prompt.ask("[bold yellow]Enter the subnet mask (or 'table' to look it up in the loaded prefix table)[/bold yellow]", default="table")
+                    else:
+                        mask_input = Prompt.ask("[bold yellow]Enter the subnet mask[/bold yellow]", default="255.255.255.128")
+                    if mask_input.lower() == 'table' and prefix_table is not None:
+                        identify_subnet_in_table(ip_input, prefix_table)
+                    else:
+                        identify_subnet(ip_input, mask_input)
+                    break
+
+        elif choice == '8':
+            while True:
+                ip_input = Prompt.ask("[bold yellow]Enter the network to divide (or 'h' for help, 'b' to go back)[/bold yellow]", default="192.168.1.0/24")
+                if ip_input.lower() == 'h':
+                    display_help("vlsm_planner")
+                elif ip_input.lower() == 'b':
+                    break
+                else:
+                    demands_input = Prompt.ask("[bold yellow]Enter name:hosts pairs separated by commas (or @file)[/bold yellow]", default="Marketing:15, Sales:20, IT:10, Management:5")
+                    network = parse_input(ip_input)
+                    if network:
+                        try:
+                            demands = read_demands(demands_input)
+                        except (OSError, ValueError) as e:
+                            console.print(f"[bold red]Error:[/bold red] {str(e)}")
+                            continue
+                        vlsm_planner(network, demands)
+                        break
+
+        elif choice == '9':
+            while True:
+                networks_input = Prompt.ask("[bold yellow]Enter networks separated by commas, or @file (or 'h' for help, 'b' to go back)[/bold yellow]", default="192.168.0.0/24, 192.168.1.0/24, 192.168.2.0/23")
+                if networks_input.lower() == 'h':
+                    display_help("cidr_summarization")
+                elif networks_input.lower() == 'b':
+                    break
+                else:
+                    try:
+                        networks = read_networks(networks_input)
+                    except OSError as e:
+                        console.print(f"[bold red]Error:[/bold red] {str(e)}")
+                        continue
+                    cidr_summarization(networks)
+                    break
+
+        elif choice == '10':
+            while True:
+                networks_input = Prompt.ask("[bold yellow]Enter the allocated networks separated by commas, or @file (or 'h' for help, 'b' to go back)[/bold yellow]", default="10.0.0.0/24, 10.0.0.128/25, 10.0.1.0/24, 10.0.1.0/24")
+                if networks_input.lower() == 'h':
+                    display_help("overlap_detection")
+                elif networks_input.lower() == 'b':
+                    break
+                else:
+                    parent_input = Prompt.ask("[bold yellow]Parent block to report free space in (empty to skip)[/bold yellow]", default="10.0.0.0/22")
+                    parent = parse_input(parent_input) if parent_input.strip() else None
+                    if parent_input.strip() and parent is None:
+                        continue
+                    try:
+                        networks = read_networks(networks_input)
+                    except OSError as e:
+                        console.print(f"[bold red]Error:[/bold red] {str(e)}")
+                        continue
+                    overlap_report(networks, parent)
                     break
 
         console.print("\nPress Enter to continue...")
         console.input()
 
+    stats = render_cache.stats()
+    if stats["hits"]:
+        console.print(
+            f"[dim]Result cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['entries']} of {stats['size']} entries used[/dim]"
+        )
     console.print(Panel.fit("Thank you for using the Advanced Subnetting Calculator!", border_style="bold green"))
 
+# Operations dispatched from the menu; each is timed as a phase when profiling is on (see subnet_profile)
+PROFILED_OPERATIONS = (
+    "display_menu", "display_help", "parse_input", "display_subnet_info", "subnet_division",
+    "reverse_subnet_calculation", "generate_random_ips", "subnet_comparison", "generate_python_code",
+    "identify_subnet", "load_prefix_table", "identify_subnet_in_table", "vlsm_planner", "cidr_summarization",
+    "overlap_report",
+)
+
 if __name__ == "__main__":
+    setup_profiling(globals(), PROFILED_OPERATIONS)
     main()
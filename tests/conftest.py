@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the top of the repository, next to this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def batch(tmp_path, capsys):
+    """Run a subnet_batch command on the given input lines; returns (exit status, stdout, stderr)."""
+    from subnet_batch import main
+
+    def run(command, lines, *args):
+        path = tmp_path / "input.txt"
+        path.write_text("".join(f"{line}\n" for line in lines))
+        status = main([command, str(path), *args])
+        out, err = capsys.readouterr()
+        return status, out, err
+    return run
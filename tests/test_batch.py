@@ -0,0 +1,43 @@
+import ipaddress
+import json
+import random
+
+import pytest
+
+from subnet_batch import iter_rows
+
+def test_info_matches_ipaddress():
+    rng = random.Random(0)
+    lines = [f"{ipaddress.IPv4Address(rng.getrandbits(32))}/{rng.randint(0, 32)}" for _ in range(300)]
+    rows = list(iter_rows(lines))
+    assert len(rows) == len(lines)
+    for line, row in zip(lines, rows):
+        network = ipaddress.ip_network(line, strict=False)
+        fields = dict(zip(("input", "network", "prefixlen", "broadcast", "netmask"), row))
+        assert fields["network"] == str(network.network_address)
+        assert int(fields["prefixlen"]) == network.prefixlen
+        assert fields["broadcast"] == str(network.broadcast_address)
+        assert fields["netmask"] == str(network.netmask)
+
+@pytest.mark.parametrize("fmt", ["csv", "tsv", "jsonl"])
+def test_info_formats(batch, fmt):
+    status, out, err = batch("info", ["10.1.2.3/24", "bogus", "# comment", "", "10.1.2.3 255.255.255.0"], "-f", fmt)
+    assert status == 0
+    assert "line 2" in err
+    lines = out.splitlines()
+    if fmt == "jsonl":
+        records = [json.loads(line) for line in lines]
+    else:
+        separator = "," if fmt == "csv" else "\t"
+        header = lines[0].split(separator)
+        records = [dict(zip(header, line.split(separator))) for line in lines[1:]]
+    assert len(records) == 2
+    for record in records:
+        assert (record["network"], str(record["hosts"]), record["last_host"]) == ("10.1.2.0", "254", "10.1.2.254")
+
+def test_info_ipv6_and_binary(batch):
+    status, out, _ = batch("info", ["2001:db8::1/64"], "-f", "jsonl")
+    record = json.loads(out)
+    assert (record["network"], record["broadcast"]) == ("2001:db8::", "2001:db8::ffff:ffff:ffff:ffff")
+    status, out, _ = batch("info", ["10.1.2.3/24"], "-b", "--no-header")
+    assert out.rstrip().endswith("00001010.00000001.00000010.00000000,11111111.11111111.11111111.00000000")
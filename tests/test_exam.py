@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+import subnet_core
+from subnet_exam import load_exam_pack, write_pack
+from subnet_questions import make_question
+
+@pytest.fixture(params=["jsonl", "npz"])
+def suffix(request):
+    if request.param == "npz":
+        pytest.importorskip("numpy")
+    return request.param
+
+@pytest.mark.parametrize("difficulty", ["beginner", "advanced"])
+def test_round_trip_answers(tmp_path, suffix, difficulty):
+    path = str(tmp_path / f"pack.{suffix}")
+    assert write_pack(path, 3000, seed=5, difficulty=difficulty) == 3000
+    pack = load_exam_pack(path)
+    assert len(pack) == 3000
+    assert pack.meta["seed"] == 5 and pack.meta["difficulty"] == difficulty
+    for question in pack:
+        # The stored answers are the ones the quiz would work out
+        assert question == make_question(question.network, question.required_subnets)
+
+def test_same_seed_same_pack(tmp_path, suffix):
+    paths = [str(tmp_path / f"{name}.{suffix}") for name in ("a", "b", "c", "small")]
+    write_pack(paths[0], 1000, seed=9)
+    write_pack(paths[1], 1000, seed=9)
+    write_pack(paths[2], 1000, seed=10)
+    write_pack(paths[3], 300, seed=9)
+    a, b, c, small = (load_exam_pack(path) for path in paths)
+    assert a.ids == b.ids
+    assert a.ids != c.ids
+    assert small.ids == a.ids[:300]
+
+def test_jsonl_and_npz_agree(tmp_path):
+    pytest.importorskip("numpy")
+    write_pack(str(tmp_path / "pack.jsonl"), 500, seed=2)
+    write_pack(str(tmp_path / "pack.npz"), 500, seed=2)
+    assert list(load_exam_pack(str(tmp_path / "pack.jsonl"))) == list(load_exam_pack(str(tmp_path / "pack.npz")))
+
+def test_subnet_tables(tmp_path):
+    import json
+    path = tmp_path / "pack.jsonl"
+    write_pack(str(path), 50, seed=1, tables=True)
+    assert len(load_exam_pack(str(path))) == 50  # the loader skips the tables
+    for line in path.read_text().splitlines()[1:]:
+        record = json.loads(line)
+        question = make_question(record["network"], record["required_subnets"])
+        subnets = question.network.subnets(new_prefix=question.new_prefix)
+        assert record["subnets"] == [
+            [str(s.network_address), str(s.network_address + 1), str(s.broadcast_address - 1), str(s.broadcast_address)]
+            for s in subnets
+        ]
+
+def test_without_numpy_still_deterministic(tmp_path, monkeypatch):
+    monkeypatch.setattr(subnet_core, "_numpy", False)
+    write_pack(str(tmp_path / "a.jsonl"), 200, seed=4)
+    write_pack(str(tmp_path / "b.jsonl"), 200, seed=4)
+    a = load_exam_pack(str(tmp_path / "a.jsonl"))
+    assert a.meta["generator"] == "random"
+    assert a.ids == load_exam_pack(str(tmp_path / "b.jsonl")).ids
+    with pytest.raises(ValueError):
+        write_pack(str(tmp_path / "a.npz"), 10)
+
+def test_bank_has_one_entry_per_question(tmp_path):
+    path = str(tmp_path / "pack.jsonl")
+    write_pack(path, 2000, seed=3, difficulty="beginner")
+    bank = load_exam_pack(path).question_bank()
+    assert len(bank) == 12
+    qid = bank.ids[0]
+    bank.record_miss(qid, 100)
+    rng = random.Random(0)
+    drawn = [bank.draw(rng)[0] for _ in range(500)]
+    assert drawn.count(qid) > 400
+
+def test_rejects_empty_and_foreign_files(tmp_path):
+    empty = tmp_path / "empty.jsonl"
+    write_pack(str(empty), 0)
+    with pytest.raises(ValueError, match="no questions"):
+        load_exam_pack(str(empty))
+    other = tmp_path / "other.jsonl"
+    other.write_text('{"format": "something else"}\n')
+    with pytest.raises(ValueError):
+        load_exam_pack(str(other))
+
+def test_tables_are_opt_in(tmp_path):
+    import json
+    from subnet_exam import main
+    for args, has_tables in (((), False), (("--tables",), True)):
+        path = tmp_path / f"pack{len(args)}.jsonl"
+        assert main(["-n", "5", "-o", str(path), *args]) == 0
+        assert all(("subnets" in json.loads(line)) == has_tables for line in path.read_text().splitlines()[1:])
+
+def test_rejects_foreign_and_truncated_npz(tmp_path):
+    import zipfile
+    pytest.importorskip("numpy")
+    foreign = tmp_path / "foreign.npz"
+    with zipfile.ZipFile(foreign, "w") as archive:
+        archive.writestr("readme.txt", "not a pack")
+    pack = tmp_path / "pack.npz"
+    write_pack(str(pack), 100)
+    truncated = tmp_path / "truncated.npz"
+    truncated.write_bytes(pack.read_bytes()[:200])
+    for path in (foreign, truncated):
+        with pytest.raises(ValueError, match="not a valid exam pack"):
+            load_exam_pack(str(path))
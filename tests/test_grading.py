@@ -0,0 +1,94 @@
+import pytest
+
+from subnet_grading import (
+    CORRECT, FORGOT_RESERVED, ORIGINAL_MASK, TOO_FEW_BITS, TOO_MANY_BITS, UNPARSEABLE, WILDCARD_MASK, WRONG,
+    AnswerKey, grade_bonus, parse_count, parse_mask
+)
+from subnet_questions import make_question
+
+@pytest.fixture
+def key():
+    # 192.168.1.0/24 into 4 subnets: borrow 2 bits, /26, 62 hosts
+    return AnswerKey(make_question("192.168.1.0/24", 4))
+
+@pytest.mark.parametrize("answer", ["255.255.255.192", "/26", "26", "0xffffffc0", "ffffffc0", "0XFFFFFFC0", " /26 "])
+def test_netmask_formats_correct(key, answer):
+    assert key.diagnose("netmask", answer) == CORRECT
+
+@pytest.mark.parametrize("answer,diagnostic", [
+    ("0.0.0.63", WILDCARD_MASK),
+    ("255.255.255.0", ORIGINAL_MASK),
+    ("/24", ORIGINAL_MASK),
+    ("0xffffff00", ORIGINAL_MASK),
+    ("255.255.255.224", WRONG),
+    ("/27", WRONG),
+    ("ffffffe0", WRONG),
+    ("255.255.0.255", UNPARSEABLE),
+    ("0xffff00ff", UNPARSEABLE),
+    ("/33", UNPARSEABLE),
+    ("mask", UNPARSEABLE),
+])
+def test_netmask_mistakes(key, answer, diagnostic):
+    assert key.diagnose("netmask", answer) == diagnostic
+
+@pytest.mark.parametrize("answer,diagnostic", [
+    (2, CORRECT), ("2", CORRECT), (" 2 ", CORRECT), (1, TOO_FEW_BITS), ("3", TOO_MANY_BITS), ("two", UNPARSEABLE),
+])
+def test_bits(key, answer, diagnostic):
+    assert key.diagnose("bits", answer) == diagnostic
+
+@pytest.mark.parametrize("answer,diagnostic", [
+    ("62", CORRECT), (62, CORRECT), ("64", FORGOT_RESERVED), ("60", WRONG), ("6²", UNPARSEABLE), ("", UNPARSEABLE),
+])
+def test_hosts(key, answer, diagnostic):
+    assert key.diagnose("hosts", answer) == diagnostic
+
+def test_grade_and_batch_agree(key):
+    grade = key.grade("netmask", "0.0.0.63")
+    assert (grade.correct, grade.expected, grade.diagnostic) == (False, "255.255.255.192", WILDCARD_MASK)
+    answers = ["/26", "0.0.0.63", "/26", "/24"]
+    assert key.score_many("netmask", answers) == (2, [CORRECT, WILDCARD_MASK, CORRECT, ORIGINAL_MASK])
+
+# True == 1 and 2.0 == 2, but neither is a whole-number answer, and a list cannot be a dict key
+@pytest.mark.parametrize("answers,diagnostics", [
+    ([2, True, 2.0, "2", [2]], [CORRECT, UNPARSEABLE, UNPARSEABLE, CORRECT, UNPARSEABLE]),
+    ([True, 2, [2], 2.0, 2], [UNPARSEABLE, CORRECT, UNPARSEABLE, UNPARSEABLE, CORRECT]),
+    ([1.0, 1, True, 1], [UNPARSEABLE, TOO_FEW_BITS, UNPARSEABLE, TOO_FEW_BITS]),
+])
+def test_batch_keys_are_exact(key, answers, diagnostics):
+    assert key.diagnose_many("bits", answers) == diagnostics
+    assert [key.diagnose("bits", answer) for answer in answers] == diagnostics
+
+def test_parse_count():
+    assert parse_count("1,024") == 1024
+    assert parse_count("1_024") == 1024
+    assert parse_count(True) is None
+    assert parse_count("-5") is None
+    assert parse_count("²") is None
+
+def test_parse_mask():
+    assert parse_mask("255.255.255.255") == 32
+    assert parse_mask("0.0.0.0") == 0
+    assert parse_mask("00000000") == 0
+    assert parse_mask("0xzzzzzzzz") is None
+
+def test_grade_bonus():
+    bonus = {"options": [{"text": "A"}, {"text": "B"}], "correct_answer": "B"}
+    assert grade_bonus(bonus, 2).correct
+    assert grade_bonus(bonus, "B").correct
+    assert not grade_bonus(bonus, "1").correct
+    assert grade_bonus(bonus, 3).diagnostic == UNPARSEABLE
+
+def test_batch_grade(batch):
+    status, out, err = batch("grade", [
+        '{"id": "a", "network": "192.168.1.0/24", "required_subnets": 4, "bits": 2, "netmask": "/26", "hosts": 62}',
+        '{"network": "192.168.1.0/24", "required_subnets": 4, "bits": true, "netmask": "0.0.0.63"}',
+        '{"network": "192.168.1.0/24"}',
+    ])
+    assert status == 0
+    assert out.splitlines() == [
+        "id,network,required_subnets,score,bits,netmask,hosts",
+        "a,192.168.1.0/24,4,3,correct,correct,correct",
+        "2,192.168.1.0/24,4,0,unparseable,wildcard_mask,missing",
+    ]
+    assert err.startswith("line 3:")
@@ -0,0 +1,44 @@
+import ipaddress
+import random
+
+import pytest
+
+from subnet_core import host_count, host_range, iter_random_hosts, sample_hosts
+
+SMALL_NETWORKS = ["192.168.1.0/24", "10.0.0.0/30", "10.0.0.0/31", "10.0.0.1/32", "2001:db8::/120", "2001:db8::/127"]
+
+@pytest.mark.parametrize("text", SMALL_NETWORKS)
+def test_host_range_matches_hosts(text):
+    network = ipaddress.ip_network(text)
+    hosts = list(network.hosts()) or [network.network_address]
+    assert host_range(network) == (int(hosts[0]), int(hosts[-1]))
+    assert host_count(network) == len(hosts)
+
+@pytest.mark.parametrize("text", SMALL_NETWORKS)
+def test_iter_random_hosts_is_a_permutation(text):
+    network = ipaddress.ip_network(text)
+    first, last = host_range(network)
+    produced = [int(host) for host in iter_random_hosts(network, rng=random.Random(1))]
+    assert sorted(produced) == list(range(first, last + 1))
+
+@pytest.mark.parametrize("text", SMALL_NETWORKS)
+def test_sample_hosts_unique_and_clipped(text):
+    network = ipaddress.ip_network(text)
+    first, last = host_range(network)
+    sample = sample_hosts(network, 1000, random.Random(2))
+    assert len(sample) == len(set(sample)) == last - first + 1
+    assert all(network.version == host.version and first <= int(host) <= last for host in sample)
+
+@pytest.mark.parametrize("text", ["10.0.0.0/8", "2001:db8::/32"])
+def test_large_networks_are_not_enumerated(text):
+    network = ipaddress.ip_network(text)
+    first, last = host_range(network)
+    for hosts in (sample_hosts(network, 500, random.Random(3)), list(iter_random_hosts(network, 500, random.Random(3)))):
+        assert len(hosts) == len(set(hosts)) == 500
+        assert all(first <= int(host) <= last for host in hosts)
+
+def test_seeded_samples_repeat():
+    network = ipaddress.ip_network("172.16.0.0/12")
+    assert sample_hosts(network, 20, random.Random(5)) == sample_hosts(network, 20, random.Random(5))
+    assert list(iter_random_hosts(network, 20, random.Random(5))) == list(iter_random_hosts(network, 20, random.Random(5)))
+    assert sample_hosts(network, 0) == []
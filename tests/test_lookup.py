@@ -0,0 +1,69 @@
+import ipaddress
+import random
+
+import pytest
+
+from subnet_lookup import PrefixTable
+
+def random_table(rng, count):
+    lines = []
+    for n in range(count):
+        if rng.random() < 0.8:
+            prefixlen = rng.randint(8, 32)
+            network = ipaddress.IPv4Network((rng.getrandbits(8) << 24 | rng.getrandbits(24), prefixlen), strict=False)
+        else:
+            prefixlen = rng.randint(16, 128)
+            network = ipaddress.IPv6Network((0x2001 << 112 | rng.getrandbits(112), prefixlen), strict=False)
+        lines.append(f"{network} tag{n}")
+    # Nested and duplicate prefixes are the interesting cases
+    lines += ["0.0.0.0/0 default", "10.0.0.0/8 corp", "10.20.0.0/16 lab", "10.20.0.0/16 again", "10.20.30.0/24 rack"]
+    return PrefixTable.from_lines(lines)
+
+def brute_force(networks, address):
+    matches = [n for n in networks if n.version == address.version and address in n]
+    return max(matches, key=lambda n: n.prefixlen) if matches else None
+
+def sample_addresses(rng, networks, count):
+    addresses = []
+    for _ in range(count):
+        network = rng.choice(networks)
+        addresses.append(network.network_address + rng.randrange(network.num_addresses))
+        addresses.append(ipaddress.IPv4Address(rng.getrandbits(32)))
+        addresses.append(ipaddress.IPv6Address(rng.getrandbits(128)))
+    return addresses
+
+@pytest.fixture(scope="module")
+def table():
+    return random_table(random.Random(1), 400)
+
+def test_table_matches_brute_force(table):
+    networks = [table.network(i) for i in range(len(table))]
+    for address in sample_addresses(random.Random(2), networks, 300):
+        i = table.lookup_index(int(address), address.version)
+        expected = brute_force(networks, address)
+        assert (None if i is None else table.network(i)) == expected
+
+def test_lookup_returns_tag(table):
+    network, tag = table.lookup("10.20.30.40")
+    assert (str(network), tag) == ("10.20.30.0/24", "rack")
+
+def test_table_rejects_bad_line():
+    with pytest.raises(ValueError, match="line 2"):
+        PrefixTable.from_lines(["10.0.0.0/8 corp", "10.0.0.0/33 broken"])
+
+def test_batch_lookup(batch, tmp_path):
+    prefixes = tmp_path / "prefixes.txt"
+    prefixes.write_text("10.0.0.0/8 corp\n10.20.0.0/16 lab\n")
+    status, out, err = batch("lookup", ["10.20.1.1", "10.1.1.1", "192.0.2.1", "not-an-ip"], "-t", str(prefixes))
+    assert status == 0
+    assert out.splitlines() == ["address,prefix,tag", "10.20.1.1,10.20.0.0/16,lab", "10.1.1.1,10.0.0.0/8,corp", "192.0.2.1,,"]
+    assert err.startswith("line 4:")
+
+@pytest.mark.parametrize("content", [None, "10.0.0.0/8 corp\nnot-a-prefix\n"])
+def test_batch_lookup_bad_table(batch, tmp_path, content):
+    prefixes = tmp_path / "prefixes.txt"
+    if content is not None:
+        prefixes.write_text(content)
+    status, out, err = batch("lookup", ["10.1.1.1"], "-t", str(prefixes))
+    assert (status, out) == (2, "")
+    assert err.startswith("Error:")
@@ -0,0 +1,68 @@
+import ipaddress
+import random
+from collections import Counter
+
+import pytest
+
+from subnet_ranges import CONTAINS, DUPLICATE, iter_conflicts, iter_free_prefixes, prefix_range, read_inventory
+
+def random_inventory(rng, count):
+    lines = []
+    for _ in range(count):
+        network = ipaddress.IPv4Network((0x0A000000 | rng.getrandbits(16) << 8, rng.randint(12, 28)), strict=False)
+        lines.append(str(network))
+    return lines + lines[:5]  # and some duplicates
+
+def brute_force_conflicts(lines):
+    networks = [ipaddress.ip_network(line) for line in lines]
+    pairs = Counter()
+    for i, a in enumerate(networks):
+        for j, b in enumerate(networks):
+            if i == j:
+                continue
+            if a == b and i < j:
+                pairs[DUPLICATE, str(a), str(b)] += 1
+            elif a != b and b.subnet_of(a):
+                pairs[CONTAINS, str(a), str(b)] += 1
+    return pairs
+
+@pytest.mark.parametrize("seed", range(5))
+def test_conflicts_match_brute_force(seed):
+    lines = random_inventory(random.Random(seed), 150)
+    # Labels repeat with the duplicates, so compare counts of each pair
+    assert Counter(iter_conflicts(read_inventory(lines)[4])) == brute_force_conflicts(lines)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_free_prefixes_match_ipaddress(seed):
+    lines = random_inventory(random.Random(seed), 40)
+    parent = ipaddress.ip_network("10.0.0.0/12")
+    used = [ipaddress.ip_network(line) for line in lines if ipaddress.ip_network(line).subnet_of(parent)]
+    ranges = [entry[:2] for entry in read_inventory(lines)[4]]
+    start, end = prefix_range(int(parent.network_address), parent.prefixlen)
+    free = [ipaddress.ip_network((address, prefix)) for address, prefix in iter_free_prefixes(ranges, start, end)]
+    # Free blocks and used ones tile the parent without overlapping
+    assert list(ipaddress.collapse_addresses(free + used)) == [parent]
+    assert not any(f.overlaps(u) for f in free for u in used)
+    assert free == sorted(free)
+
+def test_batch_overlaps(batch):
+    status, out, err = batch("overlaps", ["10.0.0.0/16 core", "10.0.1.0/24", "10.0.1.0/24", "2001:db8::/32"], "-p", "10.0.0.0/15")
+    assert status == 1
+    assert out.splitlines() == [
+        "kind,prefix,other",
+        "contains,10.0.0.0/16,10.0.1.0/24",
+        "contains,10.0.0.0/16,10.0.1.0/24",
+        "duplicate,10.0.1.0/24,10.0.1.0/24",
+        "free,10.1.0.0/16,10.0.0.0/15",
+    ]
+    assert err == "4 prefixes: 1 duplicate pairs, 2 nested pairs, 1 free blocks\n"
+
+def test_batch_overlaps_clean(batch):
+    status, out, err = batch("overlaps", ["10.0.0.0/24", "10.0.1.0/24"])
+    assert (status, out.splitlines()) == (0, ["kind,prefix,other"])
+
+@pytest.mark.parametrize("lines, args", [(["10.0.0.0/24", "10.0.0.0/40"], ()), (["10.0.0.0/24"], ("-p", "10.0.0.0/99"))])
+def test_batch_overlaps_errors(batch, lines, args):
+    status, out, err = batch("overlaps", lines, *args)
+    assert (status, out) == (2, "")
+    assert err.startswith("Error:")
@@ -0,0 +1,86 @@
+import io
+import ipaddress
+import itertools
+
+import pytest
+
+import subnet_console
+from subnet_pager import SubnetPager
+
+@pytest.fixture
+def output(monkeypatch):
+    """Send everything printed through subnet_console to a string; returns the StringIO."""
+    from rich.console import Console
+    out = io.StringIO()
+    monkeypatch.setattr(subnet_console.console, "_console", Console(file=out, width=200, color_system=None))
+    return out
+
+def host_range(network):
+    """First and last host: /31 and /32 use every address, IPv6 has no broadcast to leave out."""
+    if network.num_addresses <= 2:
+        return network.network_address, network.broadcast_address
+    return network.network_address + 1, network.broadcast_address - (network.version == 4)
+
+@pytest.mark.parametrize("network,new_prefix,count", [
+    ("10.0.0.0/8", 30, None),
+    ("192.168.1.0/24", 27, 5),
+    ("192.168.1.0/24", 32, None),
+    ("2001:db8::/32", 64, 1000),
+])
+def test_rows_match_ipaddress(network, new_prefix, count):
+    network = ipaddress.ip_network(network)
+    pager = SubnetPager(network, new_prefix, count, page_rows=7)
+    expected = network.subnets(new_prefix=new_prefix)
+    if count is not None:
+        expected = itertools.islice(expected, count)
+    expected = list(itertools.islice(expected, 50))
+    assert pager.total == (count if count is not None else 2 ** (new_prefix - network.prefixlen))
+    rows = list(itertools.chain(pager.window(0), pager.window(1), pager.rows(14, 50)))
+    assert [number for number, _ in rows] == list(range(1, len(expected) + 1))
+    for (number, subnet), want in zip(rows, expected):
+        cells = pager.cells((number, subnet))
+        first, last = host_range(want)
+        assert cells[:4] == [str(number), str(want.network_address), str(first), str(last)]
+        if network.version == 4:
+            assert cells[4] == str(want.broadcast_address)
+
+def test_last_page_of_a_huge_division():
+    network = ipaddress.ip_network("2001:db8::/32")
+    pager = SubnetPager(network, 128)
+    assert pager.pages == -(-2 ** 96 // pager.page_rows)
+    pager.goto(10 ** 40)
+    number, subnet = list(pager.window())[-1]
+    assert number == 2 ** 96
+    assert str(subnet) == "2001:db8:ffff:ffff:ffff:ffff:ffff:ffff/128"
+
+def test_navigation():
+    pager = SubnetPager(ipaddress.ip_network("10.0.0.0/16"), 24, page_rows=20)
+    assert pager.pages == 13
+    assert pager.goto(-1) == 0
+    assert pager.goto(99) == 12
+    assert pager.jump(41) == 40 and pager.page == 2
+    with pytest.raises(ValueError):
+        pager.jump(257)
+    assert pager.find("10.0.200.9") == 200
+    assert pager.find("10.1.0.1") is None
+    assert pager.find("2001:db8::1") is None
+    with pytest.raises(ValueError):
+        pager.find("not-an-address")
+    assert SubnetPager(ipaddress.ip_network("10.0.0.0/16"), 24, 10).find("10.0.200.9") is None
+
+def test_binary_cells():
+    pager = SubnetPager(ipaddress.ip_network("192.168.1.0/24"), 26)
+    assert pager.cells((2, pager.view.subnet(1)), binary=True)[:2] == ["2", "192.168.1.64"]
+
+def test_division_prints_every_subnet(output):
+    from subnetting_calc import subnet_division
+    subnet_division(ipaddress.ip_network("192.168.1.0/24"), 4)
+    text = output.getvalue()
+    assert all(f" {address} " in text for address in ("192.168.1.0", "192.168.1.64", "192.168.1.128", "192.168.1.192"))
+    assert "Total subnets created: 4" in text
+
+@pytest.mark.parametrize("count", [0, -3])
+def test_division_rejects_fewer_than_one_subnet(output, count):
+    from subnetting_calc import subnet_division
+    subnet_division(ipaddress.ip_network("192.168.1.0/24"), count)
+    assert output.getvalue().startswith("Error: the number of subnets must be at least 1")
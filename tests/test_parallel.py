@@ -0,0 +1,87 @@
+import random
+import time
+
+import pytest
+
+import subnet_core
+import subnet_vector
+from subnet_parallel import PACKED_COLUMNS, imap_ordered, iter_text_chunks, subnet_columns
+from subnet_vector import ipv4_subnets
+
+# Worker functions must be importable by name, so they live at module level
+
+def slow_square(n):
+    # Later payloads finish first, so results come back out of order
+    time.sleep((10 - n) * 0.005)
+    return n * n
+
+_offset = 0
+
+def set_offset(value):
+    global _offset
+    _offset = value
+
+def add_offset(n):
+    return n + _offset
+
+def test_imap_ordered_keeps_input_order():
+    assert list(imap_ordered(slow_square, range(10), jobs=4, window=5)) == [n * n for n in range(10)]
+
+def test_imap_ordered_initializer():
+    assert list(imap_ordered(add_offset, range(5), jobs=2, initializer=set_offset, initargs=(100,))) == list(range(100, 105))
+
+def test_iter_text_chunks_numbers_lines():
+    chunks = list(iter_text_chunks((f"line {n}" for n in range(1, 8)), size=3))
+    assert [first for first, _ in chunks] == [1, 4, 7]
+    assert "".join(text for _, text in chunks) == "".join(f"line {n}\n" for n in range(1, 8))
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    # Worker processes are forked, so they inherit the patched module state
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(subnet_core, "_numpy", False)
+        monkeypatch.setattr(subnet_vector, "HAVE_NUMPY", False)
+    return request.param
+
+def test_subnet_columns_match_serial(backend):
+    rng = random.Random(5)
+    addresses = [rng.getrandbits(32) for _ in range(2500)]
+    prefixlens = [rng.randint(0, 32) for _ in addresses]
+    columns = subnet_columns(addresses, prefixlens, jobs=3, size=400)
+    expected = ipv4_subnets(addresses, prefixlens)
+    for name in PACKED_COLUMNS:
+        assert [int(v) for v in columns[name]] == [int(v) for v in expected[name]]
+
+def test_subnet_columns_one_prefixlen(backend):
+    columns = subnet_columns([0x0A000001, 0xC0A80177], 24, jobs=2)
+    assert [int(v) for v in columns["network"]] == [0x0A000000, 0xC0A80100]
+    assert [int(v) for v in columns["last"]] == [0x0A0000FE, 0xC0A801FE]
+
+def test_parallel_info_matches_serial(batch):
+    rng = random.Random(6)
+    lines = [f"{rng.getrandbits(32) >> 24}.{rng.randrange(256)}.0.0/{rng.randint(8, 32)}" for _ in range(300)]
+    lines[10] = "bad input"
+    lines.append("2001:db8::/48")
+    for args in ((), ("-b",), ("-f", "jsonl")):
+        assert batch("info", lines, "--jobs", "2", *args) == batch("info", lines, *args)
+
+def test_parallel_lookup_matches_serial(batch, tmp_path):
+    prefixes = tmp_path / "prefixes.txt"
+    prefixes.write_text("10.0.0.0/8 corp\n10.20.0.0/16 lab\n2001:db8::/32 v6\n")
+    lines = ["10.20.1.1", "10.1.1.1", "192.0.2.1", "nope", "2001:db8::5"]
+    status, out, err = batch("lookup", lines, "-t", str(prefixes), "-j", "2")
+    assert (status, out, err) == batch("lookup", lines, "-t", str(prefixes))
+    assert err.startswith("line 4:")
+
+def test_parallel_lookup_bad_table(batch, tmp_path):
+    status, out, err = batch("lookup", ["10.1.1.1"], "-t", str(tmp_path / "missing.txt"), "-j", "2")
+    assert (status, out) == (2, "")
+    assert err.startswith("Error:") and err.count("\n") == 1
+
+@pytest.mark.parametrize("jobs", ["-1", "two"])
+def test_jobs_must_be_a_whole_number(batch, jobs):
+    with pytest.raises(SystemExit) as exit:
+        batch("info", ["10.0.0.0/8"], "--jobs", jobs)
+    assert exit.value.code == 2
@@ -0,0 +1,68 @@
+import ipaddress
+import random
+
+import pytest
+
+from subnet_lookup import PrefixTable
+from subnet_prefixdb import PrefixDB, build_prefix_db, open_prefix_table
+from test_lookup import brute_force, random_table, sample_addresses
+
+@pytest.fixture(scope="module")
+def table():
+    return random_table(random.Random(1), 400)
+
+@pytest.fixture(scope="module")
+def db(table, tmp_path_factory):
+    path = tmp_path_factory.mktemp("db") / "prefixes.spdb"
+    build_prefix_db(table, str(path))
+    with PrefixDB(str(path)) as db:
+        yield db
+
+def test_table_matches_brute_force(table):
+    networks = [table.network(i) for i in range(len(table))]
+    for address in sample_addresses(random.Random(2), networks, 300):
+        i = table.lookup_index(int(address), address.version)
+        expected = brute_force(networks, address)
+        assert (None if i is None else table.network(i)) == expected
+
+def test_db_matches_brute_force(table, db):
+    networks = [table.network(i) for i in range(len(table))]
+    for address in sample_addresses(random.Random(3), networks, 300):
+        i = db.lookup_index(int(address), address.version)
+        expected = brute_force(networks, address)
+        assert (None if i is None else db.network(i)) == expected
+
+def test_lookup_many_matches_lookup_index(table, db):
+    rng = random.Random(4)
+    values = [rng.getrandbits(32) for _ in range(2000)] + [int(ipaddress.ip_address("10.20.30.40"))]
+    for source in (table, db):
+        many = [int(i) for i in source.lookup_many(values)]
+        single = [source.lookup_index(v) for v in values]
+        assert many == [-1 if i is None else i for i in single]
+
+def test_lookup_returns_tag(table, db):
+    for source in (table, db):
+        network, tag = source.lookup("10.20.30.40")
+        assert (str(network), tag) == ("10.20.30.0/24", "rack")
+
+def test_open_prefix_table_detects_format(table, db, tmp_path):
+    text = tmp_path / "prefixes.txt"
+    text.write_text("10.0.0.0/8 corp\n192.168.1.0 255.255.255.0 home\n")
+    loaded = open_prefix_table(str(text))
+    assert isinstance(loaded, PrefixTable)
+    assert loaded.lookup("192.168.1.7") == (ipaddress.ip_network("192.168.1.0/24"), "home")
+    assert isinstance(open_prefix_table(db.path), PrefixDB)
+
+def test_truncated_db_rejected(db, tmp_path):
+    data = open(db.path, 'rb').read()
+    for size, message in ((0, "empty file"), (len(data) // 2, "truncated")):
+        broken = tmp_path / f"broken{size}.spdb"
+        broken.write_bytes(data[:size])
+        with pytest.raises(ValueError, match=message):
+            PrefixDB(str(broken))
+
+def test_batch_lookup_with_db(table, db, batch):
+    lines = ["10.20.30.40", "10.99.0.1"]
+    status, out, err = batch("lookup", lines, "-t", db.path)
+    assert status == 0
+    assert out.splitlines()[1:] == [f"{address},{table.lookup(address)[0]},{table.lookup(address)[1]}" for address in lines]
@@ -0,0 +1,51 @@
+import json
+import os
+
+from subnet_progress import ProgressStore
+
+def test_record_upserts_counts(tmp_path):
+    path = str(tmp_path / "progress.db")
+    with ProgressStore(path, user="alice") as store:
+        store.record("questions", "10.0.0.0/16:4", True)
+        store.record("questions", "10.0.0.0/16:4", False)
+        store.record("questions", "10.0.0.0/16:4", False)
+        store.record("questions", "192.168.1.0/24:2", True)
+        store.record("questions", "10.0.0.0/16:4", False, user="bob")
+        assert store.stats("questions") == {"10.0.0.0/16:4": (3, 2), "192.168.1.0/24:2": (1, 0)}
+        assert store.misses("questions") == {"10.0.0.0/16:4": 2}
+        assert store.misses("questions", user="bob") == {"10.0.0.0/16:4": 1}
+        assert store.misses("bonus_questions") == {}
+        assert store.users() == ["alice", "bob"]
+    # Counts survive reopening the file
+    with ProgressStore(path, user="alice") as store:
+        store.record("questions", "10.0.0.0/16:4", False)
+        assert store.stats("questions")["10.0.0.0/16:4"] == (4, 3)
+
+def test_two_stores_share_one_file(tmp_path):
+    path = str(tmp_path / "progress.db")
+    with ProgressStore(path, user="alice") as first, ProgressStore(path, user="alice") as second:
+        first.record("questions", "q", False)
+        second.record("questions", "q", False)
+        assert first.misses("questions") == {"q": 2}
+
+def test_import_json(tmp_path):
+    legacy = tmp_path / "progress.json"
+    legacy.write_text(json.dumps({"questions": {"10.0.0.0/16:4": 3}, "bonus_questions": {"7": 1}}))
+    with ProgressStore(":memory:", user="alice", legacy_path=None) as store:
+        store.record("questions", "10.0.0.0/16:4", True)
+        store.import_json(str(legacy))
+        assert store.stats("questions") == {"10.0.0.0/16:4": (4, 3)}
+        assert store.misses("bonus_questions") == {"7": 1}
+
+def test_legacy_file_imported_only_into_new_database(tmp_path):
+    legacy = tmp_path / "progress.json"
+    legacy.write_text(json.dumps({"questions": {"q": 2}}))
+    path = str(tmp_path / "progress.db")
+    with ProgressStore(path, user="alice", legacy_path=str(legacy)) as store:
+        assert store.misses("questions") == {"q": 2}
+    with ProgressStore(path, user="alice", legacy_path=str(legacy)) as store:
+        assert store.misses("questions") == {"q": 2}
+
+def test_default_path_is_next_to_the_module():
+    import subnet_progress
+    assert os.path.dirname(subnet_progress.DEFAULT_PATH) == os.path.dirname(os.path.abspath(subnet_progress.__file__))
@@ -0,0 +1,49 @@
+import random
+from collections import Counter
+
+import pytest
+
+from subnet_questions import WeightedSampler, build_question_bank, generate_network, make_question
+
+def test_sampler_follows_weights():
+    sampler = WeightedSampler([1, 0, 3, 6])
+    rng = random.Random(0)
+    counts = Counter(sampler.sample(rng) for _ in range(20000))
+    assert counts[1] == 0
+    assert counts[3] / counts[0] == pytest.approx(6, rel=0.15)
+    sampler.update(3, 0)
+    assert sampler.total == 4
+    assert all(sampler.sample(rng) in (0, 2) for _ in range(200))
+
+def test_sampler_rejects_zero_total():
+    with pytest.raises(ValueError):
+        WeightedSampler([0, 0]).sample()
+
+def test_make_question():
+    question = make_question("172.16.5.0/16", 5)
+    assert (str(question.network), question.bits, question.new_prefix, question.netmask, question.hosts) == (
+        "172.16.0.0/16", 3, 19, "255.255.224.0", 8190
+    )
+    assert question.id == "172.16.0.0/16:5"
+
+def test_advanced_questions_fit():
+    rng = random.Random(0)
+    for _ in range(2000):
+        spec = generate_network("advanced", rng)
+        assert make_question(spec["network"], spec["required_subnets"]).new_prefix <= 30
+
+def test_bank_weights_misses():
+    bank = build_question_bank("beginner")
+    qid = bank.ids[3]
+    bank.load_misses({qid: 99, "unknown": 5})
+    assert bank.misses(qid) == 99
+    rng = random.Random(1)
+    assert sum(bank.draw(rng)[0] == qid for _ in range(1000)) > 800
+
+def test_fork_has_its_own_weights():
+    bank = build_question_bank("beginner")
+    fork = bank.fork()
+    fork.record_miss(bank.ids[0], 10)
+    assert fork.misses(bank.ids[0]) == 10
+    assert bank.misses(bank.ids[0]) == 0
+    assert fork.questions is bank.questions
@@ -0,0 +1,58 @@
+import ipaddress
+import random
+
+import pytest
+
+from subnet_ranges import collapse, merge_ranges, prefix_range, read_prefixes
+
+def random_networks(rng, count, version=4):
+    max_prefixlen = 32 if version == 4 else 128
+    low = 8 if version == 4 else 32
+    networks = []
+    for _ in range(count):
+        prefixlen = rng.randint(low, max_prefixlen)
+        networks.append(ipaddress.ip_network((rng.getrandbits(max_prefixlen), prefixlen), strict=False))
+    return networks
+
+def as_ranges(networks):
+    return [(int(n.network_address), int(n.broadcast_address)) for n in networks]
+
+@pytest.mark.parametrize("version,count", [(4, 50), (4, 3000), (6, 200)])
+def test_collapse_matches_ipaddress(version, count):
+    # 3000 ranges also exercises the NumPy merge
+    rng = random.Random(count)
+    networks = random_networks(rng, count, version)
+    max_prefixlen = 32 if version == 4 else 128
+    blocks = collapse(as_ranges(networks), max_prefixlen)
+    expected = [(int(n.network_address), n.prefixlen) for n in ipaddress.collapse_addresses(networks)]
+    assert blocks == expected
+
+def test_collapse_adjacent_and_nested():
+    networks = ["10.0.0.0/25", "10.0.0.128/25", "10.0.0.64/26", "10.0.1.0/24"]
+    ranges = read_prefixes(networks)[4]
+    assert collapse(ranges) == [(int(ipaddress.ip_address("10.0.0.0")), 23)]
+
+def test_merge_ranges_joins_adjacent():
+    assert merge_ranges([(5, 9), (0, 4), (20, 30), (25, 26)]) == [(0, 9), (20, 30)]
+
+def test_prefix_range():
+    assert prefix_range(0x0A0000FF, 24) == (0x0A000000, 0x0A0000FF)
+    assert prefix_range(1, 0, 128) == (0, (1 << 128) - 1)
+
+def test_read_prefixes_reports_line():
+    with pytest.raises(ValueError, match="line 2"):
+        read_prefixes(["10.0.0.0/8", "bogus"])
+
+def test_batch_summarize(batch):
+    status, out, err = batch("summarize", ["10.0.0.0/25", "10.0.0.128/25", "10.0.1.0/24", "2001:db8::/33", "2001:db8:8000::/33"])
+    assert status == 0
+    assert out.splitlines() == ["prefix", "10.0.0.0/23", "2001:db8::/32"]
+
+def test_batch_summarize_supernet(batch):
+    status, out, err = batch("summarize", ["10.0.0.0/24", "10.0.3.0/24"], "--supernet")
+    assert out.splitlines() == ["prefix", "10.0.0.0/22"]
+
+def test_batch_summarize_error(batch):
+    status, out, err = batch("summarize", ["10.0.0.0/24", "10.0.0.0/40"])
+    assert (status, out) == (2, "")
+    assert err.startswith("Error: line 2:")
@@ -0,0 +1,88 @@
+import io
+import os
+
+import pytest
+
+import subnet_console
+from subnet_console import RenderCache, print_cached
+
+def test_least_recently_used_is_evicted():
+    cache = RenderCache(size=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"  # now b is the oldest
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("A", "C")
+    assert cache.stats() == {"hits": 3, "misses": 1, "hit_rate": 0.75, "entries": 2, "size": 2, "evictions": 1}
+
+def test_uncounted_lookups():
+    cache = RenderCache()
+    cache.put("menu", "text")
+    cache.get("menu", count=False)
+    cache.get("other", count=False)
+    assert (cache.hits, cache.misses) == (0, 0)
+
+@pytest.mark.parametrize("size", [0, -1])
+def test_size_zero_keeps_nothing(size):
+    cache = RenderCache(size=size)
+    cache.put("a", "A")
+    assert (len(cache), cache.get("a"), cache.size) == (0, None, 0)
+
+@pytest.mark.parametrize("value,size", [("10", 10), ("0", 0), ("-5", 0), ("abc", 64), ("", 64)])
+def test_size_from_environment(monkeypatch, value, size):
+    monkeypatch.setenv("SUBNET_CACHE_SIZE", value)
+    assert subnet_console._env_cache_size() == size
+
+@pytest.fixture
+def program_dir(tmp_path, monkeypatch):
+    """A stand-in for the directory of the program files that the fingerprint covers."""
+    (tmp_path / "subnetting_calc.py").write_text("# program\n")
+    monkeypatch.setattr(subnet_console, "BASE_DIR", str(tmp_path))
+    return tmp_path
+
+def test_saved_entries_are_reused(program_dir):
+    # Kept as a .json next to the program files: saving must not invalidate the cache itself
+    path = str(program_dir / "cache.json")
+    first = RenderCache(size=2, path=path)
+    for key in "abc":
+        first.put(key, key.upper())
+    first.save()
+    second = RenderCache(size=2, path=path)
+    assert (second.get("b"), second.get("c"), second.get("a")) == ("B", "C", None)
+    second.put("d", "D")
+    second.save()
+    assert RenderCache(size=5, path=path).get("d") == "D"
+
+def test_changed_program_files_invalidate(program_dir):
+    path = str(program_dir / "cache.json")
+    cache = RenderCache(path=path)
+    cache.put("a", "A")
+    cache.save()
+    program = program_dir / "subnetting_calc.py"
+    stat = program.stat()
+    os.utime(program, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert RenderCache(path=path).get("a") is None
+
+def test_unreadable_file_is_ignored(program_dir):
+    path = program_dir / "cache.json"
+    path.write_text("{not json")
+    assert RenderCache(path=str(path)).get("a") is None
+
+def test_print_cached_replays(monkeypatch):
+    from rich.console import Console
+    out = io.StringIO()
+    monkeypatch.setattr(subnet_console.console, "_console", Console(file=out, width=80, color_system=None))
+    monkeypatch.setattr(subnet_console, "render_cache", RenderCache())
+    calls = []
+
+    def render():
+        calls.append(1)
+        subnet_console.console.print("result")
+    for _ in range(3):
+        print_cached(("key", 1), render)
+    print_cached("menu", render, static=True)
+    print_cached("menu", render, static=True)
+    assert out.getvalue() == "result\n" * 5
+    assert len(calls) == 2
+    assert (subnet_console.render_cache.hits, subnet_console.render_cache.misses) == (2, 1)
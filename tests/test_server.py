@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import pytest
+
+from subnet_server import QuizServer, _serve_connection
+
+def test_server_sessions_do_not_share_misses():
+    server = QuizServer(pool_size=50)
+    first = server.sessions[server.create_session("advanced", 2)]
+    second = server.sessions[server.create_session("advanced", 2)]
+    result = first.answer("99")
+    assert not result["correct"]
+    assert first.questions.misses(first.question_id) == 1
+    assert second.questions.misses(first.question_id) == 0
+    assert server._bank("advanced").misses(first.question_id) == 0
+
+class Writer:
+    """Just enough of asyncio.StreamWriter to collect what the server sends."""
+
+    def __init__(self):
+        self.data = b""
+        self.closed = False
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+def exchange(data, limit=2 ** 16):
+    """Feed raw request bytes to one connection handler; returns everything it wrote back."""
+    async def run():
+        reader = asyncio.StreamReader(limit=limit)
+        reader.feed_data(data)
+        reader.feed_eof()
+        writer = Writer()
+        await _serve_connection(QuizServer(pool_size=20), reader, writer)
+        assert writer.closed
+        return writer.data
+    return asyncio.run(run())
+
+def test_create_session():
+    body = json.dumps({"difficulty": "beginner", "questions": 2}).encode()
+    response = exchange(
+        b"POST /sessions HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body
+    )
+    head, _, payload = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 201 ")
+    assert json.loads(payload)["total_questions"] == 2
+
+# Headers are decoded as Latin-1, where b"\xb2" is '²': a digit to str.isdigit() but not to int()
+@pytest.mark.parametrize("length", [b"\xb2", b"1\xb9", b"-1", b"1e3", b"abc"])
+def test_bad_content_length_drops_connection(length):
+    assert exchange(b"POST /sessions HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n") == b""
+
+def test_truncated_body_drops_connection():
+    assert exchange(b"POST /sessions HTTP/1.1\r\nContent-Length: 100\r\n\r\n{}") == b""
+
+def test_oversized_header_drops_connection():
+    assert exchange(b"GET /sessions HTTP/1.1\r\nX-Padding: " + b"a" * 1000 + b"\r\n\r\n", limit=100) == b""
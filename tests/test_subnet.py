@@ -0,0 +1,53 @@
+import ipaddress
+import random
+
+import pytest
+
+from subnet_core import Subnet
+
+def random_networks(seed, count=300):
+    rng = random.Random(seed)
+    networks = [ipaddress.ip_network(text) for text in ("0.0.0.0/0", "10.0.0.0/31", "10.0.0.7/32", "::/0", "2001:db8::/127", "::1/128")]
+    for _ in range(count):
+        if rng.random() < 0.5:
+            networks.append(ipaddress.IPv4Network((rng.getrandbits(32), rng.randint(0, 32)), strict=False))
+        else:
+            networks.append(ipaddress.IPv6Network((rng.getrandbits(128), rng.randint(0, 128)), strict=False))
+    return networks
+
+@pytest.mark.parametrize("seed", range(3))
+def test_fields_match_ipaddress(seed):
+    for network in random_networks(seed):
+        subnet = Subnet.from_network(network)
+        assert subnet.to_network() == network
+        assert str(subnet) == str(network)
+        assert subnet.num_addresses == network.num_addresses
+        assert subnet.address(subnet.broadcast) == network.broadcast_address
+        assert subnet.address(subnet.netmask) == network.netmask
+        assert subnet.address(subnet.hostmask) == network.hostmask
+        assert subnet.format(subnet.base) == str(network.network_address)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_host_range_matches_hosts(seed):
+    # Only the small networks: hosts() enumerates every address
+    for network in random_networks(seed):
+        if network.num_addresses > 4096:
+            continue
+        hosts = list(network.hosts())
+        first, last = Subnet.from_network(network).host_range()
+        assert (first, last) == (int(hosts[0]), int(hosts[-1]))
+
+def test_parse_and_from_address():
+    assert Subnet.parse("192.168.1.77/255.255.255.192") == Subnet.from_network(ipaddress.ip_network("192.168.1.64/26"))
+    assert Subnet.parse("2001:db8::1/32") == Subnet.from_network(ipaddress.ip_network("2001:db8::/32"))
+    assert Subnet.from_address(0xC0A8014D, 26) == Subnet(0xC0A80140, 26)
+
+def test_contains_and_equality():
+    subnet = Subnet.parse("10.1.0.0/16")
+    assert ipaddress.ip_address("10.1.2.3") in subnet
+    assert 0x0A010203 in subnet
+    assert ipaddress.ip_address("10.2.0.0") not in subnet
+    assert ipaddress.ip_address("::a01:203") not in subnet
+    assert Subnet(0x0A010000, 16, 6) != subnet
+    assert len({subnet, Subnet.parse("10.1.9.9/16")}) == 1
+    assert repr(subnet) == "Subnet('10.1.0.0/16')"
@@ -0,0 +1,45 @@
+import ipaddress
+
+import pytest
+
+from subnet_core import SubnetView
+
+@pytest.mark.parametrize("text,new_prefix", [("10.0.0.0/24", 28), ("10.0.0.0/24", 24), ("2001:db8::/56", 64)])
+def test_matches_ipaddress_subnets(text, new_prefix):
+    network = ipaddress.ip_network(text)
+    view = SubnetView(network, new_prefix)
+    expected = list(network.subnets(new_prefix=new_prefix))
+    assert len(view) == view.size == len(expected)
+    assert list(view) == expected
+    assert list(reversed(view)) == expected[::-1]
+    assert [view[i] for i in range(-len(expected), len(expected))] == expected * 2
+
+def test_slices_are_views():
+    network = ipaddress.ip_network("10.0.0.0/16")
+    expected = list(network.subnets(new_prefix=24))
+    view = SubnetView(network, 24)
+    for part in (slice(10, 20), slice(None, None, -3), slice(250, 300), slice(5, 5)):
+        assert isinstance(view[part], SubnetView)
+        assert list(view[part]) == expected[part]
+    assert view[10:20][3] == expected[13]
+    assert not view[5:5]
+
+def test_huge_ipv6_division():
+    view = SubnetView(ipaddress.ip_network("2001:db8::/32"), 128)
+    assert view.size == 1 << 96
+    assert view[-1] == ipaddress.ip_network("2001:db8:ffff:ffff:ffff:ffff:ffff:ffff/128")
+    with pytest.raises(OverflowError):
+        len(view)
+
+def test_subnet_value_matches():
+    network = ipaddress.ip_network("192.168.0.0/20")
+    view = SubnetView(network, 26)[::7]
+    assert [str(view.subnet(i)) for i in range(len(view))] == [str(n) for n in view]
+
+def test_rejects_prefix_outside_network():
+    network = ipaddress.ip_network("10.0.0.0/24")
+    for new_prefix in (23, 33):
+        with pytest.raises(ValueError):
+            SubnetView(network, new_prefix)
+    with pytest.raises(IndexError):
+        SubnetView(network, 26)[4]
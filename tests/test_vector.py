@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+import subnet_vector
+from subnet_core import subnet_fields
+from subnet_vector import COLUMNS, ipv4_subnets, ipv6_subnets, join_ipv6, split_ipv6, subnet_row
+
+def scalar_rows(addresses, prefixlens, max_prefixlen):
+    return [dict(zip(COLUMNS, subnet_fields(a, p, max_prefixlen))) for a, p in zip(addresses, prefixlens)]
+
+def ipv4_rows(columns, count):
+    return [{name: int(columns[name][i]) for name in COLUMNS} for i in range(count)]
+
+def ipv6_rows(columns, count):
+    rows = []
+    for i in range(count):
+        row = {}
+        for name in COLUMNS:
+            value = columns[name]
+            row[name] = int(value[i]) if name == "hosts" else (int(value[0][i]) << 64) | int(value[1][i])
+        rows.append(row)
+    return rows
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(subnet_vector, "HAVE_NUMPY", False)
+    return request.param
+
+def test_ipv4_kernel_matches_subnet_fields(backend):
+    rng = random.Random(0)
+    # Every prefix length, including /0, /31 and /32
+    prefixlens = list(range(33)) * 10
+    addresses = [rng.getrandbits(32) for _ in prefixlens]
+    columns = ipv4_subnets(addresses, prefixlens)
+    assert ipv4_rows(columns, len(addresses)) == scalar_rows(addresses, prefixlens, 32)
+
+def test_ipv4_kernel_single_prefix(backend):
+    addresses = list(range(0x0A000000, 0x0A000000 + 100 * 256, 256))
+    columns = ipv4_subnets(addresses, 22)
+    assert ipv4_rows(columns, len(addresses)) == scalar_rows(addresses, [22] * len(addresses), 32)
+
+def test_ipv6_kernel_matches_subnet_fields(backend):
+    rng = random.Random(1)
+    prefixlens = list(range(129)) * 2
+    addresses = [rng.getrandbits(128) for _ in prefixlens]
+    # Include the carry from the low into the high half for the first host
+    addresses[0], prefixlens[0] = (5 << 64) | ((1 << 64) - 1), 64
+    high, low = split_ipv6(addresses)
+    columns = ipv6_subnets(high, low, prefixlens)
+    assert ipv6_rows(columns, len(addresses)) == scalar_rows(addresses, prefixlens, 128)
+
+def test_split_join_ipv6_round_trip():
+    values = [0, 1, (1 << 64) - 1, 1 << 64, (1 << 128) - 1]
+    assert join_ipv6(*split_ipv6(values)) == values
+
+def test_subnet_row():
+    assert subnet_row(0xC0A8010A, 24) == dict(zip(COLUMNS, subnet_fields(0xC0A8010A, 24)))
+    value = 0x20010DB8 << 96 | 1
+    assert subnet_row(value, 64, 6) == dict(zip(COLUMNS, subnet_fields(value, 64, 128)))
+
+@pytest.mark.parametrize("ip,mask,operation,expected", [
+    ("192.168.10.77", "255.255.255.192", "AND", "192.168.10.64"),
+    ("192.168.10.77", "0.0.0.63", "OR", "192.168.10.127"),
+    ("192.168.10.77", "255.0.255.0", "AND", "192.0.10.0"),
+    ("2001:db8::1234", "ffff:ffff::", "AND", "2001:db8::"),
+])
+def test_binary_calculation_result(ip, mask, operation, expected):
+    import io
+    from rich.console import Console
+    import subnet_console
+    import subnetting_calc
+    out = io.StringIO()
+    previous = subnet_console.console._console
+    subnet_console.console._console = Console(file=out, width=200, color_system=None)
+    try:
+        subnetting_calc.display_binary_and_calculation(ip, mask, operation)
+    finally:
+        subnet_console.console._console = previous
+    result_line = next(line for line in out.getvalue().splitlines() if "Result" in line)
+    assert f" {expected} " in result_line
@@ -0,0 +1,78 @@
+import ipaddress
+import random
+
+import pytest
+
+from subnet_vlsm import parse_demands, plan_vlsm
+
+def check_plan(plan):
+    parent = plan.parent
+    networks = [plan.network(a) for a in plan.allocations]
+    for allocation, network in zip(plan.allocations, networks):
+        # Aligned on its own size, inside the parent and big enough
+        assert int(network.network_address) == allocation.start
+        assert network.subnet_of(parent)
+        assert network.num_addresses - (2 if parent.version == 4 and network.prefixlen < 31 else 0) >= allocation.hosts
+    ordered = sorted(networks + plan.free_networks(), key=lambda n: int(n.network_address))
+    for before, after in zip(ordered, ordered[1:]):
+        assert not before.overlaps(after)
+    # Allocations and free blocks together cover the parent exactly
+    assert sum(n.num_addresses for n in ordered) == parent.num_addresses
+
+def test_office_plan():
+    parent = ipaddress.ip_network("192.168.1.0/24")
+    plan = plan_vlsm(parent, [("Marketing", 15), ("Sales", 20), ("IT", 10), ("Management", 5)])
+    assert [(a.name, str(plan.network(a))) for a in plan.allocations] == [
+        # Equal block sizes keep the input order
+        ("Marketing", "192.168.1.0/27"), ("Sales", "192.168.1.32/27"),
+        ("IT", "192.168.1.64/28"), ("Management", "192.168.1.80/29"),
+    ]
+    assert not plan.unallocated
+    check_plan(plan)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_plans_are_aligned_and_disjoint(seed):
+    rng = random.Random(seed)
+    parent = ipaddress.ip_network(rng.choice(["10.0.0.0/16", "172.16.0.0/20", "2001:db8::/56"]))
+    demands = [(f"net{i}", rng.choice([0, 1, 2, 3, 5, 30, 100, 600, 2000])) for i in range(rng.randint(1, 40))]
+    plan = plan_vlsm(parent, demands)
+    check_plan(plan)
+    assert len(plan.allocations) + len(plan.unallocated) == len(demands)
+
+def test_demand_too_large_is_unallocated():
+    plan = plan_vlsm(ipaddress.ip_network("10.0.0.0/28"), [("big", 100), ("small", 5)])
+    assert plan.unallocated == [("big", 100)]
+    assert [a.name for a in plan.allocations] == ["small"]
+    check_plan(plan)
+
+def test_negative_hosts_rejected():
+    with pytest.raises(ValueError):
+        plan_vlsm(ipaddress.ip_network("10.0.0.0/24"), [("bad", -1)])
+
+def test_parse_demands():
+    lines = ["# comment", "", "Sales,20", "IT: 10", "Lab 5", "7"]
+    assert parse_demands(lines) == [("Sales", 20), ("IT", 10), ("Lab", 5), ("Subnet 4", 7)]
+    with pytest.raises(ValueError, match="line 1"):
+        parse_demands(["Sales"])
+
+def test_batch_vlsm(batch):
+    status, out, err = batch("vlsm", ["# office", "Sales,50", "Lab,10"], "-p", "192.168.1.0/24")
+    assert status == 0
+    assert out.splitlines() == [
+        "name,hosts,subnet,netmask,usable_hosts",
+        "Sales,50,192.168.1.0/26,255.255.255.192,62",
+        "Lab,10,192.168.1.64/28,255.255.255.240,14",
+    ]
+    assert err.startswith("2 allocated, 0 did not fit")
+
+def test_batch_vlsm_unallocated(batch):
+    status, out, err = batch("vlsm", ["Big,500", "Small,2"], "-p", "10.0.0.0/24")
+    assert status == 1
+    assert "Big,500,,," in out.splitlines()
+    assert "1 did not fit" in err
+
+@pytest.mark.parametrize("lines, parent", [(["Sales,fifty"], "10.0.0.0/24"), (["Sales,50"], "10.0.0.0/99")])
+def test_batch_vlsm_errors(batch, lines, parent):
+    status, out, err = batch("vlsm", lines, "-p", parent)
+    assert (status, out) == (2, "")
+    assert err.startswith("Error:")